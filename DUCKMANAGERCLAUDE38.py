@@ -4,6 +4,8 @@ Copiez ce code dans un fichier app.py et lancez avec: streamlit run app.py
 
 NOUVEAUTÉS AJOUTÉES:
 ✅ Mode individuel avec priorité aux joueurs ayant le moins joué
+✅ Mode individuel: partenaires et adversaires renouvelés et équipes de niveaux proches (recuit simulé)
+✅ Carte des partenaires et adversaires de chaque joueur (onglet Statistiques, export Excel)
 ✅ Bouton "Générer les derniers rounds" pour clôturer le tournoi
 ✅ Équilibrage automatique du nombre de matchs par joueur
 ✅ Utilisation de "jokers" pour compléter les équipes en fin de tournoi
@@ -11,22 +13,71 @@ NOUVEAUTÉS AJOUTÉES:
 ✅ Gestion intelligente des retards de matchs
 ✅ Deux modes distincts: Classique (équipes fixes) et Individuel (équipes variables)
 ✅ Interface optimisée avec Streamlit
+✅ Journal de toutes les modifications dans une base SQLite (dossier "donnees" ou $DUCK_MANAGER_DONNEES),
+   partagé entre les sessions et rejoué au redémarrage à partir du dernier instantané
+✅ Plusieurs tournois en parallèle sur le même serveur, choisis par ?tournoi=... dans l'URL
+✅ Mode classique: planning de la journée (tables de Berger) précalculé dès la création des équipes, exportable en PDF
+✅ Enchaînement continu: un nouveau match est lancé sur un terrain dès que son score est saisi
+✅ Tirages reproductibles: une graine par tournoi et par round, conservée avec le round
+✅ Moteur sans interface: le script s'importe comme un module (l'interface n'est lancée que par streamlit run),
+   générateurs, classements et exports utilisables hors de Streamlit (benchmarks/_app.py)
+✅ Profilage des exécutions (organisateur): durée des onglets, générateurs et exports, profil cProfile téléchargeable
+✅ Saisie des scores au bord du terrain depuis un téléphone: page allégée ?terrain=T3&round=5
 """
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import random
 import base64
+import copy
+import cProfile
+import contextlib
+import functools
 import io
 import json
+import marshal
+import math
+import os
+import pstats
+import re
+import sqlite3
+import threading
+import time
+import types
 from datetime import datetime
 from collections import defaultdict, Counter
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from openpyxl.formatting.rule import ColorScaleRule
 
 MOT_DE_PASSE_ORGANISATEUR = "MARCPRESIDENT"
+NB_VERSIONS_CACHE_VUES = 3  # Nombre de versions de l'état conservées dans le cache des vues
+# Dossier des bases SQLite des tournois, une par tournoi (partagées par toutes les sessions et conservées entre les redémarrages)
+DOSSIER_DONNEES = os.environ.get(
+    "DUCK_MANAGER_DONNEES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "donnees")
+)
+NB_EVENEMENTS_PAR_INSTANTANE = 100  # Un instantané de l'état tous les N événements du journal
+TOURNOI_PAR_DEFAUT = "tournoi"  # Tournoi ouvert sans paramètre ?tournoi=... dans l'URL
+NB_EXECUTIONS_PROFILEES = 20  # Exécutions du script conservées dans le panneau de profilage
+NB_ROUNDS_FENETRE_MATCHS = 1  # Derniers rounds affichés par défaut dans l'onglet Matchs (plus les matchs sans score)
+NB_ROUNDS_PAR_PAGE = 5  # Rounds par page de l'historique des matchs
+
+COLONNES_MATCHS_DETAIL = [
+    "ID_Match", "Round", "Terrain", "Type",
+    "Equipe_A_ID", "J1_A", "J2_A", "Score_A",
+    "Equipe_B_ID", "J1_B", "J2_B", "Score_B",
+    "Jokers"
+]
+# Vue simplifiée "Equipe A / Score A" projetée depuis la table des matchs (colonne détaillée -> colonne simplifiée)
+PROJECTION_MATCHS = {
+    "Round": "Round", "Terrain": "Terrain", "Type": "Type",
+    "Equipe_A_ID": "Equipe A", "Score_A": "Score A",
+    "Equipe_B_ID": "Equipe B", "Score_B": "Score B"
+}
 
 # === INITIALISATION ===
 defaults = {
@@ -40,22 +91,17 @@ defaults = {
     # Structure pour le mode individuel
     'historique_equipes': pd.DataFrame(columns=["Round", "ID", "Surnom", "J1", "Cat1", "J2", "Cat2", "Coeff"]),
     
-    # Matchs détaillés avec informations sur les joueurs
-    'matchs_detail': pd.DataFrame(columns=[
-        "Round", "Terrain", "Type",
-        "Equipe_A_ID", "J1_A", "J2_A", "Score_A",
-        "Equipe_B_ID", "J1_B", "J2_B", "Score_B",
-        "Jokers"
-    ]),
-    
-    # Matchs simplifiés pour compatibilité
-    'matchs': pd.DataFrame(columns=["Round", "Terrain", "Type", "Equipe A", "Score A", "Equipe B", "Score B"]),
+    # Table unique des matchs avec informations sur les joueurs, identifiés par ID_Match (position dans la table)
+    # Magasin en ajout seul (voir creer_magasin), lu via get_matchs_detail() et projeté par get_matchs()
+    'magasin_matchs': {"colonnes": COLONNES_MATCHS_DETAIL, "cle": ["Round", "Terrain"], "index": {}, "lignes": [], "df": None, "vues": {}},
     
     'algo_classement': "Pondéré",
     'algo_classement_individuel': "Pondéré",
     'mode_tournoi': "Classique",
     'bg_image_data': None,
     'nb_terrains': 7,
+    # Enchaînement continu: un nouveau match est lancé sur chaque terrain dès que son score est saisi
+    'enchainement_continu': False,
     'temp_joueurs': [],
     'erreur_saisie': None,
     'profil': "Joueur",
@@ -64,10 +110,189 @@ defaults = {
     'confirm_import_matchs': False,
     'pending_matchs_import': None,
     
-    # Nouveau: statistiques des joueurs pour équilibrage
-    'statistiques_joueurs': {}
+    # Nouveau: statistiques des joueurs pour équilibrage, mises à jour à chaque saisie de score
+    # {"nb_matchs": lignes de matchs_detail prises en compte, "joueurs": {nom: compteurs}}
+    'statistiques_joueurs': {},
+    
+    # Version de l'état du tournoi (incrémentée à chaque modification)
+    'version_etat': 0,
+    # Documents exportés, générés uniquement à la demande: nom -> (version, contenu)
+    'exports_cache': {},
+    # Vues dérivées mémorisées: version -> {nom de la vue: résultat}
+    'cache_vues': {},
+    # Index des joueurs validés: {"nb_joueurs", "index": (prénom, nom) normalisés -> position, "categories": nom complet -> catégorie}
+    'registre_joueurs': {},
+    # Partenaires et adversaires déjà rencontrés (voir creer_rencontres), mis à jour à chaque round généré
+    'rencontres_joueurs': {},
+    # Identifiant du tournoi auquel la session est attachée (choisi par ?tournoi=... dans l'URL)
+    'tournoi': None,
+    # Dernier événement du journal appliqué à cette session (-1: jamais chargé)
+    'revision_base': -1,
+    # Planning précalculé du mode classique (voir planifier_journee): {"equipes", "nb_terrains", "premier_round", "rounds"}
+    'planning_classique': {},
+    # Graine aléatoire du tournoi (tirée à la première génération) et graine de chaque round généré: {"round": graine}
+    'graine_tournoi': None,
+    'graines_rounds': {},
+    # Profilage (organisateur): durées mesurées pendant les dernières exécutions du script, {mesure: durée en s} par exécution
+    'profilage_actif': False,
+    'executions_profilees': [],
+    # Profil cProfile: demandé pour la prochaine exécution, en cours, puis {"pstats": octets, "resume": texte}
+    'cprofile_demande': False,
+    'profileur_cprofile': None,
+    'profil_cprofile': None,
+    # Éditeur des scores de l'onglet Matchs: (clé du widget, tableau affiché), auquel se rapportent les saisies
+    # reçues à la soumission; nombre d'enregistrements (un éditeur vierge après chacun)
+    'editeur_matchs': None,
+    'nb_enregistrements_scores': 0
 }
 
+# Clés de session enregistrées dans la base SQLite (en plus de la table des matchs)
+CLES_PERSISTEES = [
+    'nom_tournoi', 'mode_tournoi', 'nb_terrains', 'enchainement_continu', 'algo_classement', 'algo_classement_individuel',
+    'categories_dict', 'joueurs', 'temp_joueurs', 'equipes_fixes', 'historique_equipes', 'planning_classique',
+    'graine_tournoi', 'graines_rounds'
+]
+
+# === ÉTAT DU TOURNOI ET MESSAGES ===
+
+# Les fonctions du tournoi (générateurs, classements, exports) lisent et modifient l'état via etat et
+# s'adressent à l'organisateur via notifier. Dans l'application, etat est st.session_state; le moteur
+# sans interface (voir utiliser_etat) les fait travailler sur un état créé par creer_etat.
+etat = st.session_state
+notificateur = None
+
+def creer_etat(tournoi):
+    """État d'un tournoi hors de Streamlit: un attribut par clé de defaults"""
+    nouvel_etat = types.SimpleNamespace(**copy.deepcopy(defaults))
+    nouvel_etat.tournoi = tournoi
+    return nouvel_etat
+
+def utiliser_etat(nouvel_etat, nouveau_notificateur=None):
+    """Fait travailler les fonctions du tournoi sur un autre état, avec un notificateur(niveau, message)"""
+    global etat, notificateur
+    etat, notificateur = nouvel_etat, nouveau_notificateur
+
+def notifier(niveau, message):
+    """Affiche un message à l'organisateur (niveau "succes", "info", "avertissement" ou "erreur")"""
+    if notificateur is not None:
+        notificateur(niveau, message)
+    else:
+        {"succes": st.success, "info": st.info, "avertissement": st.warning, "erreur": st.error}[niveau](message)
+
+# === PROFILAGE DES EXÉCUTIONS ===
+
+# Quand l'organisateur active le profilage, chaque exécution du script ajoute une entrée à
+# executions_profilees, que mesurer et chronometre complètent au fil de l'exécution (durées cumulées
+# par mesure, blocs imbriqués compris dans leur parent). Sans profilage, les mesures ne coûtent rien.
+
+@contextlib.contextmanager
+def mesurer(nom):
+    """Ajoute la durée du bloc à la mesure nom de l'exécution en cours, si le profilage est actif"""
+    if not etat.profilage_actif or not etat.executions_profilees:
+        yield
+        return
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        # Enregistrée même si le bloc est interrompu (st.rerun, exception)
+        execution = etat.executions_profilees[-1]
+        execution[nom] = execution.get(nom, 0.0) + time.perf_counter() - debut
+
+def chronometre(fonction):
+    """Décore une fonction pour mesurer chacun de ses appels sous son nom"""
+    @functools.wraps(fonction)
+    def fonction_chronometree(*args, **kwargs):
+        with mesurer(fonction.__name__):
+            return fonction(*args, **kwargs)
+    return fonction_chronometree
+
+def demarrer_execution_profilee():
+    """Ouvre les mesures d'une nouvelle exécution du script et lance le profil cProfile demandé"""
+    # Exécution précédente interrompue par st.rerun avant sa fin
+    terminer_profil_cprofile()
+    if not etat.profilage_actif:
+        return
+    etat.executions_profilees.append({})
+    del etat.executions_profilees[:-NB_EXECUTIONS_PROFILEES]
+    if etat.cprofile_demande:
+        etat.cprofile_demande = False
+        profileur = cProfile.Profile()
+        try:
+            profileur.enable()
+        except ValueError:
+            notifier("avertissement", "⚠️ Un autre profil est déjà en cours sur le serveur, réessayez plus tard")
+            return
+        etat.profileur_cprofile = profileur
+
+def terminer_profil_cprofile(nb_fonctions=25):
+    """Arrête le profil cProfile en cours et garde ses statistiques; retourne True s'il y en avait un"""
+    profileur = etat.profileur_cprofile
+    if profileur is None:
+        return False
+    profileur.disable()
+    etat.profileur_cprofile = None
+    profileur.create_stats()
+    # Même format que cProfile.Profile.dump_stats (lisible par pstats.Stats ou snakeviz), avant que
+    # pstats.Stats ne vide les statistiques du profileur
+    contenu = marshal.dumps(profileur.stats)
+    resume = io.StringIO()
+    pstats.Stats(profileur, stream=resume).sort_stats("cumulative").print_stats(nb_fonctions)
+    etat.profil_cprofile = {"pstats": contenu, "resume": resume.getvalue()}
+    return True
+
+def resumer_executions_profilees():
+    """Tableau des mesures des exécutions terminées: dernière durée, p50, p95 et maximum (ms)"""
+    # La dernière entrée est l'exécution en cours, encore incomplète
+    executions = [execution for execution in etat.executions_profilees[:-1] if execution]
+    if not executions:
+        return pd.DataFrame()
+    durees = pd.DataFrame(executions) * 1000
+    resume = pd.DataFrame({
+        "Exécutions": durees.count(),
+        "Dernière (ms)": durees.iloc[-1],
+        "p50 (ms)": durees.quantile(0.5),
+        "p95 (ms)": durees.quantile(0.95),
+        "Max (ms)": durees.max()
+    })
+    resume.index.name = "Mesure"
+    return resume.sort_values("p95 (ms)", ascending=False)
+
+def afficher_panneau_profilage():
+    """Panneau de la barre latérale: activation du profilage, durées des dernières exécutions, profil cProfile"""
+    with st.expander("⏱️ Profilage des exécutions"):
+        actif = st.checkbox("Mesurer les exécutions", value=st.session_state.profilage_actif)
+        if actif != st.session_state.profilage_actif:
+            st.session_state.profilage_actif = actif
+            if actif:
+                st.session_state.executions_profilees = []
+            st.rerun()
+        if not actif:
+            return
+        
+        resume = resumer_executions_profilees()
+        if resume.empty:
+            st.caption("Aucune exécution mesurée: interagissez avec l'application")
+        else:
+            st.caption(f"{len(st.session_state.executions_profilees) - 1} dernière(s) exécution(s), "
+                       "durées cumulées par exécution (un bloc inclut les mesures qu'il contient)")
+            st.dataframe(resume, use_container_width=True, column_config={
+                col: st.column_config.NumberColumn(format="%.1f") for col in resume.columns if col != "Exécutions"
+            })
+        
+        if st.button("🔬 Profiler la prochaine exécution (cProfile)", use_container_width=True):
+            st.session_state.cprofile_demande = True
+            st.rerun()
+        if st.session_state.profil_cprofile:
+            st.download_button(
+                "📥 Télécharger le profil (.pstats)",
+                st.session_state.profil_cprofile["pstats"],
+                f"profil_{st.session_state.tournoi}.pstats",
+                "application/octet-stream",
+                use_container_width=True
+            )
+            st.code(st.session_state.profil_cprofile["resume"], language=None)
+
 # === FONCTIONS DE BASE ===
 
 def set_background(f):
@@ -76,17 +301,439 @@ def set_background(f):
     else:
         st.markdown('<style>.stApp{background-image:none;background-color:white;}</style>', unsafe_allow_html=True)
 
-def get_current_round():
-    return 0 if st.session_state.matchs.empty else int(st.session_state.matchs["Round"].max())
+def incrementer_version_etat(*cles):
+    """Signale une modification de l'état du tournoi (invalide les exports et vues déjà calculés)
 
-def joueur_existe(p, n):
-    return any(j['Prénom'].lower().strip()==p.lower().strip() and j['Nom'].lower().strip()==n.lower().strip() for j in st.session_state.joueurs)
+    cles: clés persistées modifiées, journalisées avec leur nouvelle valeur. Retourne False si le journal
+    refuse la modification (voir journaliser).
+    """
+    etat.version_etat += 1
+    if not cles:
+        return True
+    return journaliser("etat_modifie", {cle: modification_cle(cle) for cle in cles})
+
+def memoiser_par_version(fonction):
+    """Calcule une vue dérivée au plus une fois par version de l'état du tournoi
+
+    Les résultats sont partagés entre les appelants et ne doivent pas être modifiés.
+    Seules les NB_VERSIONS_CACHE_VUES dernières versions sont conservées.
+    """
+    @functools.wraps(fonction)
+    def vue_memorisee():
+        cache = etat.cache_vues
+        version = etat.version_etat
+        if version not in cache:
+            cache[version] = {}
+            for ancienne_version in sorted(cache)[:-NB_VERSIONS_CACHE_VUES]:
+                del cache[ancienne_version]
+        vues = cache[version]
+        if fonction.__name__ not in vues:
+            vues[fonction.__name__] = fonction()
+        return vues[fonction.__name__]
+    return vue_memorisee
+
+# === MAGASIN DES MATCHS ===
+
+def creer_magasin(colonnes, cle):
+    """Crée un magasin en ajout seul: une liste d'enregistrements, matérialisée en DataFrame à la lecture
+
+    "index" associe les valeurs des colonnes de "cle" (tuple) à la position de l'enregistrement.
+    "vues" contient les projections du DataFrame, invalidées à chaque ajout ou modification.
+    """
+    return {"colonnes": list(colonnes), "cle": list(cle), "index": {}, "lignes": [], "df": None, "vues": {}}
+
+def ajouter_au_magasin(magasin, lignes):
+    """Ajoute un lot d'enregistrements (un round entier) sans recopier les lignes existantes"""
+    for ligne in lignes:
+        magasin["index"][tuple(ligne[col] for col in magasin["cle"])] = len(magasin["lignes"])
+        magasin["lignes"].append({col: ligne[col] for col in magasin["colonnes"]})
+    magasin["df"] = None
+    magasin["vues"].clear()
+
+def chercher_dans_magasin(magasin, *cle):
+    """Retourne la position de l'enregistrement de clé donnée, ou None"""
+    return magasin["index"].get(cle)
+
+def lire_magasin(magasin):
+    """Retourne le DataFrame du magasin, reconstruit seulement après un ajout
+
+    Le DataFrame est partagé entre les lecteurs et ne doit pas être modifié.
+    """
+    if magasin["df"] is None:
+        magasin["df"] = pd.DataFrame(magasin["lignes"], columns=magasin["colonnes"])
+    return magasin["df"]
+
+def modifier_magasin(magasin, idx, valeurs):
+    """Modifie un enregistrement, ainsi que le DataFrame s'il est déjà matérialisé"""
+    magasin["lignes"][idx].update(valeurs)
+    if magasin["df"] is not None:
+        for col, val in valeurs.items():
+            magasin["df"].at[idx, col] = val
+    magasin["vues"].clear()
+
+def get_matchs_detail():
+    """Table des matchs, indexée par ID_Match"""
+    return lire_magasin(etat.magasin_matchs)
+
+def get_matchs():
+    """Vue simplifiée (Equipe A / Score A) de la table des matchs, projetée à la demande"""
+    vues = etat.magasin_matchs["vues"]
+    if "simplifiee" not in vues:
+        vues["simplifiee"] = get_matchs_detail()[list(PROJECTION_MATCHS)].rename(columns=PROJECTION_MATCHS)
+    return vues["simplifiee"]
+
+def get_id_match(round_num, terrain):
+    """ID_Match du match joué sur un terrain lors d'un round, ou None"""
+    return chercher_dans_magasin(etat.magasin_matchs, round_num, terrain)
+
+def get_id_match_terrain(terrain, round_num=None):
+    """ID_Match du match d'un terrain: celui du round donné, sinon le dernier match programmé sur le terrain"""
+    if round_num is not None:
+        return get_id_match(round_num, terrain)
+    # Table en ajout seul: le dernier match du terrain est le premier trouvé en partant de la fin
+    lignes = etat.magasin_matchs["lignes"]
+    for id_match in range(len(lignes) - 1, -1, -1):
+        if lignes[id_match]["Terrain"] == terrain:
+            return id_match
+    return None
+
+def get_nb_matchs():
+    return len(etat.magasin_matchs["lignes"])
+
+def ajouter_matchs(matchs):
+    """Ajoute des matchs (dictionnaires au format détaillé) à la table des matchs, aux statistiques et aux rencontres"""
+    ajouter_au_magasin(etat.magasin_matchs, matchs)
+    ajouter_matchs_aux_statistiques(matchs)
+    ajouter_matchs_aux_rencontres(matchs)
+
+def enregistrer_matchs(matchs, generateur, equipes=(), cles=()):
+    """Journalise les matchs d'un round et les ajoute à la table des matchs, en un seul événement
+
+    Chaque match reçoit son ID_Match, qui ne change plus ensuite. L'événement contient aussi les équipes
+    formées pour ces matchs (ajoutées à historique_equipes), les graines aléatoires, les autres clés
+    persistées modifiées par le générateur (cles) et le nom du générateur, pour pouvoir rejouer le
+    tournoi (voir benchmarks/rejouer_tournoi.py). Retourne False si le journal refuse l'événement.
+    """
+    premier_id = get_nb_matchs()
+    for i, match in enumerate(matchs):
+        match["ID_Match"] = premier_id + i
+    modifications = {cle: modification_cle(cle) for cle in ("graine_tournoi", "graines_rounds") + tuple(cles)}
+    if equipes:
+        modifications["historique_equipes"] = {"debut": len(etat.historique_equipes), "ajout": list(equipes)}
+    return journaliser("matchs_ajoutes", {
+        "matchs": [{col: match[col] for col in COLONNES_MATCHS_DETAIL} for match in matchs],
+        "generateur": generateur,
+        "etat": modifications
+    })
+
+def vider_table_matchs():
+    etat.magasin_matchs = creer_magasin(COLONNES_MATCHS_DETAIL, ["Round", "Terrain"])
+    # Statistiques et rencontres reconstruites à la lecture
+    etat.statistiques_joueurs = {}
+    etat.rencontres_joueurs = {}
+
+def reinitialiser_table_matchs(cles=()):
+    """Vide la table des matchs; les clés persistées cles, remises à zéro par l'appelant, sont journalisées avec"""
+    return journaliser("matchs_reinitialises", {"etat": {cle: modification_cle(cle) for cle in cles}})
+
+# === JOURNAL DES ÉVÉNEMENTS (SQLITE) ===
+
+# Chaque modification du tournoi est un événement ajouté au journal, appliqué à la session qui l'a produit
+# puis rejoué par les autres sessions. Au démarrage, l'état est repris du dernier instantané et seuls
+# les événements suivants sont rejoués. Types d'événements:
+# - "matchs_ajoutes" {"matchs": [...], "generateur": nom, "etat": modifications}: matchs d'un round, avec
+#   leur ID_Match, la fonction qui les a générés, les équipes formées et les graines du round
+# - "score_modifie" {"ID_Match", "Score_A", "Score_B"}
+# - "matchs_reinitialises" {"etat": modifications} / "tournoi_reinitialise" {}
+# - "etat_modifie" modifications
+# Les modifications des clés persistées sont explicites: {clé: {"valeur": v}} pour une nouvelle valeur,
+# {clé: {"debut": n, "ajout": [...]}} pour des lignes ajoutées à partir de la position n d'une liste ou table.
+SCHEMA_BASE = """
+CREATE TABLE IF NOT EXISTS evenements (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NOT NULL, donnees TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS instantanes (id_evenement INTEGER PRIMARY KEY, etat TEXT NOT NULL);
+"""
+
+def normaliser_identifiant_tournoi(nom):
+    """Identifiant de tournoi utilisable dans une URL et comme nom de fichier"""
+    return re.sub(r"[^\w-]+", "-", str(nom).strip().lower()).strip("-") or TOURNOI_PAR_DEFAUT
+
+def get_chemin_base(tournoi):
+    return os.path.join(DOSSIER_DONNEES, f"{tournoi}.sqlite3")
+
+def tournoi_existe(tournoi):
+    """Seuls le tournoi par défaut et les tournois créés par un organisateur (base existante) peuvent être ouverts"""
+    return tournoi == TOURNOI_PAR_DEFAUT or os.path.exists(get_chemin_base(tournoi))
+
+def get_tournoi_demande():
+    """Tournoi choisi par ?tournoi=... dans l'URL, ou le tournoi par défaut s'il n'existe pas"""
+    tournoi = normaliser_identifiant_tournoi(st.query_params.get("tournoi", TOURNOI_PAR_DEFAUT))
+    return tournoi if tournoi_existe(tournoi) else TOURNOI_PAR_DEFAUT
+
+def lister_tournois():
+    """Catalogue des tournois: un fichier .sqlite3 par tournoi dans DOSSIER_DONNEES"""
+    tournois = {etat.tournoi}
+    if os.path.isdir(DOSSIER_DONNEES):
+        tournois.update(f[:-len(".sqlite3")] for f in os.listdir(DOSSIER_DONNEES) if f.endswith(".sqlite3"))
+    return sorted(tournois)
+
+def reinitialiser_session(tournoi):
+    """Remet la session à zéro (sauf le profil) et l'attache au tournoi donné"""
+    for key in list(st.session_state.keys()):
+        if key != 'profil':
+            del st.session_state[key]
+    
+    for key, val in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.deepcopy(val)
+    st.session_state.tournoi = tournoi
+
+@st.cache_resource(show_spinner=False)
+def get_base(chemin):
+    """Connexion SQLite (mode WAL) d'un tournoi, partagée par toutes ses sessions, avec le verrou qui la protège"""
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    connexion = sqlite3.connect(chemin, check_same_thread=False)
+    connexion.execute("PRAGMA journal_mode=WAL")
+    connexion.execute("PRAGMA synchronous=NORMAL")
+    connexion.executescript(SCHEMA_BASE)
+    return {"connexion": connexion, "verrou": threading.Lock()}
+
+def creer_tournoi(tournoi):
+    """Crée la base d'un nouveau tournoi (action de l'organisateur), qui peut ensuite être ouvert par l'URL"""
+    get_base(get_chemin_base(tournoi))
+
+@contextlib.contextmanager
+def transaction_base():
+    """Exécute un bloc dans une transaction de la base du tournoi de la session, une session à la fois"""
+    base = get_base(get_chemin_base(etat.tournoi))
+    with base["verrou"], base["connexion"] as connexion:
+        yield connexion
+
+def lire_revision(connexion):
+    """Identifiant du dernier événement du journal (0 si le journal est vide)"""
+    return connexion.execute("SELECT COALESCE(MAX(id), 0) FROM evenements").fetchone()[0]
+
+def valeur_sql(valeur):
+    """Convertit les types numpy en types Python acceptés par sqlite3 et json"""
+    return valeur.item() if isinstance(valeur, np.generic) else valeur
+
+def valeur_cle(cle):
+    """Valeur d'une clé persistée telle qu'elle est journalisée (les tables deviennent des listes d'enregistrements)"""
+    valeur = getattr(etat, cle)
+    return valeur.to_dict("records") if isinstance(valeur, pd.DataFrame) else valeur
+
+def modification_cle(cle):
+    """Modification journalisée d'une clé persistée qui a changé de valeur"""
+    return {"valeur": valeur_cle(cle)}
+
+def affecter_cle(cle, valeur):
+    """Affecte une clé persistée à partir de sa valeur journalisée"""
+    if isinstance(defaults[cle], pd.DataFrame):
+        valeur = pd.DataFrame(valeur, columns=defaults[cle].columns)
+    setattr(etat, cle, valeur)
+
+def ajouter_lignes(cle, lignes):
+    """Ajoute des enregistrements en fin d'une table persistée, en une seule concaténation"""
+    if not lignes:
+        return
+    table = getattr(etat, cle)
+    ajout = pd.DataFrame(lignes, columns=defaults[cle].columns)
+    setattr(etat, cle, ajout if table.empty else pd.concat([table, ajout], ignore_index=True))
+
+def appliquer_modifications(modifications, en_attente=None):
+    """Applique des modifications journalisées de clés persistées
+
+    Pendant une synchronisation, les lignes ajoutées aux tables sont regroupées dans en_attente
+    (table -> lignes) et ajoutées en une fois à la fin, au lieu de reconstruire la table à chaque événement.
+    """
+    for cle, modification in modifications.items():
+        if "valeur" in modification:
+            if en_attente is not None:
+                en_attente.pop(cle, None)
+            affecter_cle(cle, modification["valeur"])
+            continue
+        
+        valeur = getattr(etat, cle)
+        if not isinstance(valeur, pd.DataFrame):
+            affecter_cle(cle, valeur[:modification["debut"]] + modification["ajout"])
+            continue
+        lignes = en_attente.setdefault(cle, []) if en_attente is not None else []
+        if modification["debut"] != len(valeur) + len(lignes):
+            # Ajout qui remplace des lignes existantes: la table est tronquée avant l'ajout
+            ajouter_lignes(cle, lignes)
+            lignes.clear()
+            setattr(etat, cle, getattr(etat, cle).iloc[:modification["debut"]])
+        lignes.extend(modification["ajout"])
+        if en_attente is None:
+            ajouter_lignes(cle, lignes)
+
+def reinitialiser_etat_persiste():
+    """Remet les clés persistées et la table des matchs à leur valeur initiale"""
+    for cle in CLES_PERSISTEES:
+        setattr(etat, cle, copy.deepcopy(defaults[cle]))
+    vider_table_matchs()
+
+def journaliser(type_evenement, donnees):
+    """Ajoute un événement au journal et l'applique à la session, avec un instantané de l'état tous les NB_EVENEMENTS_PAR_INSTANTANE événements
+
+    Un événement est calculé sur l'état de la session: il n'est écrit que si la session a appliqué tout le
+    journal, sans quoi deux sessions attribueraient les mêmes ID_Match à des matchs différents. Si une autre
+    session a écrit entre-temps, rien n'est écrit: la session est rechargée depuis le journal (ses
+    modifications non journalisées sont abandonnées) et False est retourné, l'action est à refaire.
+    Dans l'application, l'avertissement est conservé jusqu'à la fin de l'exécution qui l'affiche (voir
+    afficher_avertissement_journal), même si l'appelant relance le script.
+    """
+    with transaction_base() as connexion:
+        a_jour = lire_revision(connexion) == etat.revision_base
+        if a_jour:
+            etat.revision_base = connexion.execute(
+                "INSERT INTO evenements (type, donnees) VALUES (?, ?)",
+                (type_evenement, json.dumps(donnees, default=valeur_sql))
+            ).lastrowid
+            appliquer_evenement(type_evenement, donnees)
+            # Les vues mémorisées (voir memoiser_par_version) ne doivent pas survivre à l'événement
+            etat.version_etat += 1
+            
+            if etat.revision_base % NB_EVENEMENTS_PAR_INSTANTANE == 0:
+                contenu = {cle: valeur_cle(cle) for cle in CLES_PERSISTEES}
+                contenu["matchs"] = etat.magasin_matchs["lignes"]
+                connexion.execute("INSERT OR REPLACE INTO instantanes VALUES (?, ?)",
+                                  (etat.revision_base, json.dumps(contenu, default=valeur_sql)))
+                connexion.execute("DELETE FROM instantanes WHERE id_evenement < ?", (etat.revision_base,))
+    
+    if not a_jour:
+        recharger_depuis_base()
+        message = ("⚠️ Le tournoi vient d'être modifié depuis une autre session: action annulée, "
+                   "l'affichage est mis à jour. Recommencez si besoin.")
+        if notificateur is None:
+            st.session_state.avertissement_journal = message
+        else:
+            notifier("avertissement", message)
+    return a_jour
+
+def afficher_avertissement_journal(zone):
+    """Affiche dans zone (st, ou un st.empty placé en tête de page) l'écriture refusée par le journal, une seule fois"""
+    if "avertissement_journal" in st.session_state:
+        zone.warning(st.session_state.pop("avertissement_journal"))
+
+def appliquer_evenement(type_evenement, donnees, en_attente=None):
+    """Applique à la session un événement du journal (en_attente: voir appliquer_modifications)"""
+    if type_evenement == "matchs_ajoutes":
+        ajouter_matchs(donnees["matchs"])
+        appliquer_modifications(donnees.get("etat", {}), en_attente)
+    elif type_evenement == "score_modifie":
+        appliquer_score(donnees["ID_Match"], donnees["Score_A"], donnees["Score_B"])
+    elif type_evenement == "matchs_reinitialises":
+        vider_table_matchs()
+        appliquer_modifications(donnees.get("etat", {}), en_attente)
+    elif type_evenement == "tournoi_reinitialise":
+        reinitialiser_etat_persiste()
+        if en_attente is not None:
+            en_attente.clear()
+    elif type_evenement == "etat_modifie":
+        appliquer_modifications(donnees, en_attente)
+
+def vider_base():
+    """Efface le journal et les instantanés du tournoi (réinitialisation complète, quelles que soient les autres sessions)"""
+    with transaction_base() as connexion:
+        connexion.execute("DELETE FROM evenements")
+        connexion.execute("DELETE FROM instantanes")
+        etat.revision_base = connexion.execute(
+            "INSERT INTO evenements (type, donnees) VALUES ('tournoi_reinitialise', '{}')"
+        ).lastrowid
+    reinitialiser_etat_persiste()
+
+def synchroniser_avec_base():
+    """Rejoue les événements du journal que cette session n'a pas encore appliqués
+
+    Appelé à chaque exécution du script: une seule requête quand rien n'a changé. Une session
+    qui n'a encore rien chargé repart du dernier instantané.
+    """
+    with transaction_base() as connexion:
+        revision = lire_revision(connexion)
+        if revision == etat.revision_base:
+            return
+        
+        instantane = None
+        depuis = etat.revision_base
+        if depuis < 0:
+            instantane = connexion.execute(
+                "SELECT id_evenement, etat FROM instantanes ORDER BY id_evenement DESC LIMIT 1"
+            ).fetchone()
+            depuis = instantane[0] if instantane else 0
+        evenements = connexion.execute(
+            "SELECT type, donnees FROM evenements WHERE id > ? AND id <= ? ORDER BY id", (depuis, revision)
+        ).fetchall()
+    
+    if etat.revision_base < 0:
+        reinitialiser_etat_persiste()
+    if instantane:
+        contenu = json.loads(instantane[1])
+        for cle in CLES_PERSISTEES:
+            # Un instantané antérieur à une clé persistée la laisse à sa valeur initiale
+            if cle in contenu:
+                affecter_cle(cle, contenu[cle])
+        ajouter_au_magasin(etat.magasin_matchs, contenu["matchs"])
+    
+    en_attente = {}
+    for type_evenement, donnees in evenements:
+        appliquer_evenement(type_evenement, json.loads(donnees), en_attente)
+    for cle, lignes in en_attente.items():
+        ajouter_lignes(cle, lignes)
+    
+    # Index reconstruit à la lecture si besoin, vues et exports invalidés
+    etat.registre_joueurs = {}
+    etat.version_etat += 1
+    etat.revision_base = revision
+
+def recharger_depuis_base():
+    """Recharge entièrement la session depuis le journal (abandonne ses modifications non journalisées)"""
+    etat.revision_base = -1
+    synchroniser_avec_base()
+
+def get_current_round():
+    matchs = get_matchs()
+    return 0 if matchs.empty else int(matchs["Round"].max())
 
 def get_nom_complet(j):
     return f"{j['Prénom']} {j['Nom']}"
 
+# === REGISTRE DES JOUEURS ===
+
+def normaliser_nom(p, n):
+    return (p.lower().strip(), n.lower().strip())
+
+def indexer_joueur(registre, position, joueur):
+    """Ajoute un joueur validé aux index du registre (le premier joueur d'un même nom est conservé)"""
+    registre["index"].setdefault(normaliser_nom(joueur['Prénom'], joueur['Nom']), position)
+    registre["categories"].setdefault(get_nom_complet(joueur), joueur['Catégorie'])
+    registre["nb_joueurs"] = position + 1
+
+def reconstruire_registre():
+    """Reconstruit les index du registre à partir de la liste des joueurs validés"""
+    registre = {"nb_joueurs": 0, "index": {}, "categories": {}}
+    for position, joueur in enumerate(etat.joueurs):
+        indexer_joueur(registre, position, joueur)
+    etat.registre_joueurs = registre
+    return registre
+
+def get_registre():
+    """Retourne le registre des joueurs, reconstruit si la liste des joueurs a changé en dehors du registre"""
+    registre = etat.registre_joueurs
+    if not registre or registre["nb_joueurs"] != len(etat.joueurs):
+        registre = reconstruire_registre()
+    return registre
+
+def valider_joueur(joueur):
+    """Ajoute un joueur à la liste des joueurs validés en maintenant le registre à jour"""
+    registre = get_registre()
+    etat.joueurs.append(joueur)
+    indexer_joueur(registre, len(etat.joueurs) - 1, joueur)
+
+def joueur_existe(p, n):
+    return normaliser_nom(p, n) in get_registre()["index"]
+
 def est_organisateur():
-    return st.session_state.profil == "Organisateur"
+    return etat.profil == "Organisateur"
 
 def get_nom_affichage_equipe(eq):
     return eq['Surnom'] if pd.notna(eq['Surnom']) and eq['Surnom'].strip() else eq['ID']
@@ -98,67 +745,480 @@ def get_categorie_joueur(nom_complet):
     if "Joker" in nom_complet:
         return "Joker"
     
-    for joueur in st.session_state.joueurs:
-        if get_nom_complet(joueur) == nom_complet:
-            return joueur['Catégorie']
-    return "Joker"
+    return get_registre()["categories"].get(nom_complet, "Joker")
+
+def get_coefficient_joueur(nom_complet):
+    return etat.categories_dict.get(get_categorie_joueur(nom_complet), 1.0)
 
 def get_equipes_actuelles():
-    if st.session_state.mode_tournoi == "Classique":
-        return st.session_state.equipes_fixes
+    if etat.mode_tournoi == "Classique":
+        return etat.equipes_fixes
     else:
-        if st.session_state.historique_equipes.empty:
+        if etat.historique_equipes.empty:
             return pd.DataFrame()
-        dernier_round = st.session_state.historique_equipes["Round"].max()
-        return st.session_state.historique_equipes[
-            st.session_state.historique_equipes["Round"] == dernier_round
+        dernier_round = etat.historique_equipes["Round"].max()
+        return etat.historique_equipes[
+            etat.historique_equipes["Round"] == dernier_round
         ].drop(columns=["Round"])
 
 def get_equipes_par_round(round_num):
-    if st.session_state.historique_equipes.empty:
+    if etat.historique_equipes.empty:
         return pd.DataFrame()
-    return st.session_state.historique_equipes[
-        st.session_state.historique_equipes["Round"] == round_num
+    return etat.historique_equipes[
+        etat.historique_equipes["Round"] == round_num
     ].drop(columns=["Round"])
 
-# === NOUVELLES FONCTIONS POUR LE MODE INDIVIDUEL ÉQUILIBRÉ ===
+def get_noms_affichage_equipes(equipes):
+    """Version vectorisée de get_nom_affichage_equipe: surnom de chaque équipe, sinon son ID"""
+    surnoms = equipes["Surnom"]
+    return surnoms.where(surnoms.notna() & surnoms.astype(str).str.strip().ne(""), equipes["ID"])
 
-def calculer_statistiques_joueurs():
-    """Calcule le nombre de matchs joués par chaque joueur"""
-    stats = defaultdict(int)
+@memoiser_par_version
+def get_matchs_affichage():
+    """Table des matchs de l'onglet Matchs, avec le nom d'affichage des deux équipes
+
+    Les noms sont lus dans une table (Round, ID) -> nom (ID seul pour les équipes fixes du mode
+    classique), à défaut l'ID de l'équipe. Le résultat est partagé et ne doit pas être modifié.
+    """
+    matchs = get_matchs_detail()
+    if etat.mode_tournoi == "Classique":
+        equipes = etat.equipes_fixes
+        index_noms = pd.Index(equipes["ID"])
+        cles = {cote: pd.Index(matchs[f"Equipe_{cote}_ID"]) for cote in "AB"}
+    else:
+        equipes = etat.historique_equipes
+        index_noms = pd.MultiIndex.from_arrays([equipes["Round"], equipes["ID"]])
+        cles = {cote: pd.MultiIndex.from_arrays([matchs["Round"], matchs[f"Equipe_{cote}_ID"]]) for cote in "AB"}
+    noms = pd.Series(get_noms_affichage_equipes(equipes).to_numpy(), index=index_noms)
+    # Première équipe de chaque clé, comme une recherche ligne à ligne
+    noms = noms[~noms.index.duplicated()]
+    
+    matchs_display = matchs.copy()
+    for cote in "AB":
+        noms_cote = noms.reindex(cles[cote]).to_numpy()
+        matchs_display[f"Équipe {cote}"] = np.where(pd.isna(noms_cote), matchs[f"Equipe_{cote}_ID"], noms_cote)
+    return matchs_display[[
+        "Round", "Terrain", "Type", "Équipe A", "J1_A", "J2_A",
+        "Score_A", "Score_B", "Équipe B", "J1_B", "J2_B", "Jokers"
+    ]].rename(columns={"Score_A": "Score A", "Score_B": "Score B"})
+
+# === STATISTIQUES INCRÉMENTALES DES JOUEURS ===
+
+def contributions_match(match):
+    """Retourne la contribution d'un match aux statistiques de chaque joueur
+
+    Chaque contribution est un tuple (joueur, compte_equilibre, compte_classement, points_marques, points_encaisses):
+    - compte_equilibre: le match compte dans le nombre de matchs joués (sauf les "Joker" et les jokers des matchs de rattrapage)
+    - compte_classement: le match compte au classement (sauf jokers des matchs de rattrapage)
+    """
+    # Ignorer les matchs non joués
+    if match["Score_A"] == 0 and match["Score_B"] == 0:
+        return []
+    
+    jokers = match["Jokers"].split(',') if isinstance(match["Jokers"], str) and match["Jokers"] else []
+    contributions = []
+    
+    for joueurs, points_marques, points_encaisses in (
+        ([match['J1_A'], match['J2_A']], match["Score_A"], match["Score_B"]),
+        ([match['J1_B'], match['J2_B']], match["Score_B"], match["Score_A"])
+    ):
+        for joueur in joueurs:
+            if not joueur:
+                continue
+            compte_classement = not (match["Type"] == "rattrapage" and joueur in jokers)
+            compte_equilibre = compte_classement and "Joker" not in str(joueur)
+            contributions.append((joueur, compte_equilibre, compte_classement, points_marques, points_encaisses))
     
-    if st.session_state.matchs_detail.empty:
-        return stats
+    return contributions
+
+def appliquer_match_aux_statistiques(match, signe=1):
+    """Ajoute (signe=1) ou retire (signe=-1) la contribution d'un match aux statistiques cumulées"""
+    cumul = etat.statistiques_joueurs["joueurs"]
+    
+    for joueur, compte_equilibre, compte_classement, pm, pe in contributions_match(match):
+        stats = cumul.setdefault(joueur, {"matchs": 0, "MJ": 0, "PM": 0, "PE": 0, "Diff": 0})
+        if compte_equilibre:
+            stats["matchs"] += signe
+        if compte_classement:
+            stats["MJ"] += signe
+            stats["PM"] += signe * pm
+            stats["PE"] += signe * pe
+            stats["Diff"] += signe * (pm - pe)
+
+def agreger_statistiques_matchs(matchs_detail):
+    """Agrège les statistiques de tous les matchs par joueur, en colonnes (sans boucle sur les matchs)
+
+    Même règle que contributions_match: une ligne par (match, joueur, côté), les matchs 0-0 sont ignorés
+    et les jokers des matchs de rattrapage ne comptent pas au classement.
+    """
+    colonnes = ["matchs", "MJ", "PM", "PE", "Diff"]
+    if matchs_detail.empty:
+        return pd.DataFrame(columns=colonnes)
+    
+    matchs = matchs_detail.reset_index(drop=True)
+    score_a = pd.to_numeric(matchs["Score_A"])
+    score_b = pd.to_numeric(matchs["Score_B"])
+    
+    # Une ligne par (match, joueur, côté)
+    places = ["J1_A", "J2_A", "J1_B", "J2_B"]
+    lignes = matchs[places].melt(var_name="Place", value_name="Joueur", ignore_index=False)
+    num_match = lignes.index.to_numpy()
+    cote_a = lignes["Place"].str.endswith("_A").to_numpy()
+    pm = np.where(cote_a, score_a.to_numpy()[num_match], score_b.to_numpy()[num_match])
+    pe = np.where(cote_a, score_b.to_numpy()[num_match], score_a.to_numpy()[num_match])
+    
+    # Jokers des matchs de rattrapage: découpage de la colonne Jokers en couples (match, joueur)
+    jokers = matchs["Jokers"].where(matchs["Type"] == "rattrapage", "").fillna("").astype(str).str.split(",").explode()
+    jokers = jokers[jokers != ""]
+    est_joker = pd.MultiIndex.from_arrays([num_match, lignes["Joueur"]]).isin(
+        pd.MultiIndex.from_arrays([jokers.index.to_numpy(), jokers.to_numpy()])
+    )
     
-    for _, match in st.session_state.matchs_detail.iterrows():
-        # Ignorer les matchs non joués
-        if match["Score_A"] == 0 and match["Score_B"] == 0:
-            continue
-        
-        # Compter pour l'équipe A
-        for joueur in [match['J1_A'], match['J2_A']]:
-            if joueur and "Joker" not in str(joueur):
-                stats[joueur] += 1
-        
-        # Compter pour l'équipe B
-        for joueur in [match['J1_B'], match['J2_B']]:
-            if joueur and "Joker" not in str(joueur):
-                stats[joueur] += 1
+    joueurs = lignes["Joueur"]
+    present = (joueurs.notna() & (joueurs != "")).to_numpy()
+    joue = ~((score_a == 0) & (score_b == 0)).to_numpy()[num_match]
+    compte_classement = present & joue & ~est_joker
+    compte_equilibre = compte_classement & ~joueurs.astype(str).str.contains("Joker", regex=False).to_numpy()
+    
+    contributions = pd.DataFrame({
+        "Joueur": joueurs.to_numpy(),
+        "matchs": compte_equilibre.astype(int),
+        "MJ": compte_classement.astype(int),
+        "PM": np.where(compte_classement, pm, 0),
+        "PE": np.where(compte_classement, pe, 0),
+        "Diff": np.where(compte_classement, pm - pe, 0)
+    })[present & joue]
+    
+    return contributions.groupby("Joueur", sort=False)[colonnes].sum()
+
+def reconstruire_statistiques():
+    """Recalcule entièrement les statistiques cumulées (après un import ou une réinitialisation)"""
+    etat.statistiques_joueurs = {
+        "nb_matchs": get_nb_matchs(),
+        "joueurs": agreger_statistiques_matchs(get_matchs_detail()).to_dict("index")
+    }
+
+def ajouter_matchs_aux_statistiques(matchs):
+    """Prend en compte les matchs (liste de dictionnaires) qui viennent d'être ajoutés au magasin"""
+    cumul = etat.statistiques_joueurs
+    if not cumul or cumul["nb_matchs"] + len(matchs) != get_nb_matchs():
+        reconstruire_statistiques()
+        return
+    
+    for match in matchs:
+        appliquer_match_aux_statistiques(match, 1)
+    cumul["nb_matchs"] += len(matchs)
+
+def get_statistiques_cumulees():
+    """Retourne les statistiques cumulées par joueur, reconstruites si elles ne sont plus synchronisées"""
+    cumul = etat.statistiques_joueurs
+    if not cumul or cumul["nb_matchs"] != get_nb_matchs():
+        reconstruire_statistiques()
+    return etat.statistiques_joueurs["joueurs"]
+
+def appliquer_score(id_match, score_a, score_b):
+    """Modifie le score d'un match en mettant à jour les statistiques par différence"""
+    get_statistiques_cumulees()
+    magasin = etat.magasin_matchs
+    
+    appliquer_match_aux_statistiques(magasin["lignes"][id_match], -1)
+    modifier_magasin(magasin, id_match, {"Score_A": int(score_a), "Score_B": int(score_b)})
+    appliquer_match_aux_statistiques(magasin["lignes"][id_match], 1)
+
+def modifier_score_match(id_match, score_a, score_b):
+    """Journalise le score saisi pour un match et l'enregistre; retourne False si le journal le refuse"""
+    return journaliser("score_modifie", {"ID_Match": int(id_match), "Score_A": int(score_a), "Score_B": int(score_b)})
+
+def enregistrer_score_terrain(id_match, score_a, score_b):
+    """Enregistre le score d'un seul match (saisie au bord du terrain); en enchaînement continu, relance les terrains libres"""
+    if not modifier_score_match(id_match, score_a, score_b):
+        return False
+    incrementer_version_etat()
+    if etat.enchainement_continu:
+        remplir_terrains_libres()
+    return True
+
+# === HISTORIQUE DES PARTENAIRES ET ADVERSAIRES ===
+
+def creer_rencontres():
+    """Nombre de matchs joués ensemble / l'un contre l'autre par chaque paire de joueurs
+
+    Deux matrices int16 symétriques indexées par l'identifiant des joueurs ("ids": nom -> identifiant,
+    "noms": identifiant -> nom), agrandies par doublement quand un nouveau joueur apparaît.
+    """
+    return {
+        "nb_matchs": 0,
+        "ids": {},
+        "noms": [],
+        "partenaires": np.zeros((16, 16), dtype=np.int16),
+        "adversaires": np.zeros((16, 16), dtype=np.int16)
+    }
+
+def identifiant_joueur(rencontres, nom):
+    """Identifiant d'un joueur dans les matrices de rencontres, attribué à son premier match"""
+    if nom not in rencontres["ids"]:
+        rencontres["ids"][nom] = len(rencontres["noms"])
+        rencontres["noms"].append(nom)
+        taille = len(rencontres["partenaires"])
+        if len(rencontres["noms"]) > taille:
+            for cle in ("partenaires", "adversaires"):
+                matrice = np.zeros((2 * taille, 2 * taille), dtype=np.int16)
+                matrice[:taille, :taille] = rencontres[cle]
+                rencontres[cle] = matrice
+    return rencontres["ids"][nom]
+
+def appliquer_match_aux_rencontres(rencontres, match):
+    """Compte les partenaires et adversaires d'un match (les jokers de remplacement ne sont pas des joueurs)"""
+    equipe_a, equipe_b = (
+        [identifiant_joueur(rencontres, nom) for nom in noms if nom and "Joker" not in str(nom)]
+        for noms in ((match["J1_A"], match["J2_A"]), (match["J1_B"], match["J2_B"]))
+    )
+    partenaires = rencontres["partenaires"]
+    adversaires = rencontres["adversaires"]
+    
+    for equipe in (equipe_a, equipe_b):
+        if len(equipe) == 2:
+            partenaires[equipe[0], equipe[1]] += 1
+            partenaires[equipe[1], equipe[0]] += 1
+    for a in equipe_a:
+        for b in equipe_b:
+            adversaires[a, b] += 1
+            adversaires[b, a] += 1
+
+def reconstruire_rencontres():
+    """Recalcule entièrement les rencontres à partir de la table des matchs"""
+    rencontres = creer_rencontres()
+    for match in etat.magasin_matchs["lignes"]:
+        appliquer_match_aux_rencontres(rencontres, match)
+    rencontres["nb_matchs"] = get_nb_matchs()
+    etat.rencontres_joueurs = rencontres
+    return rencontres
+
+def ajouter_matchs_aux_rencontres(matchs):
+    """Prend en compte les matchs (liste de dictionnaires) qui viennent d'être ajoutés au magasin"""
+    rencontres = etat.rencontres_joueurs
+    if not rencontres or rencontres["nb_matchs"] + len(matchs) != get_nb_matchs():
+        reconstruire_rencontres()
+        return
+    
+    for match in matchs:
+        appliquer_match_aux_rencontres(rencontres, match)
+    rencontres["nb_matchs"] += len(matchs)
+
+def get_rencontres():
+    """Retourne les rencontres, reconstruites si elles ne sont plus synchronisées avec la table des matchs"""
+    rencontres = etat.rencontres_joueurs
+    if not rencontres or rencontres["nb_matchs"] != get_nb_matchs():
+        rencontres = reconstruire_rencontres()
+    return rencontres
+
+def nb_fois_partenaires(joueur_1, joueur_2):
+    """Nombre de matchs joués ensemble par deux joueurs"""
+    rencontres = get_rencontres()
+    i, j = rencontres["ids"].get(joueur_1), rencontres["ids"].get(joueur_2)
+    return 0 if i is None or j is None else int(rencontres["partenaires"][i, j])
+
+def nb_fois_adversaires(joueur_1, joueur_2):
+    """Nombre de matchs joués l'un contre l'autre par deux joueurs"""
+    rencontres = get_rencontres()
+    i, j = rencontres["ids"].get(joueur_1), rencontres["ids"].get(joueur_2)
+    return 0 if i is None or j is None else int(rencontres["adversaires"][i, j])
+
+def sous_matrices_rencontres(rencontres, joueurs):
+    """Matrices (partenaires, adversaires) restreintes à une liste de joueurs, dans son ordre
+
+    Les joueurs sans match (ou None pour un joker) ont une ligne et une colonne nulles.
+    """
+    connus = np.array([joueur in rencontres["ids"] for joueur in joueurs], dtype=bool)
+    ids = np.array([rencontres["ids"].get(joueur, 0) for joueur in joueurs], dtype=int)
+    masque = np.outer(connus, connus)
+    return tuple(
+        np.where(masque, rencontres[cle][np.ix_(ids, ids)], 0).astype(np.int16)
+        for cle in ("partenaires", "adversaires")
+    )
+
+def get_noms_inscrits():
+    return list(dict.fromkeys(get_nom_complet(joueur) for joueur in etat.joueurs))
+
+def tableau_rencontres(cle):
+    """Carte des partenaires (cle="partenaires") ou adversaires (cle="adversaires") des joueurs inscrits"""
+    noms = get_noms_inscrits()
+    matrices = sous_matrices_rencontres(get_rencontres(), noms)
+    return pd.DataFrame(matrices[0 if cle == "partenaires" else 1], index=noms, columns=noms)
+
+def tableau_rencontres_joueur(nom):
+    """Partenaires et adversaires d'un joueur: une ligne par joueur inscrit déjà rencontré, les plus fréquents d'abord"""
+    rencontres = get_rencontres()
+    autres = [autre for autre in get_noms_inscrits() if autre != nom and autre in rencontres["ids"]]
+    i = rencontres["ids"].get(nom)
+    if i is None or not autres:
+        return pd.DataFrame(columns=["Partenaire", "Adversaire"])
+    ids = [rencontres["ids"][autre] for autre in autres]
+    tableau = pd.DataFrame({
+        "Partenaire": rencontres["partenaires"][i, ids],
+        "Adversaire": rencontres["adversaires"][i, ids]
+    }, index=pd.Index(autres, name="Joueur"))
+    tableau = tableau[(tableau["Partenaire"] > 0) | (tableau["Adversaire"] > 0)]
+    return tableau.sort_values(["Partenaire", "Adversaire"], ascending=False)
+
+def carte_rencontres_coloree(cle):
+    """Carte des rencontres colorée selon le nombre de matchs (une couleur par valeur, appliquée d'un bloc)"""
+    df_rencontres = tableau_rencontres(cle)
+    valeurs = df_rencontres.to_numpy()
+    maximum = max(int(valeurs.max()), 1) if valeurs.size else 1
+    palette = np.array(
+        [""] + [f"background-color: rgba(75, 139, 190, {v / maximum:.2f})" for v in range(1, maximum + 1)],
+        dtype=object
+    )
+    couleurs = pd.DataFrame(palette[valeurs], index=df_rencontres.index, columns=df_rencontres.columns)
+    return df_rencontres.style.apply(lambda _: couleurs, axis=None)
+
+@memoiser_par_version
+def get_carte_partenaires():
+    return carte_rencontres_coloree("partenaires")
+
+@memoiser_par_version
+def get_carte_adversaires():
+    return carte_rencontres_coloree("adversaires")
+
+# === GRAINES ALÉATOIRES DES ROUNDS ===
+
+def get_graine_tournoi():
+    """Graine du tournoi, tirée au hasard à la première génération puis journalisée avec l'état"""
+    if etat.graine_tournoi is None:
+        etat.graine_tournoi = random.SystemRandom().getrandbits(32)
+    return etat.graine_tournoi
+
+def get_rng_round(round_num, *composantes):
+    """Générateur aléatoire d'un round: les générateurs n'utilisent que lui, jamais le module random
+
+    La graine du round est dérivée de celle du tournoi à sa première génération, puis conservée dans
+    graines_rounds: à état identique, les mêmes matchs sont générés. composantes distingue plusieurs
+    tirages dans un même round (un par terrain en enchaînement continu).
+    """
+    graines = etat.graines_rounds
+    if str(round_num) not in graines:
+        graines[str(round_num)] = random.Random(f"{get_graine_tournoi()}:{round_num}").getrandbits(32)
+    return random.Random(":".join(str(c) for c in (graines[str(round_num)],) + composantes))
+
+# === OPTIMISATION DES ÉQUIPES DU MODE INDIVIDUEL (RECUIT SIMULÉ) ===
+
+# Coût d'un round: répétitions de partenaires et d'adversaires, écart de coefficient entre les équipes
+POIDS_PARTENAIRE_REPETE = 10.0  # Par fois où les deux partenaires ont déjà joué ensemble
+POIDS_ADVERSAIRE_REPETE = 3.0  # Par fois où deux adversaires se sont déjà affrontés
+POIDS_ECART_MATCH = 20.0  # Par point d'écart de coefficient entre les deux équipes d'un match
+POIDS_DISPERSION_EQUIPES = 100.0  # Par carré d'écart du coefficient d'une équipe à la moyenne du round
+NB_ITERATIONS_PAR_JOUEUR = 500  # Échanges tentés par joueur en jeu (nombre fixe: même graine, même résultat)
+BUDGET_OPTIMISATION_S = 1.0  # Durée maximale du recuit, au-delà le meilleur round trouvé est retenu (seul écart au déterminisme)
+TEMPERATURE_INITIALE = 5.0
+TEMPERATURE_FINALE = 0.05
+
+def optimiser_round_individuel(joueurs, coefficients, partenaires, adversaires, graine=None, budget=None):
+    """Répartit les joueurs (4 par match, None pour le joker) en matchs de coût minimal par recuit simulé
+
+    partenaires et adversaires sont les matrices de rencontres des joueurs, dans l'ordre de la liste
+    (voir sous_matrices_rencontres). Le coût d'un match ne dépend que de ses quatre joueurs: un échange
+    de deux joueurs ne recalcule que les (au plus) deux matchs touchés.
+    Retourne la liste des matchs ((a1, a2), (b1, b2)). budget vaut BUDGET_OPTIMISATION_S par défaut.
+    """
+    rng = random.Random(graine)
+    budget = BUDGET_OPTIMISATION_S if budget is None else budget
+    m = len(joueurs)
+    nb_matchs = m // 4
+    
+    # Coûts des paires (partenaires, adversaires) et coefficients, indexés par position dans joueurs
+    cout_partenaires = (POIDS_PARTENAIRE_REPETE * np.asarray(partenaires, dtype=float)).tolist()
+    cout_adversaires = (POIDS_ADVERSAIRE_REPETE * np.asarray(adversaires, dtype=float)).tolist()
+    coeffs = [coefficients.get(joueur, 1.0) for joueur in joueurs]
+    moyenne = sum(coeffs) / m if m else 0.0
+    
+    places = list(range(m))
+    rng.shuffle(places)
+    
+    def cout_match(numero):
+        a1, a2, b1, b2 = places[4 * numero:4 * numero + 4]
+        coeff_a = (coeffs[a1] + coeffs[a2]) / 2
+        coeff_b = (coeffs[b1] + coeffs[b2]) / 2
+        return (
+            cout_partenaires[a1][a2] + cout_partenaires[b1][b2]
+            + cout_adversaires[a1][b1] + cout_adversaires[a1][b2]
+            + cout_adversaires[a2][b1] + cout_adversaires[a2][b2]
+            + POIDS_ECART_MATCH * abs(coeff_a - coeff_b)
+            + POIDS_DISPERSION_EQUIPES * ((coeff_a - moyenne) ** 2 + (coeff_b - moyenne) ** 2)
+        )
+    
+    couts = [cout_match(numero) for numero in range(nb_matchs)]
+    total = sum(couts)
+    meilleur_total, meilleures_places = total, places[:]
+    
+    nb_iterations = NB_ITERATIONS_PAR_JOUEUR * m
+    refroidissement = (TEMPERATURE_FINALE / TEMPERATURE_INITIALE) ** (1 / max(nb_iterations, 1))
+    temperature = TEMPERATURE_INITIALE
+    fin = time.perf_counter() + budget
+    
+    for iteration in range(nb_iterations):
+        if iteration % 1024 == 0 and time.perf_counter() > fin:
+            break
+        temperature *= refroidissement
+        i, j = rng.randrange(m), rng.randrange(m)
+        if i // 2 == j // 2:
+            continue  # Même équipe: l'échange ne change rien
+        
+        match_i, match_j = i // 4, j // 4
+        places[i], places[j] = places[j], places[i]
+        nouveau_i = cout_match(match_i)
+        nouveau_j = cout_match(match_j) if match_j != match_i else 0.0
+        ancien = couts[match_i] + (couts[match_j] if match_j != match_i else 0.0)
+        delta = nouveau_i + nouveau_j - ancien
+        
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            couts[match_i] = nouveau_i
+            if match_j != match_i:
+                couts[match_j] = nouveau_j
+            total += delta
+            if total < meilleur_total - 1e-9:
+                meilleur_total, meilleures_places = total, places[:]
+        else:
+            places[i], places[j] = places[j], places[i]
     
-    return stats
+    return [
+        ((joueurs[meilleures_places[k]], joueurs[meilleures_places[k + 1]]),
+         (joueurs[meilleures_places[k + 2]], joueurs[meilleures_places[k + 3]]))
+        for k in range(0, 4 * nb_matchs, 4)
+    ]
+
+# === NOUVELLES FONCTIONS POUR LE MODE INDIVIDUEL ÉQUILIBRÉ ===
+
+@memoiser_par_version
+def calculer_statistiques_joueurs():
+    """Calcule le nombre de matchs joués par chaque joueur"""
+    return defaultdict(int, {
+        joueur: stats["matchs"]
+        for joueur, stats in get_statistiques_cumulees().items()
+        if stats["matchs"] > 0
+    })
 
 def generer_equipes_equilibrees():
-    """Génère des équipes équilibrées en priorisant les joueurs ayant le moins joué"""
-    if len(st.session_state.joueurs) < 2:
-        st.error("Il faut au moins 2 joueurs")
+    """Génère des équipes équilibrées en priorisant les joueurs ayant le moins joué
+
+    Les joueurs qui jouent ce round sont répartis en matchs par optimiser_round_individuel (partenaires
+    et adversaires nouveaux, équipes de niveaux proches); ceux au repos sont appariés dans l'ordre.
+    Les équipes qui jouent sont rangées match par match: (E1 contre E2), (E3 contre E4)...
+    Les tirages au sort utilisent la graine du round (voir get_rng_round).
+    """
+    if len(etat.joueurs) < 2:
+        notifier("erreur", "Il faut au moins 2 joueurs")
         return False
     
+    round_num = get_current_round() + 1
+    rng = get_rng_round(round_num)
+    
     # Calculer les statistiques actuelles
     stats = calculer_statistiques_joueurs()
     
     # Liste des joueurs avec leur nombre de matchs
     joueurs_avec_stats = []
-    for joueur in st.session_state.joueurs:
+    for joueur in etat.joueurs:
         nom_complet = get_nom_complet(joueur)
         joueurs_avec_stats.append({
             'nom': nom_complet,
@@ -167,76 +1227,82 @@ def generer_equipes_equilibrees():
         })
     
     # Trier par nombre de matchs (du moins au plus) puis aléatoirement pour les égalités
-    joueurs_avec_stats.sort(key=lambda x: (x['matchs'], random.random()))
+    joueurs_avec_stats.sort(key=lambda x: (x['matchs'], rng.random()))
+    categories = {j['nom']: j['categorie'] for j in joueurs_avec_stats}
+    
+    # Les moins actifs jouent, 4 par terrain utilisé (le joker complète un nombre impair de joueurs)
+    nb_equipes = (len(joueurs_avec_stats) + 1) // 2
+    nb_matchs = min(etat.nb_terrains, nb_equipes // 2)
+    en_jeu = [j['nom'] for j in joueurs_avec_stats[:4 * nb_matchs]]
+    en_jeu += [None] * (4 * nb_matchs - len(en_jeu))
+    
+    partenaires, adversaires = sous_matrices_rencontres(get_rencontres(), en_jeu)
+    coefficients = {nom: etat.categories_dict.get(cat, 1.0) for nom, cat in categories.items()}
+    matchs = optimiser_round_individuel(en_jeu, coefficients, partenaires, adversaires, graine=rng.getrandbits(32))
     
     # Créer des paires
+    paires = [equipe for match in matchs for equipe in match]
+    au_repos = [j['nom'] for j in joueurs_avec_stats[4 * nb_matchs:]]
+    paires += [(au_repos[i], au_repos[i + 1] if i + 1 < len(au_repos) else None) for i in range(0, len(au_repos), 2)]
+    
     equipes = []
-    round_num = get_current_round() + 1
     
-    for i in range(0, len(joueurs_avec_stats), 2):
-        if i + 1 < len(joueurs_avec_stats):
-            j1 = joueurs_avec_stats[i]
-            j2 = joueurs_avec_stats[i + 1]
-            
-            equipe_id = f"R{round_num}_E{i//2+1}"
+    for i, (j1, j2) in enumerate(paires):
+        if j1 is None:
+            j1, j2 = j2, j1
+        equipe_id = f"R{round_num}_E{i+1}"
+        
+        if j2 is not None:
             equipes.append({
                 "Round": round_num,
                 "ID": equipe_id,
                 "Surnom": equipe_id,
-                "J1": j1['nom'],
-                "Cat1": j1['categorie'],
-                "J2": j2['nom'],
-                "Cat2": j2['categorie'],
-                "Coeff": round((st.session_state.categories_dict.get(j1['categorie'], 1.0) +  
-                               st.session_state.categories_dict.get(j2['categorie'], 1.0)) / 2, 3)
+                "J1": j1,
+                "Cat1": categories[j1],
+                "J2": j2,
+                "Cat2": categories[j2],
+                "Coeff": round((etat.categories_dict.get(categories[j1], 1.0) +  
+                               etat.categories_dict.get(categories[j2], 1.0)) / 2, 3)
             })
         else:
             # Joueur impair -> avec joker
-            j1 = joueurs_avec_stats[i]
-            equipe_id = f"R{round_num}_E{i//2+1}"
             equipes.append({
                 "Round": round_num,
                 "ID": equipe_id,
                 "Surnom": equipe_id,
-                "J1": j1['nom'],
-                "Cat1": j1['categorie'],
+                "J1": j1,
+                "Cat1": categories[j1],
                 "J2": f"Joker_R{round_num}",
                 "Cat2": "Joker",
-                "Coeff": round((st.session_state.categories_dict.get(j1['categorie'], 1.0) + 1.0) / 2, 3)
+                "Coeff": round((etat.categories_dict.get(categories[j1], 1.0) + 1.0) / 2, 3)
             })
-            st.warning(f"⚠️ Joueur impair: {j1['nom']} avec Joker")
-    
-    # Sauvegarder dans l'historique
-    df_equipes = pd.DataFrame(equipes)
-    st.session_state.historique_equipes = pd.concat([
-        st.session_state.historique_equipes,  
-        df_equipes
-    ], ignore_index=True)
+            notifier("avertissement", f"⚠️ Joueur impair: {j1} avec Joker")
     
+    # Ajoutées à l'historique avec les matchs du round (voir generer_round_individuel_equilibre)
     return equipes
 
 def generer_round_individuel_equilibre():
     """Génère un round en mode individuel avec équilibrage"""
-    if len(st.session_state.joueurs) < 2:
-        st.error("Il faut au moins 2 joueurs")
+    if len(etat.joueurs) < 2:
+        notifier("erreur", "Il faut au moins 2 joueurs")
         return False
     
     # Générer les équipes équilibrées
     equipes = generer_equipes_equilibrees()
     
     if not equipes:
-        st.error("Impossible de générer les équipes")
+        notifier("erreur", "Impossible de générer les équipes")
         return False
     
     # Générer les matchs
     round_num = get_current_round() + 1
     nb_equipes = len(equipes)
-    nb_terrains = st.session_state.nb_terrains
+    nb_terrains = etat.nb_terrains
     matchs_possibles = min(nb_terrains, nb_equipes // 2)
     
     if matchs_possibles * 2 < nb_equipes:
-        st.warning(f"⚠️ {nb_equipes} équipes pour {nb_terrains} terrains")
-        st.warning(f"Seulement {matchs_possibles} matchs seront joués")
+        notifier("avertissement", f"⚠️ {nb_equipes} équipes pour {nb_terrains} terrains")
+        notifier("avertissement", f"Seulement {matchs_possibles} matchs seront joués")
     
     # Créer les matchs
     matchs = []
@@ -259,36 +1325,21 @@ def generer_round_individuel_equilibre():
             "Jokers": ""
         })
     
-    # Ajouter aux matchs détaillés
+    # Ajouter aux matchs détaillés, et les équipes du round à l'historique
     if matchs:
-        df_matchs = pd.DataFrame(matchs)
-        st.session_state.matchs_detail = pd.concat([
-            st.session_state.matchs_detail,
-            df_matchs
-        ], ignore_index=True)
-        
-        # Synchroniser avec les matchs simplifiés
-        for match in matchs:
-            st.session_state.matchs = pd.concat([
-                st.session_state.matchs,
-                pd.DataFrame([{
-                    "Round": match["Round"],
-                    "Terrain": match["Terrain"],
-                    "Type": match["Type"],
-                    "Equipe A": match["Equipe_A_ID"],
-                    "Score A": match["Score_A"],
-                    "Equipe B": match["Equipe_B_ID"],
-                    "Score B": match["Score_B"]
-                }])
-            ], ignore_index=True)
-        
-        st.success(f"✅ Round {round_num} généré avec {len(matchs)} matchs équilibrés!")
+        if not enregistrer_matchs(matchs, "generer_round", equipes):
+            return False
+        incrementer_version_etat()
+        
+        notifier("succes", f"✅ Round {round_num} généré avec {len(matchs)} matchs équilibrés!")
         return True
     
+    incrementer_version_etat()
     return False
 
 # === FONCTIONS POUR LA CLÔTURE DU TOURNOI ===
 
+@memoiser_par_version
 def analyser_retards_joueurs():
     """Analyse les retards des joueurs et retourne les statistiques"""
     stats = calculer_statistiques_joueurs()
@@ -303,7 +1354,7 @@ def analyser_retards_joueurs():
     joueurs_en_retard = []
     retards = {}
     
-    for joueur in st.session_state.joueurs:
+    for joueur in etat.joueurs:
         nom_complet = get_nom_complet(joueur)
         matchs_joues = stats.get(nom_complet, 0)
         
@@ -321,369 +1372,273 @@ def analyser_retards_joueurs():
     
     return joueurs_en_retard, max_matchs, retards
 
-def generer_round_rattrapage():
-    """Génère un round de rattrapage POUR LES JOUEURS EN RETARD UNIQUEMENT"""
-    # Analyser les retards
-    joueurs_en_retard, max_matchs, retards = analyser_retards_joueurs()
+def compter_matchs_programmes():
+    """Nombre de matchs programmés (joués ou non) par joueur, avec la même règle que l'équilibre des matchs joués"""
+    matchs_programmes = Counter()
+    for match in etat.magasin_matchs["lignes"]:
+        jokers = match["Jokers"].split(',') if match["Type"] == "rattrapage" and match["Jokers"] else []
+        for joueur in (match["J1_A"], match["J2_A"], match["J1_B"], match["J2_B"]):
+            if joueur and "Joker" not in str(joueur) and joueur not in jokers:
+                matchs_programmes[joueur] += 1
+    return matchs_programmes
+
+def repartir_rattrapage(retards, nb_terrains, nb_rounds, progression_max=False):
+    """Répartit les retards (joueur -> matchs à rattraper, dans l'ordre de priorité) sur nb_rounds rounds
+
+    À chaque round jouent d'abord les joueurs qui ont le plus de matchs à rattraper; leur nombre est
+    choisi pour limiter les jokers (compléments à un multiple de 4, pris de préférence parmi les joueurs
+    à jour et les moins sollicités), ou pour avancer au plus vite si progression_max.
+    Retourne [(joueurs en retard, jokers)] par round, ou None si c'est impossible en nb_rounds rounds.
+    """
+    restants = {joueur: retard for joueur, retard in retards.items() if retard > 0}
+    ordre = {joueur: i for i, joueur in enumerate(retards)}
+    nb_jokers = Counter()
+    capacite = 4 * nb_terrains
+    rounds = []
+    
+    for numero in range(nb_rounds):
+        rounds_restants = nb_rounds - numero
+        actifs = sorted((j for j in restants if restants[j] > 0), key=lambda j: (-restants[j], ordre[j]))
+        if not actifs:
+            break
+        if sum(restants[j] for j in actifs) > capacite * rounds_restants:
+            return None
+        
+        # Les joueurs qui ont autant de matchs à rattraper que de rounds restants doivent jouer
+        obligatoires = sum(1 for j in actifs if restants[j] == rounds_restants)
+        possibles = [
+            c for c in range(max(obligatoires, 1), min(capacite, len(actifs)) + 1)
+            if (-c) % 4 <= len(retards) - c
+        ]
+        if not possibles:
+            return None
+        if progression_max:
+            nb_en_retard = max(possibles)
+        else:
+            nb_en_retard = max(possibles, key=lambda c: (-((-c) % 4), c))
+        
+        en_retard = actifs[:nb_en_retard]
+        for joueur in en_retard:
+            restants[joueur] -= 1
+        
+        candidats = sorted(
+            (j for j in retards if j not in en_retard),
+            key=lambda j: (retards[j] > 0, nb_jokers[j], ordre[j])
+        )
+        jokers = candidats[:(-nb_en_retard) % 4]
+        nb_jokers.update(jokers)
+        rounds.append((en_retard, jokers))
     
-    if not joueurs_en_retard:
-        st.info("🎉 Tous les joueurs ont le même nombre de matchs! Aucun round de rattrapage nécessaire.")
+    if any(restants.values()):
         return None
+    return rounds
+
+def planifier_rattrapage(retards, nb_terrains):
+    """Planning de rattrapage en un minimum de rounds, puis avec un minimum de jokers
+
+    Retourne (rounds, None), ou (None, raison) si aucun planning n'est possible.
+    """
+    total = sum(retards.values())
+    if total == 0:
+        return [], None
+    if len(retards) < 4:
+        return None, "Il faut au moins 4 joueurs pour former un match"
+    
+    # Un joueur joue au plus un match par round, et chaque round compte au plus 4 × nb_terrains places
+    minimum = max(max(retards.values()), math.ceil(total / (4 * nb_terrains)))
+    for nb_rounds in range(minimum, total + 1):
+        for progression_max in (False, True):
+            rounds = repartir_rattrapage(retards, nb_terrains, nb_rounds, progression_max)
+            if rounds is not None:
+                return rounds, None
+    
+    return None, f"Aucun planning de rattrapage possible en moins de {total + 1} rounds"
+
+@chronometre
+def generer_derniers_rounds():
+    """Génère en une fois tous les rounds nécessaires pour équilibrer les matchs joués
+
+    Les retards sont calculés sur les matchs programmés (y compris ceux dont le score n'est pas saisi).
+    Le planning est entièrement calculé avant de créer le moindre match: s'il est impossible, rien n'est généré.
+    """
+    matchs_programmes = compter_matchs_programmes()
+    noms = list(dict.fromkeys(get_nom_complet(joueur) for joueur in etat.joueurs))
+    max_matchs = max((matchs_programmes[nom] for nom in noms), default=0)
+    retards = {nom: max_matchs - matchs_programmes[nom] for nom in noms}
+    
+    planning, raison = planifier_rattrapage(retards, etat.nb_terrains)
+    if planning is None:
+        notifier("erreur", f"❌ Rattrapage impossible: {raison}")
+        return False
+    if not planning:
+        notifier("info", "Aucun round de rattrapage nécessaire")
+        return False
     
-    # Liste des joueurs SANS retard (potentiels jokers)
-    joueurs_sans_retard = []
-    for joueur in st.session_state.joueurs:
-        nom_complet = get_nom_complet(joueur)
-        if nom_complet not in joueurs_en_retard:
-            joueurs_sans_retard.append({
-                'nom': nom_complet,
-                'categorie': joueur['Catégorie']
-            })
-    
-    # Trier les joueurs en retard par retard décroissant (ceux avec le plus de retard en premier)
-    joueurs_retard_tries = sorted(joueurs_en_retard, 
-                                  key=lambda x: retards[x]['retard'], 
-                                  reverse=True)
-    
-    # Créer les équipes UNIQUEMENT avec les joueurs en retard
-    equipes = []
-    joueurs_utilises = set()
-    round_num = get_current_round() + 1
+    rounds_generes = []
     
-    # Premier passage : former des équipes avec 2 joueurs en retard
-    for i in range(0, len(joueurs_retard_tries), 2):
-        if i + 1 < len(joueurs_retard_tries):
-            j1 = joueurs_retard_tries[i]
-            j2 = joueurs_retard_tries[i + 1]
-            
-            if j1 not in joueurs_utilises and j2 not in joueurs_utilises:
-                equipe_id = f"R{round_num}_RAT{i//2+1}"
-                equipes.append({
+    for en_retard, jokers in planning:
+        round_num = get_current_round() + 1
+        participants = en_retard + jokers
+        coefficients = {nom: get_coefficient_joueur(nom) for nom in participants}
+        partenaires, adversaires = sous_matrices_rencontres(get_rencontres(), participants)
+        rencontres_round = optimiser_round_individuel(
+            participants, coefficients, partenaires, adversaires, graine=get_rng_round(round_num).getrandbits(32)
+        )
+        
+        matchs = []
+        equipes_generees = []
+        for terrain, ((j1_a, j2_a), (j1_b, j2_b)) in enumerate(rencontres_round, 1):
+            ids = []
+            for j1, j2 in ((j1_a, j2_a), (j1_b, j2_b)):
+                numero = len(ids) + 2 * terrain - 1
+                equipe_id = f"R{round_num}_RAT{numero}"
+                ids.append(equipe_id)
+                equipes_generees.append({
                     "Round": round_num,
                     "ID": equipe_id,
-                    "Surnom": f"Rattrapage_{i//2+1}",
+                    "Surnom": f"Rattrapage_{numero}",
                     "J1": j1,
-                    "Cat1": retards[j1]['categorie'],
+                    "Cat1": get_categorie_joueur(j1),
                     "J2": j2,
-                    "Cat2": retards[j2]['categorie'],
-                    "Coeff": round((st.session_state.categories_dict.get(retards[j1]['categorie'], 1.0) +  
-                                   st.session_state.categories_dict.get(retards[j2]['categorie'], 1.0)) / 2, 3),
-                    "Type": "rattrapage",
-                    "JoueursRetard": [j1, j2],  # Les deux joueurs sont en retard
-                    "Jokers": []  # Pas de jokers dans cette équipe
+                    "Cat2": get_categorie_joueur(j2),
+                    "Coeff": round((get_coefficient_joueur(j1) + get_coefficient_joueur(j2)) / 2, 3)
                 })
-                joueurs_utilises.update([j1, j2])
-    
-    # Gérer le dernier joueur en retard si nombre impair
-    joueurs_retard_restants = [j for j in joueurs_retard_tries if j not in joueurs_utilises]
-    
-    if joueurs_retard_restants:
-        # Il reste un joueur en retard sans partenaire
-        j_retard_seul = joueurs_retard_restants[0]
-        
-        # Chercher un joker parmi les joueurs sans retard
-        joker_trouve = None
-        for joker in joueurs_sans_retard:
-            if joker['nom'] not in joueurs_utilises:
-                joker_trouve = joker
-                break
-        
-        if joker_trouve:
-            # Créer une équipe avec le joueur en retard et un joker
-            equipe_id = f"R{round_num}_RAT{len(equipes)+1}"
-            equipes.append({
+            
+            jokers_match = [joueur for joueur in (j1_a, j2_a, j1_b, j2_b) if joueur in jokers]
+            matchs.append({
                 "Round": round_num,
-                "ID": equipe_id,
-                "Surnom": f"Rattrapage_{len(equipes)+1}",
-                "J1": j_retard_seul,
-                "Cat1": retards[j_retard_seul]['categorie'],
-                "J2": joker_trouve['nom'],
-                "Cat2": joker_trouve['categorie'],
-                "Coeff": round((st.session_state.categories_dict.get(retards[j_retard_seul]['categorie'], 1.0) +  
-                               st.session_state.categories_dict.get(joker_trouve['categorie'], 1.0)) / 2, 3),
+                "Terrain": f"T{terrain}",
                 "Type": "rattrapage",
-                "JoueursRetard": [j_retard_seul],  # Seul le premier joueur est en retard
-                "Jokers": [joker_trouve['nom']]  # Le deuxième joueur est un joker
+                "Equipe_A_ID": ids[0],
+                "J1_A": j1_a,
+                "J2_A": j2_a,
+                "Score_A": 0,
+                "Equipe_B_ID": ids[1],
+                "J1_B": j1_b,
+                "J2_B": j2_b,
+                "Score_B": 0,
+                "Jokers": ",".join(jokers_match)
             })
-            joueurs_utilises.update([j_retard_seul, joker_trouve['nom']])
-        else:
-            # Aucun joker disponible, on ne peut pas créer l'équipe
-            st.warning(f"⚠️ Impossible de trouver un joker pour le joueur {j_retard_seul}")
-    
-    # Maintenant, nous avons des équipes composées soit de:
-    # 1. Deux joueurs en retard
-    # 2. Un joueur en retard + un joker (joueur sans retard)
-    
-    # Limiter le nombre de matchs aux terrains disponibles
-    nb_terrains = st.session_state.nb_terrains
-    nb_matchs_possibles = min(len(equipes) // 2, nb_terrains)
-    
-    if nb_matchs_possibles == 0:
-        st.warning("⚠️ Pas assez d'équipes pour créer un match")
-        return None
-    
-    # Sélectionner les équipes pour les matchs (prendre les premières équipes)
-    equipes_selectionnees = equipes[:nb_matchs_possibles * 2]
-    
-    # Créer les matchs
-    matchs = []
-    for i in range(0, len(equipes_selectionnees), 2):
-        equipe_a = equipes_selectionnees[i]
-        equipe_b = equipes_selectionnees[i + 1]
         
-        # Identifier les jokers pour ce match
-        jokers_match = equipe_a.get("Jokers", []) + equipe_b.get("Jokers", [])
-        
-        matchs.append({
-            "Round": round_num,
-            "Terrain": f"T{i//2 + 1}",
-            "Type": "rattrapage",
-            "Equipe_A_ID": equipe_a["ID"],
-            "J1_A": equipe_a["J1"],
-            "J2_A": equipe_a["J2"],
-            "Score_A": 0,
-            "Equipe_B_ID": equipe_b["ID"],
-            "J1_B": equipe_b["J1"],
-            "J2_B": equipe_b["J2"],
-            "Score_B": 0,
-            "Jokers": ",".join(jokers_match) if jokers_match else ""
-        })
+        # Chaque round est enregistré, avec ses équipes, avant de former le suivant (rencontres à jour)
+        if not enregistrer_matchs(matchs, "generer_derniers_rounds", equipes_generees):
+            return False
+        rounds_generes.append(matchs)
+    
+    incrementer_version_etat()
+    
+    total_matchs = sum(len(r) for r in rounds_generes)
+    total_jokers = sum(len(jokers) for _, jokers in planning)
+    notifier("succes", f"✅ {len(rounds_generes)} round(s) de rattrapage généré(s) avec {total_matchs} matchs "
+                       f"({total_jokers} participation(s) de joker)!")
+    
+    # Afficher un récapitulatif
+    recapitulatif = ["📊 **Récapitulatif des rounds de rattrapage**"]
+    for i, round_matchs in enumerate(rounds_generes, 1):
+        recapitulatif.append(f"- **Round de rattrapage {i}:** {len(round_matchs)} match(s)")
+        for match in round_matchs:
+            jokers = match['Jokers'].split(',') if match['Jokers'] else []
+            jokers_text = f" (Jokers: {', '.join(jokers)})" if jokers else ""
+            recapitulatif.append(f"  - {match['Equipe_A_ID']} vs {match['Equipe_B_ID']}{jokers_text}")
+    notifier("info", "\n".join(recapitulatif))
+    
+    return True
+
+# === CLASSEMENT PAR ÉQUIPES (MODE CLASSIQUE) ===
+
+COLONNES_CLASSEMENT_EQUIPES = ["Équipe", "Joueurs", "V", "N", "D", "PM", "PE", "Diff", "Points"]
+
+def classer_equipes(matchs, equipes_fixes, algo_classement):
+    """Calcule le classement par équipes en une seule passe sur les matchs"""
+    if matchs.empty or equipes_fixes.empty:
+        return pd.DataFrame()
     
-    # Afficher des statistiques
-    joueurs_retard_match = sum(len(eq.get("JoueursRetard", [])) for eq in equipes_selectionnees)
-    joueurs_jokers_match = sum(len(eq.get("Jokers", [])) for eq in equipes_selectionnees)
+    score_a = matchs["Score A"].to_numpy(dtype=int)
+    score_b = matchs["Score B"].to_numpy(dtype=int)
+    joues = (score_a != 0) | (score_b != 0)
+    
+    # Une ligne par (match joué, équipe), vue depuis l'équipe concernée
+    lignes = pd.DataFrame({
+        "ID": np.concatenate([matchs["Equipe A"].to_numpy()[joues], matchs["Equipe B"].to_numpy()[joues]]),
+        "PM": np.concatenate([score_a[joues], score_b[joues]]),
+        "PE": np.concatenate([score_b[joues], score_a[joues]]),
+    })
+    lignes["V"] = (lignes["PM"] > lignes["PE"]).astype(int)
+    lignes["N"] = (lignes["PM"] == lignes["PE"]).astype(int)
+    lignes["D"] = (lignes["PM"] < lignes["PE"]).astype(int)
+    
+    totaux = (
+        lignes.groupby("ID", sort=False)[["V", "N", "D", "PM", "PE"]].sum()
+        .reindex(equipes_fixes["ID"], fill_value=0)
+    )
     
-    st.info(f"""
-    **Résumé du round de rattrapage:**
-    - {len(equipes_selectionnees)} équipes formées
-    - {joueurs_retard_match} joueurs en retard programmés
-    - {joueurs_jokers_match} joker(s) utilisé(s)
-    - {len(matchs)} match(s) créé(s) sur {nb_terrains} terrain(s) disponible(s)
-    """)
+    surnoms = equipes_fixes["Surnom"]
+    surnom_valide = surnoms.notna() & surnoms.astype(str).str.strip().ne("")
+    
+    df_classement_eq = pd.DataFrame({
+        "Équipe": np.where(surnom_valide, surnoms, equipes_fixes["ID"]),
+        "Joueurs": (equipes_fixes["J1"] + " & " + equipes_fixes["J2"]).to_numpy(),
+        "V": totaux["V"].to_numpy(),
+        "N": totaux["N"].to_numpy(),
+        "D": totaux["D"].to_numpy(),
+        "PM": totaux["PM"].to_numpy(),
+        "PE": totaux["PE"].to_numpy(),
+    }, columns=COLONNES_CLASSEMENT_EQUIPES)
+    df_classement_eq["Diff"] = df_classement_eq["PM"] - df_classement_eq["PE"]
+    
+    if algo_classement == "Pondéré":
+        df_classement_eq["Points"] = [
+            round(((v * 3) + (n * 1)) * coeff, 2)
+            for v, n, coeff in zip(df_classement_eq["V"], df_classement_eq["N"], equipes_fixes["Coeff"])
+        ]
+    else:
+        df_classement_eq["Points"] = (df_classement_eq["V"] * 2) + (df_classement_eq["N"] * 1)
     
-    return matchs
-
-def generer_derniers_rounds():
-    """Génère tous les rounds nécessaires pour équilibrer les matchs joués"""
-    st.session_state.generating_final_rounds = True
+    df_classement_eq = df_classement_eq.sort_values(by=["Points", "Diff"], ascending=False, kind="stable")
+    df_classement_eq.index = range(1, len(df_classement_eq) + 1)
+    df_classement_eq.index.name = "Rang"
     
-    rounds_generes = []
-    
-    # Continuer tant qu'il y a des joueurs en retard
-    while True:
-        # Analyser la situation actuelle
-        joueurs_en_retard, max_matchs, retards = analyser_retards_joueurs()
-        
-        if not joueurs_en_retard:
-            break
-        
-        # Générer un round de rattrapage
-        matchs_rattrapage = generer_round_rattrapage()
-        
-        if not matchs_rattrapage:
-            break
-        
-        # Ajouter les matchs
-        df_matchs = pd.DataFrame(matchs_rattrapage)
-        st.session_state.matchs_detail = pd.concat([
-            st.session_state.matchs_detail,
-            df_matchs
-        ], ignore_index=True)
-        
-        # Synchroniser avec les matchs simplifiés
-        for match in matchs_rattrapage:
-            st.session_state.matchs = pd.concat([
-                st.session_state.matchs,
-                pd.DataFrame([{
-                    "Round": match["Round"],
-                    "Terrain": match["Terrain"],
-                    "Type": match["Type"],
-                    "Equipe A": match["Equipe_A_ID"],
-                    "Score A": match["Score_A"],
-                    "Equipe B": match["Equipe_B_ID"],
-                    "Score B": match["Score_B"]
-                }])
-            ], ignore_index=True)
-        
-        rounds_generes.append(matchs_rattrapage)
-        
-        # Mettre à jour l'historique des équipes pour ce round
-        round_num = matchs_rattrapage[0]["Round"]
-        
-        # Récupérer toutes les équipes uniques de ce round
-        equipes_round = []
-        for match in matchs_rattrapage:
-            # Équipe A
-            equipes_round.append({
-                "Round": round_num,
-                "ID": match["Equipe_A_ID"],
-                "Surnom": match["Equipe_A_ID"],
-                "J1": match["J1_A"],
-                "Cat1": get_categorie_joueur(match["J1_A"]),
-                "J2": match["J2_A"],
-                "Cat2": get_categorie_joueur(match["J2_A"]),
-                "Coeff": round((st.session_state.categories_dict.get(get_categorie_joueur(match["J1_A"]), 1.0) +  
-                               st.session_state.categories_dict.get(get_categorie_joueur(match["J2_A"]), 1.0)) / 2, 3)
-            })
-            
-            # Équipe B
-            equipes_round.append({
-                "Round": round_num,
-                "ID": match["Equipe_B_ID"],
-                "Surnom": match["Equipe_B_ID"],
-                "J1": match["J1_B"],
-                "Cat1": get_categorie_joueur(match["J1_B"]),
-                "J2": match["J2_B"],
-                "Cat2": get_categorie_joueur(match["J2_B"]),
-                "Coeff": round((st.session_state.categories_dict.get(get_categorie_joueur(match["J1_B"]), 1.0) +  
-                               st.session_state.categories_dict.get(get_categorie_joueur(match["J2_B"]), 1.0)) / 2, 3)
-            })
-        
-        # Ajouter à l'historique
-        df_equipes = pd.DataFrame(equipes_round)
-        st.session_state.historique_equipes = pd.concat([
-            st.session_state.historique_equipes,
-            df_equipes
-        ], ignore_index=True)
-        
-        # Limiter à 10 rounds maximum pour éviter les boucles infinies
-        if len(rounds_generes) >= 10:
-            st.warning("⚠️ Limite de 10 rounds de rattrapage atteinte")
-            break
-    
-    st.session_state.generating_final_rounds = False
-    
-    if rounds_generes:
-        total_matchs = sum(len(r) for r in rounds_generes)
-        st.success(f"✅ {len(rounds_generes)} round(s) de rattrapage généré(s) avec {total_matchs} matchs!")
-        
-        # Afficher un récapitulatif
-        with st.expander("📊 Récapitulatif des rounds de rattrapage"):
-            for i, round_matchs in enumerate(rounds_generes, 1):
-                st.write(f"**Round de rattrapage {i}:** {len(round_matchs)} match(s)")
-                for match in round_matchs:
-                    jokers = match['Jokers'].split(',') if match['Jokers'] else []
-                    jokers_text = f" (Jokers: {', '.join(jokers)})" if jokers else ""
-                    st.write(f"  - {match['Equipe_A_ID']} vs {match['Equipe_B_ID']}{jokers_text}")
-        
-        return True
-    else:
-        st.info("Aucun round de rattrapage nécessaire")
-        return False
+    return df_classement_eq
+
+@memoiser_par_version
+@chronometre
+def calculer_classement_equipes():
+    """Classement par équipes du mode classique, partagé par l'onglet et les exports"""
+    return classer_equipes(
+        get_matchs(),
+        etat.equipes_fixes,
+        etat.algo_classement
+    )
 
 # === CLASSEMENT INDIVIDUEL AVEC GESTION DES JOKERS ===
 
+@memoiser_par_version
+@chronometre
 def calculer_classement_individuel_avec_jokers():
     """Calcule le classement individuel en excluant les points des jokers dans les matchs de rattrapage"""
-    if st.session_state.matchs_detail.empty:
+    if get_matchs_detail().empty:
         return pd.DataFrame()
     
-    # Initialiser les stats pour tous les joueurs
-    stats_joueurs = {}
-    
-    # Initialiser avec les joueurs inscrits
-    for joueur in st.session_state.joueurs:
-        nom_complet = get_nom_complet(joueur)
-        if nom_complet not in stats_joueurs:
-            stats_joueurs[nom_complet] = {
-                "Joueur": nom_complet,
-                "Catégorie": joueur['Catégorie'],
-                "Matchs Joués": 0,
-                "Points Marqués": 0,
-                "Points Encaissés": 0,
-                "Différence": 0,
-                "Score Pondéré": 0.0
-            }
+    # Statistiques cumulées, mises à jour à chaque saisie de score
+    cumul = get_statistiques_cumulees()
+    pondere = etat.algo_classement_individuel == "Pondéré"
     
-    # Parcourir tous les matchs détaillés
-    for _, match in st.session_state.matchs_detail.iterrows():
-        # Ignorer les matchs non joués
-        if match["Score_A"] == 0 and match["Score_B"] == 0:
-            continue
-        
-        # Identifier les jokers pour ce match
-        jokers = match['Jokers'].split(',') if match['Jokers'] else []
-        
-        # Points pour les deux équipes
-        points_a = match["Score_A"]
-        points_b = match["Score_B"]
-        
-        # Équipe A
-        joueurs_a = [match['J1_A'], match['J2_A']]
-        for joueur_nom in joueurs_a:
-            if joueur_nom and joueur_nom in stats_joueurs:
-                stats = stats_joueurs[joueur_nom]
-                
-                # Vérifier si le joueur est un joker dans un match de rattrapage
-                if match["Type"] == "rattrapage" and joueur_nom in jokers:
-                    # Ne pas compter les stats pour les jokers dans les matchs de rattrapage
-                    continue
-                
-                stats["Matchs Joués"] += 1
-                stats["Points Marqués"] += points_a
-                stats["Points Encaissés"] += points_b
-                diff_match = points_a - points_b
-                stats["Différence"] += diff_match
-                
-                # Calcul pondéré
-                if st.session_state.algo_classement_individuel == "Pondéré":
-                    coeff = 1.0
-                    # Récupérer le coefficient du joueur
-                    for j in st.session_state.joueurs:
-                        if get_nom_complet(j) == joueur_nom:
-                            coeff = st.session_state.categories_dict.get(j['Catégorie'], 1.0)
-                            break
-                    stats["Score Pondéré"] += diff_match * coeff
-                else:
-                    stats["Score Pondéré"] += diff_match
-        
-        # Équipe B
-        joueurs_b = [match['J1_B'], match['J2_B']]
-        for joueur_nom in joueurs_b:
-            if joueur_nom and joueur_nom in stats_joueurs:
-                stats = stats_joueurs[joueur_nom]
-                
-                # Vérifier si le joueur est un joker dans un match de rattrapage
-                if match["Type"] == "rattrapage" and joueur_nom in jokers:
-                    # Ne pas compter les stats pour les jokers dans les matchs de rattrapage
-                    continue
-                
-                stats["Matchs Joués"] += 1
-                stats["Points Marqués"] += points_b
-                stats["Points Encaissés"] += points_a
-                diff_match = points_b - points_a
-                stats["Différence"] += diff_match
-                
-                # Calcul pondéré
-                if st.session_state.algo_classement_individuel == "Pondéré":
-                    coeff = 1.0
-                    # Récupérer le coefficient du joueur
-                    for j in st.session_state.joueurs:
-                        if get_nom_complet(j) == joueur_nom:
-                            coeff = st.session_state.categories_dict.get(j['Catégorie'], 1.0)
-                            break
-                    stats["Score Pondéré"] += diff_match * coeff
-                else:
-                    stats["Score Pondéré"] += diff_match
-    
-    # Convertir en DataFrame
-    classement_data = []
-    for joueur_nom, stats in stats_joueurs.items():
-        if stats["Matchs Joués"] > 0:
-            classement_data.append({
-                "Joueur": stats["Joueur"],
-                "Catégorie": stats["Catégorie"],
-                "MJ": stats["Matchs Joués"],
-                "PM": stats["Points Marqués"],
-                "PE": stats["Points Encaissés"],
-                "Diff": stats["Différence"],
-                "Score": round(stats["Score Pondéré"], 2)
-            })
+    # Joindre les joueurs inscrits (registre: nom complet -> catégorie) à leurs statistiques
+    categories = get_registre()["categories"]
+    df_classement = pd.DataFrame({"Joueur": list(categories), "Catégorie": list(categories.values())})
+    df_stats = pd.DataFrame.from_dict(cumul, orient="index", columns=["MJ", "PM", "PE", "Diff"])
+    df_classement = df_classement.join(df_stats, on="Joueur", how="inner")
+    df_classement = df_classement[df_classement["MJ"] > 0]
     
-    if not classement_data:
+    if df_classement.empty:
         return pd.DataFrame()
     
-    df_classement = pd.DataFrame(classement_data)
+    # Le score pondéré est la différence multipliée par le coefficient du joueur
+    if pondere:
+        coeffs = df_classement["Catégorie"].map(etat.categories_dict).fillna(1.0)
+    else:
+        coeffs = 1.0
+    df_classement["Score"] = (df_classement["Diff"].astype(float) * coeffs).round(2)
     
     # Trier par score (décroissant), puis par différence, puis par points marqués
     df_classement = df_classement.sort_values(
@@ -707,7 +1662,7 @@ def afficher_statistiques_equilibre():
     
     # Créer un DataFrame pour l'affichage
     stats_list = []
-    for joueur in st.session_state.joueurs:
+    for joueur in etat.joueurs:
         nom_complet = get_nom_complet(joueur)
         matchs_joues = stats.get(nom_complet, 0)
         stats_list.append({
@@ -732,25 +1687,538 @@ def afficher_statistiques_equilibre():
     
     return df_stats
 
+# === APPARIEMENT OPTIMAL DES ÉQUIPES (COUPLAGE DE POIDS MAXIMAL) ===
+
+MARGE_CANDIDATS_APPARIEMENT = 4  # Équipes candidates en plus des 2 × nb_terrains les moins actives
+
+def couplage_poids_maximal(edges, maxcardinality=False):
+    """Couplage de poids maximal d'un graphe quelconque (algorithme d'Edmonds par fleurs, O(n³))
+
+    edges: liste de (i, j, poids entier) sur des sommets numérotés 0..n-1.
+    maxcardinality: ne considérer que les couplages de cardinalité maximale.
+    Retourne mate, où mate[v] est le sommet apparié à v, ou -1.
+
+    Transcription de l'implémentation de référence de Joris van Rantwijk (domaine public),
+    dont les noms de variables sont conservés.
+    """
+    if not edges:
+        return []
+    nedge = len(edges)
+    nvertex = 0
+    for (i, j, w) in edges:
+        if i >= nvertex:
+            nvertex = i + 1
+        if j >= nvertex:
+            nvertex = j + 1
+    maxweight = max(0, max(w for (i, j, w) in edges))
+    endpoint = [edges[p // 2][p % 2] for p in range(2 * nedge)]
+    neighbend = [[] for i in range(nvertex)]
+    for k in range(len(edges)):
+        (i, j, w) = edges[k]
+        neighbend[i].append(2 * k + 1)
+        neighbend[j].append(2 * k)
+    mate = nvertex * [-1]
+    label = (2 * nvertex) * [0]
+    labelend = (2 * nvertex) * [-1]
+    inblossom = list(range(nvertex))
+    blossomparent = (2 * nvertex) * [-1]
+    blossomchilds = (2 * nvertex) * [None]
+    blossombase = list(range(nvertex)) + nvertex * [-1]
+    blossomendps = (2 * nvertex) * [None]
+    bestedge = (2 * nvertex) * [-1]
+    blossombestedges = (2 * nvertex) * [None]
+    unusedblossoms = list(range(nvertex, 2 * nvertex))
+    dualvar = nvertex * [maxweight] + nvertex * [0]
+    allowedge = nedge * [False]
+    queue = []
+
+    def slack(k):
+        (i, j, wt) = edges[k]
+        return dualvar[i] + dualvar[j] - 2 * wt
+
+    def blossomLeaves(b):
+        if b < nvertex:
+            yield b
+        else:
+            for t in blossomchilds[b]:
+                if t < nvertex:
+                    yield t
+                else:
+                    for v in blossomLeaves(t):
+                        yield v
+
+    def assignLabel(w, t, p):
+        b = inblossom[w]
+        label[w] = label[b] = t
+        labelend[w] = labelend[b] = p
+        bestedge[w] = bestedge[b] = -1
+        if t == 1:
+            queue.extend(blossomLeaves(b))
+        elif t == 2:
+            base = blossombase[b]
+            assignLabel(endpoint[mate[base]], 1, mate[base] ^ 1)
+
+    def scanBlossom(v, w):
+        path = []
+        base = -1
+        while v != -1 or w != -1:
+            b = inblossom[v]
+            if label[b] & 4:
+                base = blossombase[b]
+                break
+            path.append(b)
+            label[b] = 5
+            if labelend[b] == -1:
+                v = -1
+            else:
+                v = endpoint[labelend[b]]
+                b = inblossom[v]
+                v = endpoint[labelend[b]]
+            if w != -1:
+                v, w = w, v
+        for b in path:
+            label[b] = 1
+        return base
+
+    def addBlossom(base, k):
+        (v, w, wt) = edges[k]
+        bb = inblossom[base]
+        bv = inblossom[v]
+        bw = inblossom[w]
+        b = unusedblossoms.pop()
+        blossombase[b] = base
+        blossomparent[b] = -1
+        blossomparent[bb] = b
+        blossomchilds[b] = path = []
+        blossomendps[b] = endps = []
+        while bv != bb:
+            blossomparent[bv] = b
+            path.append(bv)
+            endps.append(labelend[bv])
+            v = endpoint[labelend[bv]]
+            bv = inblossom[v]
+        path.append(bb)
+        path.reverse()
+        endps.reverse()
+        endps.append(2 * k)
+        while bw != bb:
+            blossomparent[bw] = b
+            path.append(bw)
+            endps.append(labelend[bw] ^ 1)
+            w = endpoint[labelend[bw]]
+            bw = inblossom[w]
+        label[b] = 1
+        labelend[b] = labelend[bb]
+        dualvar[b] = 0
+        for v in blossomLeaves(b):
+            if label[inblossom[v]] == 2:
+                queue.append(v)
+            inblossom[v] = b
+        bestedgeto = (2 * nvertex) * [-1]
+        for bv in path:
+            if blossombestedges[bv] is None:
+                nblists = [[p // 2 for p in neighbend[v]] for v in blossomLeaves(bv)]
+            else:
+                nblists = [blossombestedges[bv]]
+            for nblist in nblists:
+                for k in nblist:
+                    (i, j, wt) = edges[k]
+                    if inblossom[j] == b:
+                        i, j = j, i
+                    bj = inblossom[j]
+                    if bj != b and label[bj] == 1 and (bestedgeto[bj] == -1 or slack(k) < slack(bestedgeto[bj])):
+                        bestedgeto[bj] = k
+            blossombestedges[bv] = None
+            bestedge[bv] = -1
+        blossombestedges[b] = [k for k in bestedgeto if k != -1]
+        bestedge[b] = -1
+        for k in blossombestedges[b]:
+            if bestedge[b] == -1 or slack(k) < slack(bestedge[b]):
+                bestedge[b] = k
+
+    def expandBlossom(b, endstage):
+        for s in blossomchilds[b]:
+            blossomparent[s] = -1
+            if s < nvertex:
+                inblossom[s] = s
+            elif endstage and dualvar[s] == 0:
+                expandBlossom(s, endstage)
+            else:
+                for v in blossomLeaves(s):
+                    inblossom[v] = s
+        if (not endstage) and label[b] == 2:
+            entrychild = inblossom[endpoint[labelend[b] ^ 1]]
+            j = blossomchilds[b].index(entrychild)
+            if j & 1:
+                j -= len(blossomchilds[b])
+                jstep = 1
+                endptrick = 0
+            else:
+                jstep = -1
+                endptrick = 1
+            p = labelend[b]
+            while j != 0:
+                label[endpoint[p ^ 1]] = 0
+                label[endpoint[blossomendps[b][j - endptrick] ^ endptrick ^ 1]] = 0
+                assignLabel(endpoint[p ^ 1], 2, p)
+                allowedge[blossomendps[b][j - endptrick] // 2] = True
+                j += jstep
+                p = blossomendps[b][j - endptrick] ^ endptrick
+                allowedge[p // 2] = True
+                j += jstep
+            bv = blossomchilds[b][j]
+            label[endpoint[p ^ 1]] = label[bv] = 2
+            labelend[endpoint[p ^ 1]] = labelend[bv] = p
+            bestedge[bv] = -1
+            j += jstep
+            while blossomchilds[b][j] != entrychild:
+                bv = blossomchilds[b][j]
+                if label[bv] == 1:
+                    j += jstep
+                    continue
+                for v in blossomLeaves(bv):
+                    if label[v] != 0:
+                        break
+                if label[v] != 0:
+                    label[v] = 0
+                    label[endpoint[mate[blossombase[bv]]]] = 0
+                    assignLabel(v, 2, labelend[v])
+                j += jstep
+        label[b] = labelend[b] = -1
+        blossomchilds[b] = blossomendps[b] = None
+        blossombase[b] = -1
+        blossombestedges[b] = None
+        bestedge[b] = -1
+        unusedblossoms.append(b)
+
+    def augmentBlossom(b, v):
+        t = v
+        while blossomparent[t] != b:
+            t = blossomparent[t]
+        if t >= nvertex:
+            augmentBlossom(t, v)
+        i = j = blossomchilds[b].index(t)
+        if i & 1:
+            j -= len(blossomchilds[b])
+            jstep = 1
+            endptrick = 0
+        else:
+            jstep = -1
+            endptrick = 1
+        while j != 0:
+            j += jstep
+            t = blossomchilds[b][j]
+            p = blossomendps[b][j - endptrick] ^ endptrick
+            if t >= nvertex:
+                augmentBlossom(t, endpoint[p])
+            j += jstep
+            t = blossomchilds[b][j]
+            if t >= nvertex:
+                augmentBlossom(t, endpoint[p ^ 1])
+            mate[endpoint[p]] = p ^ 1
+            mate[endpoint[p ^ 1]] = p
+        blossomchilds[b] = blossomchilds[b][i:] + blossomchilds[b][:i]
+        blossomendps[b] = blossomendps[b][i:] + blossomendps[b][:i]
+        blossombase[b] = blossombase[blossomchilds[b][0]]
+
+    def augmentMatching(k):
+        (v, w, wt) = edges[k]
+        for (s, p) in ((v, 2 * k + 1), (w, 2 * k)):
+            while 1:
+                bs = inblossom[s]
+                if bs >= nvertex:
+                    augmentBlossom(bs, s)
+                mate[s] = p
+                if labelend[bs] == -1:
+                    break
+                t = endpoint[labelend[bs]]
+                bt = inblossom[t]
+                s = endpoint[labelend[bt]]
+                j = endpoint[labelend[bt] ^ 1]
+                if bt >= nvertex:
+                    augmentBlossom(bt, j)
+                mate[j] = labelend[bt]
+                p = labelend[bt] ^ 1
+
+    for t in range(nvertex):
+        label[:] = (2 * nvertex) * [0]
+        bestedge[:] = (2 * nvertex) * [-1]
+        blossombestedges[nvertex:] = nvertex * [None]
+        allowedge[:] = nedge * [False]
+        queue[:] = []
+        for v in range(nvertex):
+            if mate[v] == -1 and label[inblossom[v]] == 0:
+                assignLabel(v, 1, -1)
+        augmented = 0
+        while 1:
+            while queue and not augmented:
+                v = queue.pop()
+                for p in neighbend[v]:
+                    k = p // 2
+                    w = endpoint[p]
+                    if inblossom[v] == inblossom[w]:
+                        continue
+                    if not allowedge[k]:
+                        kslack = slack(k)
+                        if kslack <= 0:
+                            allowedge[k] = True
+                    if allowedge[k]:
+                        if label[inblossom[w]] == 0:
+                            assignLabel(w, 2, p ^ 1)
+                        elif label[inblossom[w]] == 1:
+                            base = scanBlossom(v, w)
+                            if base >= 0:
+                                addBlossom(base, k)
+                            else:
+                                augmentMatching(k)
+                                augmented = 1
+                                break
+                        elif label[w] == 0:
+                            label[w] = 2
+                            labelend[w] = p ^ 1
+                    elif label[inblossom[w]] == 1:
+                        b = inblossom[v]
+                        if bestedge[b] == -1 or kslack < slack(bestedge[b]):
+                            bestedge[b] = k
+                    elif label[w] == 0:
+                        if bestedge[w] == -1 or kslack < slack(bestedge[w]):
+                            bestedge[w] = k
+            if augmented:
+                break
+            deltatype = -1
+            delta = deltaedge = deltablossom = None
+            if not maxcardinality:
+                deltatype = 1
+                delta = min(dualvar[:nvertex])
+            for v in range(nvertex):
+                if label[inblossom[v]] == 0 and bestedge[v] != -1:
+                    d = slack(bestedge[v])
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 2
+                        deltaedge = bestedge[v]
+            for b in range(2 * nvertex):
+                if blossomparent[b] == -1 and label[b] == 1 and bestedge[b] != -1:
+                    kslack = slack(bestedge[b])
+                    d = kslack // 2
+                    if deltatype == -1 or d < delta:
+                        delta = d
+                        deltatype = 3
+                        deltaedge = bestedge[b]
+            for b in range(nvertex, 2 * nvertex):
+                if blossombase[b] >= 0 and blossomparent[b] == -1 and label[b] == 2 and (deltatype == -1 or dualvar[b] < delta):
+                    delta = dualvar[b]
+                    deltatype = 4
+                    deltablossom = b
+            if deltatype == -1:
+                deltatype = 1
+                delta = max(0, min(dualvar[:nvertex]))
+            for v in range(nvertex):
+                if label[inblossom[v]] == 1:
+                    dualvar[v] -= delta
+                elif label[inblossom[v]] == 2:
+                    dualvar[v] += delta
+            for b in range(nvertex, 2 * nvertex):
+                if blossombase[b] >= 0 and blossomparent[b] == -1:
+                    if label[b] == 1:
+                        dualvar[b] += delta
+                    elif label[b] == 2:
+                        dualvar[b] -= delta
+            if deltatype == 1:
+                break
+            elif deltatype == 2:
+                allowedge[deltaedge] = True
+                (i, j, wt) = edges[deltaedge]
+                if label[inblossom[i]] == 0:
+                    i, j = j, i
+                queue.append(i)
+            elif deltatype == 3:
+                allowedge[deltaedge] = True
+                (i, j, wt) = edges[deltaedge]
+                queue.append(i)
+            elif deltatype == 4:
+                expandBlossom(deltablossom, False)
+        if not augmented:
+            break
+        for b in range(nvertex, 2 * nvertex):
+            if blossomparent[b] == -1 and blossombase[b] >= 0 and label[b] == 1 and dualvar[b] == 0:
+                expandBlossom(b, True)
+    for v in range(nvertex):
+        if mate[v] >= 0:
+            mate[v] = endpoint[mate[v]]
+    return mate
+
+def apparier_equipes(candidats, nb_matchs, matchs_par_equipe, adversaires_joues, rng):
+    """Apparie au plus nb_matchs paires de candidats qui ne se sont jamais rencontrés
+
+    Un sommet fictif par équipe devant rester au repos, relié à toutes les équipes avec un poids
+    croissant avec leur nombre de matchs joués: le couplage de cardinalité maximale remplit d'abord
+    les terrains, puis fait jouer les équipes qui ont le moins joué. Les poids ont une petite part
+    aléatoire (tirée de rng) pour varier les rencontres à égalité.
+    """
+    n = len(candidats)
+    poids_par_match_joue = 100 * (nb_matchs + 1)  # Domine la somme des parts aléatoires des rencontres
+    aretes = [
+        (a, b, rng.randrange(100))
+        for a in range(n) for b in range(a + 1, n)
+        if candidats[b] not in adversaires_joues[candidats[a]]
+    ]
+    aretes += [
+        (a, n + repos, matchs_par_equipe[candidats[a]] * poids_par_match_joue + rng.randrange(100))
+        for repos in range(n - 2 * nb_matchs) for a in range(n)
+    ]
+    
+    mate = couplage_poids_maximal(aretes, maxcardinality=True)
+    return [(candidats[a], candidats[b]) for a, b in enumerate(mate) if a < b < n][:nb_matchs]
+
+def choisir_matchs_classique(equipes_ids, matchs_par_equipe, adversaires_joues, nb_terrains, rng):
+    """Choisit les rencontres d'un round complet (une par terrain si possible), sans revanche
+
+    Seules les équipes les moins actives sont candidates; la liste s'élargit si elles ne suffisent
+    pas à remplir les terrains.
+    """
+    ordre = sorted(equipes_ids, key=lambda eid: (matchs_par_equipe[eid], rng.random()))
+    nb_matchs = min(nb_terrains, len(ordre) // 2)
+    taille = min(len(ordre), 2 * nb_matchs + MARGE_CANDIDATS_APPARIEMENT)
+    
+    while True:
+        paires = apparier_equipes(ordre[:taille], nb_matchs, matchs_par_equipe, adversaires_joues, rng)
+        if len(paires) == nb_matchs or taille == len(ordre):
+            return paires
+        taille = min(len(ordre), taille * 2)
+
+# === PLANNING DE LA JOURNÉE (MODE CLASSIQUE) ===
+
+def tables_de_berger(equipes_ids):
+    """Rounds d'un tournoi toutes rondes (méthode du cercle de Berger), une équipe exempte par round si nombre impair"""
+    equipes = list(equipes_ids)
+    if len(equipes) % 2:
+        equipes.append(None)
+    n = len(equipes)
+    rounds = []
+    
+    for r in range(n - 1):
+        paires = []
+        for i in range(n // 2):
+            a, b = equipes[i], equipes[n - 1 - i]
+            if a is not None and b is not None:
+                paires.append((a, b) if (r + i) % 2 == 0 else (b, a))
+        rounds.append(paires)
+        # La première équipe reste fixe, les autres tournent d'un cran
+        equipes = [equipes[0], equipes[-1]] + equipes[1:-1]
+    return rounds
+
+def planifier_rounds_classique(equipes_ids, nb_terrains, matchs_par_equipe, adversaires_joues, nb_rounds=0):
+    """Répartit les rencontres des tables de Berger pas encore jouées en rounds d'au plus nb_terrains matchs
+
+    Chaque round prend en priorité les rencontres des équipes qui ont le moins joué, ce qui fait
+    tourner les repos (à égalité, l'ordre de Berger est conservé). nb_rounds > 0 tronque le planning.
+    """
+    rencontres = [
+        (a, b) for paires in tables_de_berger(equipes_ids) for a, b in paires
+        if b not in adversaires_joues[a]
+    ]
+    matchs_par_equipe = dict(matchs_par_equipe)
+    rounds = []
+    
+    while rencontres and (nb_rounds <= 0 or len(rounds) < nb_rounds):
+        occupees = set()
+        paires = []
+        for a, b in sorted(rencontres, key=lambda p: matchs_par_equipe[p[0]] + matchs_par_equipe[p[1]]):
+            if len(paires) == nb_terrains:
+                break
+            if a not in occupees and b not in occupees:
+                paires.append((a, b))
+                occupees.update((a, b))
+        
+        retenues = set(paires)
+        rencontres = [paire for paire in rencontres if paire not in retenues]
+        for a, b in paires:
+            matchs_par_equipe[a] += 1
+            matchs_par_equipe[b] += 1
+        rounds.append(paires)
+    
+    return rounds
+
+def compter_rencontres_classique(equipes_ids):
+    """Nombre de matchs joués et adversaires déjà rencontrés par chaque équipe (équipes supprimées ignorées)"""
+    matchs_par_equipe = {eid: 0 for eid in equipes_ids}
+    adversaires_joues = {eid: set() for eid in equipes_ids}
+    
+    matchs_existants = get_matchs()
+    for equipe_a, equipe_b in zip(matchs_existants["Equipe A"], matchs_existants["Equipe B"]):
+        if equipe_a in matchs_par_equipe and equipe_b in matchs_par_equipe:
+            matchs_par_equipe[equipe_a] += 1
+            matchs_par_equipe[equipe_b] += 1
+            adversaires_joues[equipe_a].add(equipe_b)
+            adversaires_joues[equipe_b].add(equipe_a)
+    
+    return matchs_par_equipe, adversaires_joues
+
+@chronometre
+def planifier_journee(nb_rounds=0):
+    """Précalcule les prochains rounds du mode classique (tous les rounds restants si nb_rounds vaut 0)"""
+    equipes_ids = etat.equipes_fixes["ID"].tolist()
+    matchs_par_equipe, adversaires_joues = compter_rencontres_classique(equipes_ids)
+    rounds = planifier_rounds_classique(
+        equipes_ids, etat.nb_terrains, matchs_par_equipe, adversaires_joues, nb_rounds
+    )
+    etat.planning_classique = {
+        "equipes": equipes_ids,
+        "nb_terrains": etat.nb_terrains,
+        "premier_round": get_current_round() + 1,
+        "rounds": [[list(paire) for paire in paires] for paires in rounds]
+    }
+    return len(rounds)
+
+@memoiser_par_version
+def planning_a_jour():
+    """Le planning correspond-il encore aux équipes, au nombre de terrains et aux rencontres déjà jouées ?"""
+    planning = etat.planning_classique
+    if not (
+        planning
+        and planning["equipes"] == etat.equipes_fixes["ID"].tolist()
+        and planning["nb_terrains"] == etat.nb_terrains
+        # Calculé pour partir du round premier_round: caduc si la table des matchs est revenue en arrière
+        and planning["premier_round"] <= get_current_round() + 1
+    ):
+        return False
+    
+    # Caduc aussi si une rencontre encore à venir a été jouée hors planning (enchaînement continu...)
+    _, adversaires_joues = compter_rencontres_classique(planning["equipes"])
+    restants = planning["rounds"][get_current_round() + 1 - planning["premier_round"]:]
+    return not any(b in adversaires_joues[a] for paires in restants for a, b in paires)
+
+def get_round_planifie(round_num):
+    """Rencontres prévues par le planning pour ce round, ou None si le planning ne s'applique pas"""
+    if not planning_a_jour():
+        return None
+    planning = etat.planning_classique
+    position = round_num - planning["premier_round"]
+    if 0 <= position < len(planning["rounds"]):
+        return [tuple(paire) for paire in planning["rounds"][position]]
+    return None
+
 # === FONCTIONS DE GÉNÉRATION POUR LE MODE CLASSIQUE ===
 
+@chronometre
 def generer_paires_equilibrees(mode="nouveau"):
-    """Génère des paires équilibrées pour le mode classique"""
+    """Génère des paires équilibrées pour le mode classique (False si rien n'a été enregistré)"""
     # Fonction existante adaptée
-    ja = [j for j in st.session_state.joueurs if j['Prénom'].strip() and j['Nom'].strip() and j['Catégorie']!="Joker"]
+    ja = [j for j in etat.joueurs if j['Prénom'].strip() and j['Nom'].strip() and j['Catégorie']!="Joker"]
     
     if mode=="nouveau":
         if len(ja)<2:
-            st.error("Il faut au moins 2 joueurs")
-            return
-        st.session_state.equipes_fixes = pd.DataFrame(columns=["ID", "Surnom", "J1", "Cat1", "J2", "Cat2", "Coeff"])
+            notifier("erreur", "Il faut au moins 2 joueurs")
+            return False
+        etat.equipes_fixes = pd.DataFrame(columns=["ID", "Surnom", "J1", "Cat1", "J2", "Cat2", "Coeff"])
     else:
         if len(ja)<1:
-            st.error("Aucun joueur non affecté")
-            return
+            notifier("erreur", "Aucun joueur non affecté")
+            return False
     
     # Trier par catégorie
-    jt = sorted(ja, key=lambda x: st.session_state.categories_dict[x['Catégorie']], reverse=True)
+    jt = sorted(ja, key=lambda x: etat.categories_dict[x['Catégorie']], reverse=True)
     jaj = jt.pop() if len(jt)%2 else None
     
     # Créer les paires
@@ -759,10 +2227,10 @@ def generer_paires_equilibrees(mode="nouveau"):
         pairs.append((jt.pop(0), jt.pop(-1)))
     
     # Déterminer le prochain ID
-    if mode=="nouveau" or st.session_state.equipes_fixes.empty:
+    if mode=="nouveau" or etat.equipes_fixes.empty:
         sid = 1
     else:
-        ids_existants = [int(e.replace("Équipe ", "")) for e in st.session_state.equipes_fixes["ID"] 
+        ids_existants = [int(e.replace("Équipe ", "")) for e in etat.equipes_fixes["ID"] 
                         if isinstance(e, str) and e.startswith("Équipe ")]
         sid = max(ids_existants) + 1 if ids_existants else 1
     
@@ -778,7 +2246,7 @@ def generer_paires_equilibrees(mode="nouveau"):
             "Cat1": c1,
             "J2": get_nom_complet(p2),
             "Cat2": c2,
-            "Coeff": round((st.session_state.categories_dict[c1] + st.session_state.categories_dict[c2]) / 2, 3)
+            "Coeff": round((etat.categories_dict[c1] + etat.categories_dict[c2]) / 2, 3)
         })
     
     # Gérer le joueur impair
@@ -793,183 +2261,258 @@ def generer_paires_equilibrees(mode="nouveau"):
             "Cat1": c1,
             "J2": f"Joker {i}",
             "Cat2": "Joker",
-            "Coeff": round((st.session_state.categories_dict[c1] + 1.0) / 2, 3)
+            "Coeff": round((etat.categories_dict[c1] + 1.0) / 2, 3)
         })
-        st.warning(f"⚠️ Joueur impair: {get_nom_complet(jaj)} avec Joker")
     
     # Ajouter les équipes
     if nouvelles_equipes:
         df_nouvelles = pd.DataFrame(nouvelles_equipes)
         if mode == "ajouter":
-            st.session_state.equipes_fixes = pd.concat([st.session_state.equipes_fixes, df_nouvelles], ignore_index=True)
+            etat.equipes_fixes = pd.concat([etat.equipes_fixes, df_nouvelles], ignore_index=True)
         else:
-            st.session_state.equipes_fixes = df_nouvelles
-        st.success(f"✅ {len(nouvelles_equipes)} équipes {'ajoutées' if mode=='ajouter' else 'créées'}!")
+            etat.equipes_fixes = df_nouvelles
+        
+        # Planning de la journée précalculé dès que les équipes sont connues
+        planifier_journee()
+    
+    # Messages affichés seulement si les équipes ont été journalisées
+    if not incrementer_version_etat("equipes_fixes", "planning_classique"):
+        return False
+    if jaj:
+        notifier("avertissement", f"⚠️ Joueur impair: {get_nom_complet(jaj)} avec Joker")
+    if nouvelles_equipes:
+        notifier("succes", f"✅ {len(nouvelles_equipes)} équipes {'ajoutées' if mode=='ajouter' else 'créées'}!")
+    return True
 
 def generer_round_classique():
     """Génère un round pour le mode classique"""
-    if st.session_state.equipes_fixes.empty:
-        st.error("Générez d'abord les équipes")
+    if etat.equipes_fixes.empty:
+        notifier("erreur", "Générez d'abord les équipes")
         return
     
-    equipes_ids = st.session_state.equipes_fixes["ID"].tolist()
-    
-    # Compter les matchs déjà joués par chaque équipe
-    matchs_par_equipe = {eid: 0 for eid in equipes_ids}
-    adversaires_joues = {eid: set() for eid in equipes_ids}
-    
-    if not st.session_state.matchs.empty:
-        for _, match in st.session_state.matchs.iterrows():
-            matchs_par_equipe[match["Equipe A"]] += 1
-            matchs_par_equipe[match["Equipe B"]] += 1
-            adversaires_joues[match["Equipe A"]].add(match["Equipe B"])
-            adversaires_joues[match["Equipe B"]].add(match["Equipe A"])
-    
-    # Trier les équipes par nombre de matchs joués (du moins au plus)
-    equipes_triees = sorted(equipes_ids, key=lambda x: (matchs_par_equipe[x], random.random()))
-    
-    # Créer les matchs
-    matchs = []
-    equipes_utilisees = set()
     round_num = get_current_round() + 1
+    rng = get_rng_round(round_num)
+    
+    # Round précalculé par le planning de la journée, sinon rencontres choisies par couplage de poids maximal
+    paires = get_round_planifie(round_num)
+    if paires is None:
+        equipes_ids = etat.equipes_fixes["ID"].tolist()
+        matchs_par_equipe, adversaires_joues = compter_rencontres_classique(equipes_ids)
+        paires = choisir_matchs_classique(
+            equipes_ids, matchs_par_equipe, adversaires_joues, etat.nb_terrains, rng
+        )
     
-    for i, equipe_a in enumerate(equipes_triees):
-        if equipe_a in equipes_utilisees:
-            continue
-        
-        # Chercher un adversaire qui n'a pas encore joué contre cette équipe
-        for equipe_b in equipes_triees[i+1:]:
-            if equipe_b in equipes_utilisees:
-                continue
-            
-            if equipe_b not in adversaires_joues[equipe_a]:
-                # Créer le match
-                matchs.append({
-                    "Round": round_num,
-                    "Terrain": f"T{len(matchs) + 1}",
-                    "Type": "normal",
-                    "Equipe_A_ID": equipe_a,
-                    "J1_A": "",
-                    "J2_A": "",
-                    "Score_A": 0,
-                    "Equipe_B_ID": equipe_b,
-                    "J1_B": "",
-                    "J2_B": "",
-                    "Score_B": 0,
-                    "Jokers": ""
-                })
-                
-                equipes_utilisees.update([equipe_a, equipe_b])
-                break
-        
-        # Limiter au nombre de terrains disponibles
-        if len(matchs) >= st.session_state.nb_terrains:
-            break
+    # Créer les matchs avec les informations des joueurs
+    equipes = etat.equipes_fixes.set_index("ID")
+    matchs = []
     
-    # Remplir les informations des joueurs pour chaque match
-    for match in matchs:
-        # Équipe A
-        equipe_a_info = st.session_state.equipes_fixes[st.session_state.equipes_fixes["ID"] == match["Equipe_A_ID"]]
-        if not equipe_a_info.empty:
-            equipe_a_info = equipe_a_info.iloc[0]
-            match["J1_A"] = equipe_a_info["J1"]
-            match["J2_A"] = equipe_a_info["J2"]
-        
-        # Équipe B
-        equipe_b_info = st.session_state.equipes_fixes[st.session_state.equipes_fixes["ID"] == match["Equipe_B_ID"]]
-        if not equipe_b_info.empty:
-            equipe_b_info = equipe_b_info.iloc[0]
-            match["J1_B"] = equipe_b_info["J1"]
-            match["J2_B"] = equipe_b_info["J2"]
+    for terrain, (equipe_a, equipe_b) in enumerate(paires, 1):
+        matchs.append({
+            "Round": round_num,
+            "Terrain": f"T{terrain}",
+            "Type": "normal",
+            "Equipe_A_ID": equipe_a,
+            "J1_A": equipes.at[equipe_a, "J1"],
+            "J2_A": equipes.at[equipe_a, "J2"],
+            "Score_A": 0,
+            "Equipe_B_ID": equipe_b,
+            "J1_B": equipes.at[equipe_b, "J1"],
+            "J2_B": equipes.at[equipe_b, "J2"],
+            "Score_B": 0,
+            "Jokers": ""
+        })
     
     # Ajouter les matchs
     if matchs:
-        df_matchs = pd.DataFrame(matchs)
-        st.session_state.matchs_detail = pd.concat([
-            st.session_state.matchs_detail,
-            df_matchs
-        ], ignore_index=True)
-        
-        # Synchroniser avec les matchs simplifiés
-        for match in matchs:
-            st.session_state.matchs = pd.concat([
-                st.session_state.matchs,
-                pd.DataFrame([{
-                    "Round": match["Round"],
-                    "Terrain": match["Terrain"],
-                    "Type": match["Type"],
-                    "Equipe A": match["Equipe_A_ID"],
-                    "Score A": match["Score_A"],
-                    "Equipe B": match["Equipe_B_ID"],
-                    "Score B": match["Score_B"]
-                }])
-            ], ignore_index=True)
-        
-        st.success(f"✅ Round {round_num} généré avec {len(matchs)} matchs!")
-    else:
-        st.warning("Impossible de créer de nouveaux matchs (toutes les combinaisons ont été jouées)")
-
-# === FONCTION PRINCIPALE DE GÉNÉRATION DE ROUND ===
-
-def generer_round():
-    """Fonction principale pour générer un round selon le mode"""
-    if st.session_state.mode_tournoi == "Classique":
-        generer_round_classique()
+        if not enregistrer_matchs(matchs, "generer_round"):
+            return
+        incrementer_version_etat()
+        
+        notifier("succes", f"✅ Round {round_num} généré avec {len(matchs)} matchs!")
     else:
-        generer_round_individuel_equilibre()
+        notifier("avertissement", "Impossible de créer de nouveaux matchs (toutes les combinaisons ont été jouées)")
 
-# === INITIALISATION ===
+# === ENCHAÎNEMENT CONTINU DES MATCHS ===
 
-# Initialiser les variables de session
-for key, val in defaults.items():
-    if key not in st.session_state:
-        st.session_state[key] = val
+ECART_MAX_ENCHAINEMENT = 1  # Un terrain attend plutôt que de lancer des joueurs (équipes en mode classique) ayant N matchs de plus que le moins actif
 
-# === INTERFACE UTILISATEUR ===
+def get_etat_terrains():
+    """Dernier round joué sur chaque terrain et matchs en cours (dernier match du terrain, score non saisi)"""
+    derniers = {}
+    for match in etat.magasin_matchs["lignes"]:
+        if match["Round"] >= derniers.get(match["Terrain"], {"Round": 0})["Round"]:
+            derniers[match["Terrain"]] = match
+    
+    dernier_round = {terrain: match["Round"] for terrain, match in derniers.items()}
+    en_cours = {
+        terrain: match for terrain, match in derniers.items()
+        if match["Score_A"] == 0 and match["Score_B"] == 0
+    }
+    return dernier_round, en_cours
 
-st.set_page_config(layout="wide", page_title="Duck Manager Pro")
-set_background(st.session_state.bg_image_data)
+def choisir_joueurs_libres(joueurs_libres, matchs_joues, dernier_passage, rng, minimum=0):
+    """Les 4 joueurs libres qui ont le moins joué, puis qui attendent depuis le plus longtemps
 
-st.title(f"🏸 {st.session_state.nom_tournoi}")
+    Retourne None s'il en manque, ou si l'un d'eux a plus de ECART_MAX_ENCHAINEMENT matchs d'avance sur
+    le moins actif de tous les joueurs (minimum): le terrain attend alors que d'autres joueurs se libèrent.
+    """
+    if len(joueurs_libres) < 4:
+        return None
+    joueurs = sorted(
+        joueurs_libres,
+        key=lambda joueur: (matchs_joues.get(joueur, 0), dernier_passage.get(joueur, -1), rng.random())
+    )[:4]
+    if matchs_joues.get(joueurs[-1], 0) > minimum + ECART_MAX_ENCHAINEMENT:
+        return None
+    return joueurs
 
-# Barre latérale
-with st.sidebar:
-    st.header("👤 Profil")
-    profil = st.radio("Profil:", ["Joueur", "Organisateur"], 
-                     index=0 if st.session_state.profil == "Joueur" else 1)
+def prochain_match_individuel(terrain, round_num, joueurs_libres, matchs_joues, dernier_passage, rng, minimum):
+    """Match (et ses deux équipes) à lancer sur un terrain libre en mode individuel, ou None"""
+    joueurs = choisir_joueurs_libres(joueurs_libres, matchs_joues, dernier_passage, rng, minimum)
+    if joueurs is None:
+        return None
     
-    if profil == "Organisateur" and st.session_state.profil == "Joueur":
-        mdp = st.text_input("Mot de passe:", type="password")
-        if st.button("🔓 Valider"):
-            if mdp.upper() == MOT_DE_PASSE_ORGANISATEUR:
-                st.session_state.profil = "Organisateur"
-                st.success("✅ Mode Organisateur activé!")
-                st.rerun()
-            else:
-                st.error("❌ Mot de passe incorrect!")
-    elif profil == "Joueur" and st.session_state.profil == "Organisateur":
-        st.session_state.profil = "Joueur"
-        st.rerun()
+    coefficients = {nom: get_coefficient_joueur(nom) for nom in joueurs}
+    partenaires, adversaires = sous_matrices_rencontres(get_rencontres(), joueurs)
+    (j1_a, j2_a), (j1_b, j2_b) = optimiser_round_individuel(
+        joueurs, coefficients, partenaires, adversaires, graine=rng.getrandbits(32)
+    )[0]
     
-    st.divider()
+    equipes = []
+    for cote, (j1, j2) in (("A", (j1_a, j2_a)), ("B", (j1_b, j2_b))):
+        equipe_id = f"R{round_num}_{terrain}{cote}"
+        equipes.append({
+            "Round": round_num,
+            "ID": equipe_id,
+            "Surnom": equipe_id,
+            "J1": j1,
+            "Cat1": get_categorie_joueur(j1),
+            "J2": j2,
+            "Cat2": get_categorie_joueur(j2),
+            "Coeff": round((get_coefficient_joueur(j1) + get_coefficient_joueur(j2)) / 2, 3)
+        })
     
-    # Indicateur du mode
-    if st.session_state.mode_tournoi == "Classique":
-        st.success("🏆 **Mode Classique**")
-        st.caption("Équipes fixes, classement par équipe")
+    match = {
+        "Round": round_num,
+        "Terrain": terrain,
+        "Type": "normal",
+        "Equipe_A_ID": equipes[0]["ID"],
+        "J1_A": j1_a,
+        "J2_A": j2_a,
+        "Score_A": 0,
+        "Equipe_B_ID": equipes[1]["ID"],
+        "J1_B": j1_b,
+        "J2_B": j2_b,
+        "Score_B": 0,
+        "Jokers": ""
+    }
+    return match, equipes
+
+@chronometre
+def remplir_terrains_libres():
+    """Lance un match sur chaque terrain libre, avec les joueurs (ou équipes) libres qui ont le moins joué
+
+    Le n-ième match d'un terrain appartient au round n: les terrains avancent chacun à leur rythme.
+    Chaque match est tiré avec la graine de son round et de son terrain. Dans les deux modes, un terrain
+    attend plutôt que de lancer des joueurs (ou équipes) ayant plus de ECART_MAX_ENCHAINEMENT matchs
+    d'avance sur le moins actif. En mode classique, le planning de la journée est abandonné: ses rounds
+    ne tiennent pas compte des matchs lancés ici. Retourne le nombre de matchs lancés.
+    """
+    dernier_round, en_cours = get_etat_terrains()
+    terrains_libres = [
+        f"T{numero}" for numero in range(1, etat.nb_terrains + 1)
+        if f"T{numero}" not in en_cours
+    ]
+    occupes = {
+        participant for match in en_cours.values()
+        for participant in (match["J1_A"], match["J2_A"], match["J1_B"], match["J2_B"],
+                            match["Equipe_A_ID"], match["Equipe_B_ID"])
+    }
+    matchs = []
+    equipes_round = []
+    cles_modifiees = []
+    
+    if etat.mode_tournoi == "Classique":
+        equipes_ids = etat.equipes_fixes["ID"].tolist()
+        matchs_par_equipe, adversaires_joues = compter_rencontres_classique(equipes_ids)
+        equipes = etat.equipes_fixes.set_index("ID")
+        minimum = min(matchs_par_equipe.values(), default=0)
+        libres = [eid for eid in equipes_ids if eid not in occupes]
+        
+        for terrain in terrains_libres:
+            round_num = dernier_round.get(terrain, 0) + 1
+            candidates = [eid for eid in libres if matchs_par_equipe[eid] <= minimum + ECART_MAX_ENCHAINEMENT]
+            paires = choisir_matchs_classique(
+                candidates, matchs_par_equipe, adversaires_joues, 1, get_rng_round(round_num, terrain)
+            )
+            if not paires:
+                break
+            equipe_a, equipe_b = paires[0]
+            libres = [eid for eid in libres if eid not in (equipe_a, equipe_b)]
+            matchs_par_equipe[equipe_a] += 1
+            matchs_par_equipe[equipe_b] += 1
+            adversaires_joues[equipe_a].add(equipe_b)
+            adversaires_joues[equipe_b].add(equipe_a)
+            matchs.append({
+                "Round": round_num,
+                "Terrain": terrain,
+                "Type": "normal",
+                "Equipe_A_ID": equipe_a,
+                "J1_A": equipes.at[equipe_a, "J1"],
+                "J2_A": equipes.at[equipe_a, "J2"],
+                "Score_A": 0,
+                "Equipe_B_ID": equipe_b,
+                "J1_B": equipes.at[equipe_b, "J1"],
+                "J2_B": equipes.at[equipe_b, "J2"],
+                "Score_B": 0,
+                "Jokers": ""
+            })
+        if matchs and etat.planning_classique:
+            etat.planning_classique = {}
+            cles_modifiees.append("planning_classique")
     else:
-        st.warning("🎯 **Mode Individuel**")
-        st.caption("Équipes variables, priorité aux moins actifs")
-    
-    st.divider()
-    
-    # Statistiques rapides
-    if st.session_state.joueurs:
-        st.metric("Joueurs inscrits", len(st.session_state.joueurs))
+        # Matchs joués ou en cours: l'équilibre tient compte des matchs déjà lancés
+        matchs_joues = compter_matchs_programmes()
+        dernier_passage = {}
+        for match in etat.magasin_matchs["lignes"]:
+            for joueur in (match["J1_A"], match["J2_A"], match["J1_B"], match["J2_B"]):
+                dernier_passage[joueur] = match["ID_Match"]
+        noms = list(dict.fromkeys(get_nom_complet(joueur) for joueur in etat.joueurs))
+        minimum = min((matchs_joues[nom] for nom in noms), default=0)
+        libres = [nom for nom in noms if nom not in occupes]
+        
+        for terrain in terrains_libres:
+            round_num = dernier_round.get(terrain, 0) + 1
+            resultat = prochain_match_individuel(
+                terrain, round_num, libres, matchs_joues, dernier_passage, get_rng_round(round_num, terrain), minimum
+            )
+            if resultat is None:
+                break
+            match, equipes = resultat
+            joueurs_match = {match["J1_A"], match["J2_A"], match["J1_B"], match["J2_B"]}
+            libres = [nom for nom in libres if nom not in joueurs_match]
+            matchs_joues.update(joueurs_match)
+            matchs.append(match)
+            equipes_round.extend(equipes)
     
-    if not st.session_state.matchs.empty:
-        st.metric("Rounds joués", get_current_round())
-        st.metric("Matchs joués", len(st.session_state.matchs))
+    if matchs:
+        if not enregistrer_matchs(matchs, "remplir_terrains_libres", equipes_round, cles_modifiees):
+            return 0
+        incrementer_version_etat()
+    return len(matchs)
+
+# === FONCTION PRINCIPALE DE GÉNÉRATION DE ROUND ===
+
+@chronometre
+def generer_round():
+    """Fonction principale pour générer un round selon le mode"""
+    if etat.mode_tournoi == "Classique":
+        generer_round_classique()
+    else:
+        generer_round_individuel_equilibre()
+
+# === EXPORTS ===
+
 def exporter_joueurs_en_attente_pdf():
     """Génère un PDF avec la liste des joueurs en attente de validation"""
     buf = io.BytesIO()
@@ -978,14 +2521,14 @@ def exporter_joueurs_en_attente_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Joueurs en attente - {st.session_state.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Joueurs en attente - {etat.nom_tournoi}", styles['Title']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
     # Table des joueurs
-    if st.session_state.temp_joueurs:
+    if etat.temp_joueurs:
         data = [["#", "Prénom", "Nom", "Catégorie"]]
-        for idx, joueur in enumerate(st.session_state.temp_joueurs, 1):
+        for idx, joueur in enumerate(etat.temp_joueurs, 1):
             data.append([str(idx), joueur["Prénom"], joueur["Nom"], joueur["Catégorie"]])
         
         table = Table(data)
@@ -1013,19 +2556,19 @@ def exporter_joueurs_valides_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Joueurs validés - {st.session_state.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Joueurs validés - {etat.nom_tournoi}", styles['Title']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-    elements.append(Paragraph(f"Total: {len(st.session_state.joueurs)} joueurs", styles['Normal']))
+    elements.append(Paragraph(f"Total: {len(etat.joueurs)} joueurs", styles['Normal']))
     elements.append(Spacer(1, 20))
     
     # Table des joueurs
-    if st.session_state.joueurs:
+    if etat.joueurs:
         data = [["#", "Prénom", "Nom", "Catégorie", "Matchs joués"]]
         
         # Calculer les matchs joués pour chaque joueur
         stats = calculer_statistiques_joueurs()
         
-        for idx, joueur in enumerate(st.session_state.joueurs, 1):
+        for idx, joueur in enumerate(etat.joueurs, 1):
             nom_complet = f"{joueur['Prénom']} {joueur['Nom']}"
             matchs_joues = stats.get(nom_complet, 0)
             data.append([str(idx), joueur["Prénom"], joueur["Nom"], joueur["Catégorie"], str(matchs_joues)])
@@ -1053,8 +2596,8 @@ def exporter_joueurs_complet_xlsx():
     
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         # Feuille 1: Joueurs validés
-        if st.session_state.joueurs:
-            df_valides = pd.DataFrame(st.session_state.joueurs)
+        if etat.joueurs:
+            df_valides = pd.DataFrame(etat.joueurs)
             # Ajouter les statistiques
             stats = calculer_statistiques_joueurs()
             df_valides['Matchs joués'] = df_valides.apply(
@@ -1065,8 +2608,8 @@ def exporter_joueurs_complet_xlsx():
             df_valides.to_excel(writer, sheet_name='Joueurs validés', index=False)
         
         # Feuille 2: Joueurs en attente
-        if st.session_state.temp_joueurs:
-            df_attente = pd.DataFrame(st.session_state.temp_joueurs)
+        if etat.temp_joueurs:
+            df_attente = pd.DataFrame(etat.temp_joueurs)
             # Ajouter la colonne Statut en fin de tableau
             df_attente['Statut'] = 'En attente de validation'
             df_attente.to_excel(writer, sheet_name='Joueurs en attente', index=False)
@@ -1075,9 +2618,9 @@ def exporter_joueurs_complet_xlsx():
         liste_complete = []
         
         # Ajouter les joueurs validés
-        for joueur in st.session_state.joueurs:
+        stats = calculer_statistiques_joueurs()
+        for joueur in etat.joueurs:
             nom_complet = f"{joueur['Prénom']} {joueur['Nom']}"
-            stats = calculer_statistiques_joueurs()
             matchs_joues = stats.get(nom_complet, 0)
             
             liste_complete.append({
@@ -1089,7 +2632,7 @@ def exporter_joueurs_complet_xlsx():
             })
         
         # Ajouter les joueurs en attente
-        for joueur in st.session_state.temp_joueurs:
+        for joueur in etat.temp_joueurs:
             liste_complete.append({
                 'Prénom': joueur['Prénom'],
                 'Nom': joueur['Nom'],
@@ -1108,9 +2651,9 @@ def exporter_joueurs_complet_xlsx():
         summary_data = {
             'Statistique': ['Joueurs validés', 'Joueurs en attente', 'Total joueurs'],
             'Valeur': [
-                len(st.session_state.joueurs),
-                len(st.session_state.temp_joueurs),
-                len(st.session_state.joueurs) + len(st.session_state.temp_joueurs)
+                len(etat.joueurs),
+                len(etat.temp_joueurs),
+                len(etat.joueurs) + len(etat.temp_joueurs)
             ]
         }
         df_summary = pd.DataFrame(summary_data)
@@ -1120,12 +2663,12 @@ def exporter_joueurs_complet_xlsx():
         categories_data = {}
         
         # Compter par catégorie pour les joueurs validés
-        for joueur in st.session_state.joueurs:
+        for joueur in etat.joueurs:
             cat = joueur['Catégorie']
             categories_data[cat] = categories_data.get(cat, 0) + 1
         
         # Compter par catégorie pour les joueurs en attente
-        for joueur in st.session_state.temp_joueurs:
+        for joueur in etat.temp_joueurs:
             cat = joueur['Catégorie']
             categories_data[cat] = categories_data.get(cat, 0) + 1
         
@@ -1148,8 +2691,8 @@ def exporter_equipes_actuelles_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Équipes actuelles - {st.session_state.nom_tournoi}", styles['Title']))
-    elements.append(Paragraph(f"Mode: {st.session_state.mode_tournoi}", styles['Normal']))
+    elements.append(Paragraph(f"Équipes actuelles - {etat.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Mode: {etat.mode_tournoi}", styles['Normal']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
@@ -1195,19 +2738,19 @@ def exporter_historique_equipes_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Historique des équipes - {st.session_state.nom_tournoi}", styles['Title']))
-    elements.append(Paragraph(f"Mode: {st.session_state.mode_tournoi}", styles['Normal']))
+    elements.append(Paragraph(f"Historique des équipes - {etat.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Mode: {etat.mode_tournoi}", styles['Normal']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
-    if not st.session_state.historique_equipes.empty:
+    if not etat.historique_equipes.empty:
         # Grouper par round
-        for round_num in sorted(st.session_state.historique_equipes["Round"].unique()):
+        for round_num in sorted(etat.historique_equipes["Round"].unique()):
             elements.append(Paragraph(f"Round {round_num}", styles['Heading2']))
             elements.append(Spacer(1, 10))
             
-            equipes_round = st.session_state.historique_equipes[
-                st.session_state.historique_equipes["Round"] == round_num
+            equipes_round = etat.historique_equipes[
+                etat.historique_equipes["Round"] == round_num
             ]
             
             data = [["ID", "Surnom", "Joueur 1", "Cat1", "Joueur 2", "Cat2", "Coeff"]]
@@ -1252,21 +2795,21 @@ def exporter_equipes_complet_xlsx():
             equipes_actuelles.to_excel(writer, sheet_name='Équipes actuelles', index=False)
         
         # Feuille 2: Historique des équipes (mode individuel)
-        if not st.session_state.historique_equipes.empty:
-            st.session_state.historique_equipes.to_excel(writer, sheet_name='Historique équipes', index=False)
+        if not etat.historique_equipes.empty:
+            etat.historique_equipes.to_excel(writer, sheet_name='Historique équipes', index=False)
         
         # Feuille 3: Équipes fixes (mode classique)
-        if not st.session_state.equipes_fixes.empty:
-            st.session_state.equipes_fixes.to_excel(writer, sheet_name='Équipes fixes', index=False)
+        if not etat.equipes_fixes.empty:
+            etat.equipes_fixes.to_excel(writer, sheet_name='Équipes fixes', index=False)
         
         # Feuille 4: Résumé
         summary_data = {
             'Statistique': ['Mode tournoi', 'Équipes actuelles', 'Équipes fixes', 'Rounds historisés'],
             'Valeur': [
-                st.session_state.mode_tournoi,
+                etat.mode_tournoi,
                 len(equipes_actuelles),
-                len(st.session_state.equipes_fixes),
-                len(st.session_state.historique_equipes["Round"].unique()) if not st.session_state.historique_equipes.empty else 0
+                len(etat.equipes_fixes),
+                len(etat.historique_equipes["Round"].unique()) if not etat.historique_equipes.empty else 0
             ]
         }
         df_summary = pd.DataFrame(summary_data)
@@ -1277,22 +2820,23 @@ def exporter_equipes_complet_xlsx():
 
 def exporter_matchs_en_cours_pdf():
     """Génère un PDF avec les matchs en cours (dernier round)"""
+    matchs_detail = get_matchs_detail()
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4)
     elements = []
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Matchs en cours - {st.session_state.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Matchs en cours - {etat.nom_tournoi}", styles['Title']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Paragraph(f"Round actuel: {get_current_round()}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
-    if not st.session_state.matchs_detail.empty:
+    if not matchs_detail.empty:
         # Récupérer le dernier round
-        dernier_round = st.session_state.matchs_detail["Round"].max()
-        matchs_round = st.session_state.matchs_detail[
-            st.session_state.matchs_detail["Round"] == dernier_round
+        dernier_round = matchs_detail["Round"].max()
+        matchs_round = matchs_detail[
+            matchs_detail["Round"] == dernier_round
         ]
         
         if not matchs_round.empty:
@@ -1304,12 +2848,12 @@ def exporter_matchs_en_cours_pdf():
                 joueurs_b = f"{match['J1_B']}\n{match['J2_B']}"
                 
                 # Récupérer les noms d'équipes
-                if st.session_state.mode_tournoi == "Classique":
-                    eq_a = st.session_state.equipes_fixes[
-                        st.session_state.equipes_fixes["ID"] == match["Equipe_A_ID"]
+                if etat.mode_tournoi == "Classique":
+                    eq_a = etat.equipes_fixes[
+                        etat.equipes_fixes["ID"] == match["Equipe_A_ID"]
                     ]
-                    eq_b = st.session_state.equipes_fixes[
-                        st.session_state.equipes_fixes["ID"] == match["Equipe_B_ID"]
+                    eq_b = etat.equipes_fixes[
+                        etat.equipes_fixes["ID"] == match["Equipe_B_ID"]
                     ]
                     nom_eq_a = get_nom_affichage_equipe(eq_a.iloc[0]) if not eq_a.empty else match["Equipe_A_ID"]
                     nom_eq_b = get_nom_affichage_equipe(eq_b.iloc[0]) if not eq_b.empty else match["Equipe_B_ID"]
@@ -1356,25 +2900,26 @@ def exporter_matchs_en_cours_pdf():
 
 def exporter_tous_matchs_pdf():
     """Génère un PDF avec tous les matchs du tournoi avec les joueurs dans la même case"""
+    matchs_detail = get_matchs_detail()
     buf = io.BytesIO()
     doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=20, rightMargin=20)
     elements = []
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Tous les matchs - {st.session_state.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Tous les matchs - {etat.nom_tournoi}", styles['Title']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-    elements.append(Paragraph(f"Total matchs: {len(st.session_state.matchs_detail)}", styles['Normal']))
+    elements.append(Paragraph(f"Total matchs: {len(matchs_detail)}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
-    if not st.session_state.matchs_detail.empty:
+    if not matchs_detail.empty:
         # Grouper par round
-        for round_num in sorted(st.session_state.matchs_detail["Round"].unique()):
+        for round_num in sorted(matchs_detail["Round"].unique()):
             elements.append(Paragraph(f"Round {round_num}", styles['Heading2']))
             elements.append(Spacer(1, 10))
             
-            matchs_round = st.session_state.matchs_detail[
-                st.session_state.matchs_detail["Round"] == round_num
+            matchs_round = matchs_detail[
+                matchs_detail["Round"] == round_num
             ]
             
             # Créer les en-têtes de tableau avec les colonnes demandées
@@ -1386,12 +2931,12 @@ def exporter_tous_matchs_pdf():
                 joueurs_b = f"{match['J1_B']}\n{match['J2_B']}"
                 
                 # Récupérer les noms d'équipes
-                if st.session_state.mode_tournoi == "Classique":
-                    eq_a = st.session_state.equipes_fixes[
-                        st.session_state.equipes_fixes["ID"] == match["Equipe_A_ID"]
+                if etat.mode_tournoi == "Classique":
+                    eq_a = etat.equipes_fixes[
+                        etat.equipes_fixes["ID"] == match["Equipe_A_ID"]
                     ]
-                    eq_b = st.session_state.equipes_fixes[
-                        st.session_state.equipes_fixes["ID"] == match["Equipe_B_ID"]
+                    eq_b = etat.equipes_fixes[
+                        etat.equipes_fixes["ID"] == match["Equipe_B_ID"]
                     ]
                     nom_eq_a = get_nom_affichage_equipe(eq_a.iloc[0]) if not eq_a.empty else match["Equipe_A_ID"]
                     nom_eq_b = get_nom_affichage_equipe(eq_b.iloc[0]) if not eq_b.empty else match["Equipe_B_ID"]
@@ -1446,26 +2991,84 @@ def exporter_tous_matchs_pdf():
     buf.seek(0)
     return buf
 
+def exporter_planning_pdf():
+    """Génère un PDF avec le planning de la journée (rounds précalculés du mode classique)"""
+    planning = etat.planning_classique
+    noms = {eq["ID"]: get_nom_affichage_equipe(eq) for _, eq in etat.equipes_fixes.iterrows()}
+    joueurs = {eq["ID"]: f"{eq['J1']}\n{eq['J2']}" for _, eq in etat.equipes_fixes.iterrows()}
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4, leftMargin=20, rightMargin=20)
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Titre
+    elements.append(Paragraph(f"Planning de la journée - {etat.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
+    elements.append(Paragraph(f"Rounds planifiés: {len(planning['rounds'])} sur {planning['nb_terrains']} terrain(s)", styles['Normal']))
+    elements.append(Spacer(1, 20))
+    
+    for position, paires in enumerate(planning["rounds"]):
+        elements.append(Paragraph(f"Round {planning['premier_round'] + position}", styles['Heading2']))
+        elements.append(Spacer(1, 10))
+        
+        data = [["Terrain", "Équipe A", "Joueurs A", "Équipe B", "Joueurs B"]]
+        for terrain, (equipe_a, equipe_b) in enumerate(paires, 1):
+            data.append([
+                f"T{terrain}",
+                noms.get(equipe_a, equipe_a),
+                joueurs.get(equipe_a, ""),
+                noms.get(equipe_b, equipe_b),
+                joueurs.get(equipe_b, "")
+            ])
+        
+        table = Table(data, colWidths=[40, 90, 120, 90, 120])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4B8BBE')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (2, 1), (2, -1), 'LEFT'),
+            ('ALIGN', (4, 1), (4, -1), 'LEFT'),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#F0F0F0')])
+        ]))
+        elements.append(table)
+        
+        # Équipes au repos pendant ce round
+        en_jeu = {eid for paire in paires for eid in paire}
+        au_repos = [noms.get(eid, eid) for eid in planning["equipes"] if eid not in en_jeu]
+        if au_repos:
+            elements.append(Spacer(1, 5))
+            elements.append(Paragraph(f"Repos: {', '.join(au_repos)}", styles['Normal']))
+        elements.append(Spacer(1, 20))
+    
+    doc.build(elements)
+    buf.seek(0)
+    return buf
+
 def exporter_matchs_complet_xlsx():
     """Génère un fichier Excel avec tous les matchs"""
+    matchs_detail = get_matchs_detail()
     output = io.BytesIO()
     
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         # Feuille 1: Tous les matchs détaillés
-        if not st.session_state.matchs_detail.empty:
-            st.session_state.matchs_detail.to_excel(writer, sheet_name='Matchs détaillés', index=False)
+        if not matchs_detail.empty:
+            matchs_detail.to_excel(writer, sheet_name='Matchs détaillés', index=False)
         
         # Feuille 2: Matchs simplifiés
-        if not st.session_state.matchs.empty:
-            st.session_state.matchs.to_excel(writer, sheet_name='Matchs simplifiés', index=False)
+        if not get_matchs().empty:
+            get_matchs().to_excel(writer, sheet_name='Matchs simplifiés', index=False)
         
         # Feuille 3: Statistiques des matchs
         summary_data = {
             'Statistique': ['Total matchs', 'Rounds joués', 'Matchs avec jokers', 'Dernier round'],
             'Valeur': [
-                len(st.session_state.matchs_detail),
-                len(st.session_state.matchs_detail["Round"].unique()) if not st.session_state.matchs_detail.empty else 0,
-                len(st.session_state.matchs_detail[st.session_state.matchs_detail["Jokers"] != ""]) if not st.session_state.matchs_detail.empty else 0,
+                len(matchs_detail),
+                len(matchs_detail["Round"].unique()) if not matchs_detail.empty else 0,
+                len(matchs_detail[matchs_detail["Jokers"] != ""]) if not matchs_detail.empty else 0,
                 get_current_round()
             ]
         }
@@ -1483,9 +3086,9 @@ def exporter_statistiques_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Statistiques - {st.session_state.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Statistiques - {etat.nom_tournoi}", styles['Title']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
-    elements.append(Paragraph(f"Mode: {st.session_state.mode_tournoi}", styles['Normal']))
+    elements.append(Paragraph(f"Mode: {etat.mode_tournoi}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
     # Section 1: Statistiques générales
@@ -1493,19 +3096,19 @@ def exporter_statistiques_pdf():
     elements.append(Spacer(1, 10))
     
     stats_data = [
-        ["Joueurs inscrits", len(st.session_state.joueurs)],
-        ["Joueurs en attente", len(st.session_state.temp_joueurs)],
+        ["Joueurs inscrits", len(etat.joueurs)],
+        ["Joueurs en attente", len(etat.temp_joueurs)],
         ["Rounds joués", get_current_round()],
-        ["Matchs joués", len(st.session_state.matchs_detail)],
-        ["Terrains disponibles", st.session_state.nb_terrains]
+        ["Matchs joués", len(get_matchs_detail())],
+        ["Terrains disponibles", etat.nb_terrains]
     ]
     
-    if st.session_state.mode_tournoi == "Classique":
-        stats_data.append(["Équipes fixes", len(st.session_state.equipes_fixes)])
+    if etat.mode_tournoi == "Classique":
+        stats_data.append(["Équipes fixes", len(etat.equipes_fixes)])
     else:
         equipes_actuelles = get_equipes_actuelles()
         stats_data.append(["Équipes actuelles", len(equipes_actuelles)])
-        stats_data.append(["Rounds historisés", len(st.session_state.historique_equipes["Round"].unique()) if not st.session_state.historique_equipes.empty else 0])
+        stats_data.append(["Rounds historisés", len(etat.historique_equipes["Round"].unique()) if not etat.historique_equipes.empty else 0])
     
     table_stats = Table(stats_data, colWidths=[150, 100])
     table_stats.setStyle(TableStyle([
@@ -1519,7 +3122,7 @@ def exporter_statistiques_pdf():
     elements.append(Spacer(1, 20))
     
     # Section 2: Statistiques d'équilibre (mode individuel)
-    if st.session_state.mode_tournoi == "Individuel":
+    if etat.mode_tournoi == "Individuel":
         elements.append(Paragraph("Équilibre des matchs joués", styles['Heading2']))
         elements.append(Spacer(1, 10))
         
@@ -1554,7 +3157,7 @@ def exporter_statistiques_pdf():
             elements.append(Spacer(1, 10))
             
             joueurs_stats = []
-            for joueur in st.session_state.joueurs:
+            for joueur in etat.joueurs:
                 nom_complet = get_nom_complet(joueur)
                 matchs_joues = stats.get(nom_complet, 0)
                 joueurs_stats.append([nom_complet, joueur['Catégorie'], matchs_joues])
@@ -1593,24 +3196,24 @@ def exporter_statistiques_xlsx():
                 'Rounds joués', 'Matchs joués', 'Terrains disponibles'
             ],
             'Valeur': [
-                st.session_state.nom_tournoi,
-                st.session_state.mode_tournoi,
-                len(st.session_state.joueurs),
-                len(st.session_state.temp_joueurs),
+                etat.nom_tournoi,
+                etat.mode_tournoi,
+                len(etat.joueurs),
+                len(etat.temp_joueurs),
                 get_current_round(),
-                len(st.session_state.matchs_detail),
-                st.session_state.nb_terrains
+                len(get_matchs_detail()),
+                etat.nb_terrains
             ]
         }
         df_general = pd.DataFrame(general_data)
         df_general.to_excel(writer, sheet_name='Statistiques générales', index=False)
         
         # Feuille 2: Statistiques d'équilibre (mode individuel)
-        if st.session_state.mode_tournoi == "Individuel":
+        if etat.mode_tournoi == "Individuel":
             stats = calculer_statistiques_joueurs()
             if stats:
                 equil_data = []
-                for joueur in st.session_state.joueurs:
+                for joueur in etat.joueurs:
                     nom_complet = get_nom_complet(joueur)
                     matchs_joues = stats.get(nom_complet, 0)
                     equil_data.append({
@@ -1625,9 +3228,9 @@ def exporter_statistiques_xlsx():
         
         # Feuille 3: Statistiques des équipes
         team_data = []
-        if st.session_state.mode_tournoi == "Classique":
-            if not st.session_state.equipes_fixes.empty:
-                for _, equipe in st.session_state.equipes_fixes.iterrows():
+        if etat.mode_tournoi == "Classique":
+            if not etat.equipes_fixes.empty:
+                for _, equipe in etat.equipes_fixes.iterrows():
                     team_data.append({
                         'ID': equipe['ID'],
                         'Surnom': get_nom_affichage_equipe(equipe),
@@ -1654,6 +3257,27 @@ def exporter_statistiques_xlsx():
     output.seek(0)
     return output.getvalue()
 
+def exporter_rencontres_xlsx():
+    """Génère un fichier Excel avec les cartes des partenaires et des adversaires (nombre de matchs par paire)"""
+    output = io.BytesIO()
+    
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        for cle, nom_feuille in (("partenaires", "Partenaires"), ("adversaires", "Adversaires")):
+            df_rencontres = tableau_rencontres(cle)
+            df_rencontres.to_excel(writer, sheet_name=nom_feuille)
+            
+            # Carte de chaleur: dégradé du blanc (jamais) au bleu (le plus souvent)
+            if not df_rencontres.empty:
+                feuille = writer.sheets[nom_feuille]
+                plage = f"B2:{feuille.cell(row=len(df_rencontres) + 1, column=len(df_rencontres) + 1).coordinate}"
+                feuille.conditional_formatting.add(plage, ColorScaleRule(
+                    start_type='num', start_value=0, start_color='FFFFFF',
+                    end_type='max', end_color='4B8BBE'
+                ))
+    
+    output.seek(0)
+    return output.getvalue()
+
 def exporter_classement_equipes_pdf():
     """Génère un PDF avec le classement par équipes (mode classique)"""
     buf = io.BytesIO()
@@ -1662,71 +3286,18 @@ def exporter_classement_equipes_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Classement par équipes - {st.session_state.nom_tournoi}", styles['Title']))
-    elements.append(Paragraph(f"Mode: {st.session_state.algo_classement}", styles['Normal']))
+    elements.append(Paragraph(f"Classement par équipes - {etat.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Mode: {etat.algo_classement}", styles['Normal']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
-    if st.session_state.mode_tournoi == "Classique" and not st.session_state.matchs.empty and not st.session_state.equipes_fixes.empty:
-        # Calculer le classement
-        stats = []
-        for _, eq in st.session_state.equipes_fixes.iterrows():
-            eid = eq["ID"]
-            m_eq = st.session_state.matchs[
-                (st.session_state.matchs["Equipe A"] == eid) | 
-                (st.session_state.matchs["Equipe B"] == eid)
-            ]
-            
-            pm, pe, v, n, d = 0, 0, 0, 0, 0
-            for _, m in m_eq.iterrows():
-                if m["Score A"] == 0 and m["Score B"] == 0:
-                    continue
-                
-                is_a = m["Equipe A"] == eid
-                ma, sa = (m["Score A"], m["Score B"]) if is_a else (m["Score B"], m["Score A"])
-                
-                pm += ma
-                pe += sa
-                
-                if ma > sa:
-                    v += 1
-                elif ma == sa:
-                    n += 1
-                else:
-                    d += 1
-            
-            diff = pm - pe
-            if st.session_state.algo_classement == "Pondéré":
-                score = round(((v * 3) + (n * 1)) * eq["Coeff"], 2)
-            else:
-                score = (v * 2) + (n * 1)
-            
-            stats.append({
-                "Équipe": get_nom_affichage_equipe(eq),
-                "Joueurs": f"{eq['J1']} & {eq['J2']}",
-                "V": v, "N": n, "D": d,
-                "PM": pm, "PE": pe, "Diff": diff,
-                "Points": score
-            })
+    if etat.mode_tournoi == "Classique" and not get_matchs().empty and not etat.equipes_fixes.empty:
+        df_classement_eq = calculer_classement_equipes()
         
-        if stats:
-            # Trier par points et différence
-            stats.sort(key=lambda x: (x["Points"], x["Diff"]), reverse=True)
-            
-            data = [["Rang", "Équipe", "Joueurs", "V", "N", "D", "PM", "PE", "Diff", "Points"]]
-            for idx, stat in enumerate(stats, 1):
-                data.append([
-                    str(idx),
-                    stat["Équipe"],
-                    stat["Joueurs"],
-                    str(stat["V"]),
-                    str(stat["N"]),
-                    str(stat["D"]),
-                    str(stat["PM"]),
-                    str(stat["PE"]),
-                    str(stat["Diff"]),
-                    str(stat["Points"])
-                ])
+        if not df_classement_eq.empty:
+            data = [["Rang"] + COLONNES_CLASSEMENT_EQUIPES]
+            for idx, row in df_classement_eq.iterrows():
+                data.append([str(idx)] + [str(row[col]) for col in COLONNES_CLASSEMENT_EQUIPES])
             
             table = Table(data, colWidths=[30, 70, 120, 20, 20, 20, 30, 30, 30, 40])
             table.setStyle(TableStyle([
@@ -1741,7 +3312,7 @@ def exporter_classement_equipes_pdf():
         else:
             elements.append(Paragraph("Aucune statistique disponible pour le classement", styles['Normal']))
     else:
-        if st.session_state.mode_tournoi != "Classique":
+        if etat.mode_tournoi != "Classique":
             elements.append(Paragraph("Le classement par équipes n'est disponible qu'en mode Classique", styles['Normal']))
         else:
             elements.append(Paragraph("Aucun match joué pour le moment", styles['Normal']))
@@ -1758,8 +3329,8 @@ def exporter_classement_individuel_pdf():
     styles = getSampleStyleSheet()
     
     # Titre
-    elements.append(Paragraph(f"Classement individuel - {st.session_state.nom_tournoi}", styles['Title']))
-    elements.append(Paragraph(f"Mode: {st.session_state.algo_classement_individuel}", styles['Normal']))
+    elements.append(Paragraph(f"Classement individuel - {etat.nom_tournoi}", styles['Title']))
+    elements.append(Paragraph(f"Mode: {etat.algo_classement_individuel}", styles['Normal']))
     elements.append(Paragraph(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}", styles['Normal']))
     elements.append(Spacer(1, 20))
     
@@ -1808,53 +3379,9 @@ def exporter_classements_complet_xlsx():
             df_classement_indiv.to_excel(writer, sheet_name='Classement individuel')
         
         # Feuille 2: Classement par équipes (mode classique)
-        if st.session_state.mode_tournoi == "Classique" and not st.session_state.matchs.empty and not st.session_state.equipes_fixes.empty:
-            # Calculer le classement par équipes
-            stats = []
-            for _, eq in st.session_state.equipes_fixes.iterrows():
-                eid = eq["ID"]
-                m_eq = st.session_state.matchs[
-                    (st.session_state.matchs["Equipe A"] == eid) | 
-                    (st.session_state.matchs["Equipe B"] == eid)
-                ]
-                
-                pm, pe, v, n, d = 0, 0, 0, 0, 0
-                for _, m in m_eq.iterrows():
-                    if m["Score A"] == 0 and m["Score B"] == 0:
-                        continue
-                    
-                    is_a = m["Equipe A"] == eid
-                    ma, sa = (m["Score A"], m["Score B"]) if is_a else (m["Score B"], m["Score A"])
-                    
-                    pm += ma
-                    pe += sa
-                    
-                    if ma > sa:
-                        v += 1
-                    elif ma == sa:
-                        n += 1
-                    else:
-                        d += 1
-                
-                diff = pm - pe
-                if st.session_state.algo_classement == "Pondéré":
-                    score = round(((v * 3) + (n * 1)) * eq["Coeff"], 2)
-                else:
-                    score = (v * 2) + (n * 1)
-                
-                stats.append({
-                    "Équipe": get_nom_affichage_equipe(eq),
-                    "Joueurs": f"{eq['J1']} & {eq['J2']}",
-                    "V": v, "N": n, "D": d,
-                    "PM": pm, "PE": pe, "Diff": diff,
-                    "Points": score
-                })
-            
-            if stats:
-                df_classement_eq = pd.DataFrame(stats)
-                df_classement_eq = df_classement_eq.sort_values(by=["Points", "Diff"], ascending=False)
-                df_classement_eq.index = range(1, len(df_classement_eq) + 1)
-                df_classement_eq.index.name = "Rang"
+        if etat.mode_tournoi == "Classique" and not get_matchs().empty and not etat.equipes_fixes.empty:
+            df_classement_eq = calculer_classement_equipes()
+            if not df_classement_eq.empty:
                 df_classement_eq.to_excel(writer, sheet_name='Classement équipes')
         
         # Feuille 3: Résumé des classements
@@ -1862,15 +3389,15 @@ def exporter_classements_complet_xlsx():
             'Type classement': ['Individuel', 'Par équipes'],
             'Disponible': [
                 'Oui' if not df_classement_indiv.empty else 'Non',
-                'Oui (mode Classique)' if st.session_state.mode_tournoi == "Classique" else 'Non (mode Individuel)'
+                'Oui (mode Classique)' if etat.mode_tournoi == "Classique" else 'Non (mode Individuel)'
             ],
             'Nombre de lignes': [
                 len(df_classement_indiv),
-                len(st.session_state.equipes_fixes) if st.session_state.mode_tournoi == "Classique" else 0
+                len(etat.equipes_fixes) if etat.mode_tournoi == "Classique" else 0
             ],
             'Méthode de calcul': [
-                st.session_state.algo_classement_individuel,
-                st.session_state.algo_classement if st.session_state.mode_tournoi == "Classique" else 'N/A'
+                etat.algo_classement_individuel,
+                etat.algo_classement if etat.mode_tournoi == "Classique" else 'N/A'
             ]
         }
         df_summary = pd.DataFrame(summary_data)
@@ -1879,6 +3406,44 @@ def exporter_classements_complet_xlsx():
     output.seek(0)
     return output.getvalue()
 
+# === EXPORTS À LA DEMANDE ===
+
+def get_export(nom):
+    """Retourne le document déjà généré pour la version courante de l'état, sinon None"""
+    entree = etat.exports_cache.get(nom)
+    if entree and entree[0] == etat.version_etat:
+        return entree[1]
+    return None
+
+def generer_export(nom, fonction_export):
+    """Génère un document et le garde en cache pour la version courante de l'état"""
+    with mesurer(fonction_export.__name__):
+        resultat = fonction_export()
+    contenu = resultat.getvalue() if isinstance(resultat, io.BytesIO) else resultat
+    etat.exports_cache[nom] = (etat.version_etat, contenu)
+    return contenu
+
+def bouton_export(nom, libelle, fonction_export, nom_fichier, mime):
+    """Affiche un bouton de génération puis le bouton de téléchargement du document
+
+    Le document n'est construit qu'au clic et réutilisé tant que l'état du tournoi ne change pas,
+    un simple rafraîchissement de la page ne déclenche donc aucun export.
+    """
+    contenu = get_export(nom)
+    emplacement = st.empty()
+    if contenu is None:
+        if emplacement.button(f"⚙️ Générer {libelle}", use_container_width=True, key=f"generer_{nom}"):
+            contenu = generer_export(nom, fonction_export)
+    if contenu is not None:
+        emplacement.download_button(
+            libelle,
+            contenu,
+            nom_fichier,
+            mime,
+            use_container_width=True,
+            key=f"telecharger_{nom}"
+        )
+
 # === NOUVELLES FONCTIONS POUR LES POPUPS DE CONFIRMATION ===
 
 def afficher_popup_confirmation(titre, message, fonction_confirmation, key_suffix):
@@ -1929,1197 +3494,1394 @@ def afficher_popup_confirmation(titre, message, fonction_confirmation, key_suffi
 
 def reinitialiser_matchs_avec_confirmation():
     """Réinitialise les matchs avec confirmation"""
-    st.session_state.matchs = pd.DataFrame(columns=["Round", "Terrain", "Type", "Equipe A", "Score A", "Equipe B", "Score B"])
-    st.session_state.matchs_detail = pd.DataFrame(columns=[
-        "Round", "Terrain", "Type", "Equipe_A_ID", "J1_A", "J2_A", "Score_A",
-        "Equipe_B_ID", "J1_B", "J2_B", "Score_B", "Jokers"
-    ])
     st.session_state.historique_equipes = pd.DataFrame(columns=["Round", "ID", "Surnom", "J1", "Cat1", "J2", "Cat2", "Coeff"])
-    st.success("✅ Matchs réinitialisés!")
+    st.session_state.graines_rounds = {}
+    # Le planning de la journée partait du round suivant les matchs supprimés
+    st.session_state.planning_classique = {}
+    if reinitialiser_table_matchs(["historique_equipes", "graines_rounds", "planning_classique"]):
+        incrementer_version_etat()
+        st.success("✅ Matchs réinitialisés!")
     st.session_state["show_popup_matchs"] = False
 
 def reinitialiser_tournoi_avec_confirmation():
     """Réinitialise tout le tournoi avec confirmation"""
-    for key in list(st.session_state.keys()):
-        if key != 'profil':
-            del st.session_state[key]
-    
     # Réinitialiser avec les nouvelles structures
-    for key, val in defaults.items():
-        if key not in st.session_state:
-            st.session_state[key] = val
+    reinitialiser_session(st.session_state.tournoi)
+    vider_base()
     
     st.success("✅ Tournoi complètement réinitialisé!")
     st.session_state["show_popup_tournoi"] = False
 
 def reinitialiser_matchs_simple_avec_confirmation():
     """Réinitialise seulement les matchs (sans historique équipes) avec confirmation"""
-    st.session_state.matchs = pd.DataFrame(columns=["Round", "Terrain", "Type", "Equipe A", "Score A", "Equipe B", "Score B"])
-    st.session_state.matchs_detail = pd.DataFrame(columns=[
-        "Round", "Terrain", "Type", "Equipe_A_ID", "J1_A", "J2_A", "Score_A",
-        "Equipe_B_ID", "J1_B", "J2_B", "Score_B", "Jokers"
-    ])
-    st.success("✅ Matchs réinitialisés!")
+    st.session_state.graines_rounds = {}
+    # Le planning de la journée partait du round suivant les matchs supprimés
+    st.session_state.planning_classique = {}
+    if reinitialiser_table_matchs(["graines_rounds", "planning_classique"]):
+        incrementer_version_etat()
+        st.success("✅ Matchs réinitialisés!")
     st.session_state["show_popup_matchs_simple"] = False
 
-# Ajouter les clés de popup aux defaults
-defaults.update({
-    'show_popup_matchs': False,
-    'show_popup_tournoi': False,
-    'show_popup_matchs_simple': False,
-    'show_popup_import_matchs': False
-})
-
-# Onglets principaux
-tabs = st.tabs(["👥 Joueurs", "🤝 Équipes", "🏸 Matchs", "📊 Statistiques", "🏆 Classements", "⚙️ Paramètres"])
-
-# Onglet 1: Joueurs
-with tabs[0]:
-    st.header("👥 Gestion des Joueurs")
-    
-    # Formulaire d'ajout
-    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
-    with col1:
-        prenom = st.text_input("Prénom", key="prenom_input")
-    with col2:
-        nom = st.text_input("Nom", key="nom_input")
-    with col3:
-        categorie = st.selectbox("Catégorie", 
-                                [c for c in st.session_state.categories_dict if c != "Joker"],
-                                key="categorie_select")
-    with col4:
-        st.write("")  # Espacement
-        st.write("")
-        if st.button("➕ Ajouter", use_container_width=True):
-            if prenom.strip() and nom.strip():
-                if joueur_existe(prenom, nom):
-                    st.error(f"❌ {prenom} {nom} existe déjà!")
-                else:
-                    st.session_state.temp_joueurs.append({
-                        "Prénom": prenom.strip(),
-                        "Nom": nom.strip(),
-                        "Catégorie": categorie
-                    })
-                    st.success(f"✅ {prenom} {nom} ajouté en attente de validation")
-                    st.rerun()
-            else:
-                st.error("❌ Prénom et nom requis!")
+# === SAISIE DES SCORES AU BORD DU TERRAIN ===
+
+def get_terrain_demande():
+    """Terrain (?terrain=3 ou T3) et round (&round=5, facultatif) demandés dans l'URL"""
+    terrain = str(st.query_params.get("terrain", "")).strip().upper()
+    if terrain.isdigit():
+        terrain = f"T{terrain}"
+    round_demande = str(st.query_params.get("round", "")).strip()
+    return terrain, int(round_demande) if round_demande.isdigit() else None
+
+def afficher_saisie_terrain(terrain, round_num):
+    """Page allégée de saisie du score d'un seul match, pour les joueurs depuis leur téléphone
+
+    Seul le match demandé est lu et seul son score est enregistré: ni onglets, ni tableaux, ni exports.
+    Un score déjà saisi ne peut être corrigé que par l'organisateur.
+    """
+    st.set_page_config(page_title=f"Duck Manager Pro - Terrain {terrain}")
+    st.header(f"🏸 Terrain {terrain}")
+    id_match = get_id_match_terrain(terrain, round_num)
+    if id_match is None:
+        st.info(f"Aucun match programmé sur le terrain {terrain}" + (f" au round {round_num}" if round_num else ""))
+        return
+    match = etat.magasin_matchs["lignes"][id_match]
+    st.caption(f"{st.session_state.nom_tournoi} • Round {match['Round']} • {match['Type']}")
+    
+    if not (match["Score_A"] == 0 and match["Score_B"] == 0) and not est_organisateur():
+        st.success(f"✅ Score enregistré: {match['Score_A']} - {match['Score_B']}")
+        st.caption("Pour corriger ce score, adressez-vous à l'organisateur")
+        return
     
-    # Joueurs en attente de validation
-    if st.session_state.temp_joueurs:
-        st.subheader("👥 Joueurs en attente de validation")
+    with st.form(f"score_terrain_{id_match}"):
+        score_a = st.number_input(f"{match['J1_A']} & {match['J2_A']}", min_value=0, max_value=100,
+                                  value=int(match["Score_A"]), step=1)
+        score_b = st.number_input(f"{match['J1_B']} & {match['J2_B']}", min_value=0, max_value=100,
+                                  value=int(match["Score_B"]), step=1)
+        if st.form_submit_button("💾 Enregistrer le score", use_container_width=True, type="primary"):
+            if score_a == 0 and score_b == 0:
+                st.error("❌ Saisissez le score des deux équipes")
+            elif enregistrer_score_terrain(id_match, score_a, score_b):
+                st.rerun()
+
+# === INTERFACE STREAMLIT ===
+
+def main():
+    """Une exécution de l'interface (streamlit run): le module importé seul ne charge que le moteur"""
+    # Initialiser les variables de session
+    for key, val in defaults.items():
+        if key not in st.session_state:
+            st.session_state[key] = copy.deepcopy(val)
+
+    # Mesures de cette exécution (profilage activé par l'organisateur)
+    debut_execution = time.perf_counter()
+    demarrer_execution_profilee()
+
+    # Chaque tournoi a sa propre partition d'état: changer de tournoi repart d'une session vierge
+    if st.session_state.tournoi != get_tournoi_demande():
+        reinitialiser_session(get_tournoi_demande())
+    # Un tournoi inconnu n'est pas créé par sa seule URL: le tournoi par défaut est ouvert à la place
+    tournoi_url = st.query_params.get("tournoi")
+    if tournoi_url is not None and normaliser_identifiant_tournoi(tournoi_url) != st.session_state.tournoi:
+        st.toast(f"⚠️ Tournoi « {tournoi_url} » introuvable")
+        st.query_params["tournoi"] = st.session_state.tournoi
+
+    # Reprendre l'état enregistré (redémarrage du serveur, ou modifications faites dans une autre session)
+    with mesurer("synchroniser_avec_base"):
+        synchroniser_avec_base()
+
+    # Page de saisie d'un terrain: le reste de l'application n'est pas exécuté
+    terrain_demande, round_demande = get_terrain_demande()
+    if terrain_demande:
+        with mesurer("Saisie au bord du terrain"):
+            afficher_saisie_terrain(terrain_demande, round_demande)
+        afficher_avertissement_journal(st)
+        return
+
+    st.set_page_config(layout="wide", page_title="Duck Manager Pro")
+    set_background(st.session_state.bg_image_data)
+
+    st.title(f"🏸 {st.session_state.nom_tournoi}")
+    zone_avertissement = st.empty()
+
+    # Barre latérale
+    with st.sidebar, mesurer("Barre latérale"):
+        st.header("🗂️ Tournoi")
+        tournois = lister_tournois()
+        tournoi_choisi = st.selectbox("Tournoi:", tournois, index=tournois.index(st.session_state.tournoi))
+        if tournoi_choisi != st.session_state.tournoi:
+            st.query_params["tournoi"] = tournoi_choisi
+            st.rerun()
         
         if est_organisateur():
-            col_val1, col_val2 = st.columns(2)
-            with col_val1:
-                if st.button("✅ Valider tous", use_container_width=True):
-                    for joueur in st.session_state.temp_joueurs:
-                        st.session_state.joueurs.append(joueur)
-                    st.session_state.temp_joueurs = []
-                    st.success("✅ Tous les joueurs validés!")
-                    st.rerun()
-            with col_val2:
-                if st.button("🗑️ Supprimer tous", use_container_width=True, type="secondary"):
-                    st.session_state.temp_joueurs = []
+            nouveau_tournoi = st.text_input("Nouveau tournoi:", placeholder="ex: salle-2")
+            if st.button("➕ Créer le tournoi") and nouveau_tournoi.strip():
+                tournoi = normaliser_identifiant_tournoi(nouveau_tournoi)
+                creer_tournoi(tournoi)
+                st.query_params["tournoi"] = tournoi
+                st.rerun()
+        
+        st.divider()
+        
+        st.header("👤 Profil")
+        profil = st.radio("Profil:", ["Joueur", "Organisateur"], 
+                         index=0 if st.session_state.profil == "Joueur" else 1)
+        
+        if profil == "Organisateur" and st.session_state.profil == "Joueur":
+            mdp = st.text_input("Mot de passe:", type="password")
+            if st.button("🔓 Valider"):
+                if mdp.upper() == MOT_DE_PASSE_ORGANISATEUR:
+                    st.session_state.profil = "Organisateur"
+                    st.success("✅ Mode Organisateur activé!")
                     st.rerun()
+                else:
+                    st.error("❌ Mot de passe incorrect!")
+        elif profil == "Joueur" and st.session_state.profil == "Organisateur":
+            st.session_state.profil = "Joueur"
+            st.rerun()
         
-        for idx, joueur in enumerate(st.session_state.temp_joueurs):
-            col_j1, col_j2, col_j3, col_j4, col_j5 = st.columns([1, 2, 2, 2, 2])
-            with col_j1:
-                st.write(f"**{idx+1}**")
-            with col_j2:
-                st.write(joueur["Prénom"])
-            with col_j3:
-                st.write(joueur["Nom"])
-            with col_j4:
-                st.write(joueur["Catégorie"])
-            with col_j5:
-                if est_organisateur():
-                    col_v, col_s = st.columns(2)
-                    with col_v:
-                        if st.button("✅", key=f"val_{idx}"):
-                            st.session_state.joueurs.append(joueur)
-                            st.session_state.temp_joueurs.pop(idx)
-                            st.rerun()
-                    with col_s:
-                        if st.button("🗑️", key=f"sup_{idx}"):
-                            st.session_state.temp_joueurs.pop(idx)
-                            st.rerun()
-    
-    # Liste des joueurs validés
-    st.subheader("📋 Joueurs inscrits")
-    if st.session_state.joueurs:
-        df_joueurs = pd.DataFrame(st.session_state.joueurs)
-        st.dataframe(df_joueurs, use_container_width=True)
-    else:
-        st.info("Aucun joueur inscrit")
-    
-    # Import/Export
-    if est_organisateur():
         st.divider()
-        st.subheader("📥📤 Import/Export")
-        
-        col_imp, col_exp = st.columns(2)
-        
-        with col_imp:
-            st.write("**Importer des joueurs**")
-            fichier_import = st.file_uploader("Fichier CSV", type=['csv'], 
-                                            help="Format: Prénom,Nom,Catégorie")
-            if fichier_import and st.button("📥 Importer"):
-                try:
-                    df = pd.read_csv(fichier_import)
-                    if all(col in df.columns for col in ['Prénom', 'Nom', 'Catégorie']):
-                        nouveaux = 0
-                        for _, row in df.iterrows():
-                            if not joueur_existe(row['Prénom'], row['Nom']):
-                                st.session_state.joueurs.append({
-                                    "Prénom": row['Prénom'],
-                                    "Nom": row['Nom'],
-                                    "Catégorie": row['Catégorie']
-                                })
-                                nouveaux += 1
-                        st.success(f"✅ {nouveaux} nouveaux joueurs importés!")
-                        st.rerun()
-                    else:
-                        st.error("❌ Format CSV incorrect. Colonnes requises: Prénom,Nom,Catégorie")
-                except Exception as e:
-                    st.error(f"❌ Erreur: {e}")
-        
-        with col_exp:
-            st.write("**Exporter les joueurs**")
-            if st.session_state.joueurs:
-                csv_data = pd.DataFrame(st.session_state.joueurs).to_csv(index=False).encode('utf-8')
-                st.download_button("💾 Exporter CSV", csv_data, 
-                                 f"joueurs_{st.session_state.nom_tournoi}.csv",
-                                 "text/csv")
-
-# Dans l'onglet "Joueurs" (après la section Import/Export):
-with tabs[0]:
-    # ... (code existant) ...
-    
-    # Ajouter la section Exportation après la section Import/Export
-    if est_organisateur():
+        
+        # Indicateur du mode
+        if st.session_state.mode_tournoi == "Classique":
+            st.success("🏆 **Mode Classique**")
+            st.caption("Équipes fixes, classement par équipe")
+        else:
+            st.warning("🎯 **Mode Individuel**")
+            st.caption("Équipes variables, priorité aux moins actifs")
+        
         st.divider()
-        st.subheader("📤 Exportation complète des joueurs")
-        
-        col_exp1, col_exp2, col_exp3 = st.columns(3)
-        
-        with col_exp1:
-            # Export PDF joueurs en attente
-            if st.session_state.temp_joueurs:
-                pdf_attente = exporter_joueurs_en_attente_pdf()
-                st.download_button(
-                    "📄 PDF Joueurs en attente",
-                    pdf_attente,
-                    f"joueurs_attente_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True
-                )
-            else:
-                st.button("📄 PDF Joueurs en attente", disabled=True, use_container_width=True)
-        
-        with col_exp2:
-            # Export PDF joueurs validés
-            if st.session_state.joueurs:
-                pdf_valides = exporter_joueurs_valides_pdf()
-                st.download_button(
-                    "📄 PDF Joueurs validés",
-                    pdf_valides,
-                    f"joueurs_valides_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True
-                )
-            else:
-                st.button("📄 PDF Joueurs validés", disabled=True, use_container_width=True)
-        
-        with col_exp3:
-            # Export Excel complet
-            if st.session_state.joueurs or st.session_state.temp_joueurs:
-                xlsx_complet = exporter_joueurs_complet_xlsx()
-                st.download_button(
-                    "📊 Excel Complet",
-                    xlsx_complet,
-                    f"joueurs_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
-            else:
-                st.button("📊 Excel Complet", disabled=True, use_container_width=True)
-                
-# Dans l'onglet ÉQUIPES (remplacement de la section actuelle)
-with tabs[1]: 
-    st.header("🤝 Gestion des Équipes")
-    
-    # Sélection du mode
-    if st.session_state.mode_tournoi == "Classique":
-        st.info("🏆 **Mode Classique**: Les équipes sont fixes tout au long du tournoi.")
         
-        # Boutons de génération
-        col_gen1, col_gen2 = st.columns(2)
-        with col_gen1:
-            if st.button("🎲 Générer nouvelles équipes", use_container_width=True, 
-                        disabled=not est_organisateur()):
-                generer_paires_equilibrees("nouveau")
-                st.rerun()
+        # Statistiques rapides
+        if st.session_state.joueurs:
+            st.metric("Joueurs inscrits", len(st.session_state.joueurs))
         
-        with col_gen2:
-            joueurs_non_affectes = [j for j in st.session_state.joueurs 
-                                   if get_nom_complet(j) not in 
-                                   pd.concat([st.session_state.equipes_fixes['J1'], 
-                                             st.session_state.equipes_fixes['J2']], 
-                                            ignore_index=True).tolist()
-                                   if "Joker" not in get_nom_complet(j)]
-            
-            if len(joueurs_non_affectes) >= 1:
-                if st.button("➕ Ajouter des équipes", use_container_width=True,
-                           disabled=not est_organisateur()):
-                    generer_paires_equilibrees("ajouter")
-                    st.rerun()
-            else:
-                st.button("➕ Ajouter des équipes", use_container_width=True, disabled=True,
-                         help="Aucun joueur non affecté")
+        if not get_matchs().empty:
+            st.metric("Rounds joués", get_current_round())
+            st.metric("Matchs joués", len(get_matchs()))
+        
+        if est_organisateur():
+            st.divider()
+            afficher_panneau_profilage()
+
+    # Ajouter les clés de popup aux defaults
+    defaults.update({
+        'show_popup_matchs': False,
+        'show_popup_tournoi': False,
+        'show_popup_matchs_simple': False,
+        'show_popup_import_matchs': False
+    })
+
+    # Onglets principaux
+    tabs = st.tabs(["👥 Joueurs", "🤝 Équipes", "🏸 Matchs", "📊 Statistiques", "🏆 Classements", "⚙️ Paramètres"])
+
+    # Onglet 1: Joueurs
+    with tabs[0], mesurer("Onglet Joueurs"):
+        st.header("👥 Gestion des Joueurs")
+        
+        # Formulaire d'ajout
+        col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+        with col1:
+            prenom = st.text_input("Prénom", key="prenom_input")
+        with col2:
+            nom = st.text_input("Nom", key="nom_input")
+        with col3:
+            categorie = st.selectbox("Catégorie", 
+                                    [c for c in st.session_state.categories_dict if c != "Joker"],
+                                    key="categorie_select")
+        with col4:
+            st.write("")  # Espacement
+            st.write("")
+            if st.button("➕ Ajouter", use_container_width=True):
+                if prenom.strip() and nom.strip():
+                    if joueur_existe(prenom, nom):
+                        st.error(f"❌ {prenom} {nom} existe déjà!")
+                    else:
+                        st.session_state.temp_joueurs.append({
+                            "Prénom": prenom.strip(),
+                            "Nom": nom.strip(),
+                            "Catégorie": categorie
+                        })
+                        if incrementer_version_etat("temp_joueurs"):
+                            st.success(f"✅ {prenom} {nom} ajouté en attente de validation")
+                            st.rerun()
+                else:
+                    st.error("❌ Prénom et nom requis!")
         
-        # Affichage des équipes avec édition directe
-        if not st.session_state.equipes_fixes.empty:
-            st.subheader("Équipes fixes")
+        # Joueurs en attente de validation
+        if st.session_state.temp_joueurs:
+            st.subheader("👥 Joueurs en attente de validation")
             
             if est_organisateur():
-                # Créer une copie du DataFrame pour l'édition
-                df_display = st.session_state.equipes_fixes.copy()
+                col_val1, col_val2 = st.columns(2)
+                with col_val1:
+                    if st.button("✅ Valider tous", use_container_width=True):
+                        for joueur in st.session_state.temp_joueurs:
+                            valider_joueur(joueur)
+                        st.session_state.temp_joueurs = []
+                        if incrementer_version_etat("temp_joueurs", "joueurs"):
+                            st.success("✅ Tous les joueurs validés!")
+                            st.rerun()
+                with col_val2:
+                    if st.button("🗑️ Supprimer tous", use_container_width=True, type="secondary"):
+                        st.session_state.temp_joueurs = []
+                        if incrementer_version_etat("temp_joueurs"):
+                            st.rerun()
+            
+            for idx, joueur in enumerate(st.session_state.temp_joueurs):
+                col_j1, col_j2, col_j3, col_j4, col_j5 = st.columns([1, 2, 2, 2, 2])
+                with col_j1:
+                    st.write(f"**{idx+1}**")
+                with col_j2:
+                    st.write(joueur["Prénom"])
+                with col_j3:
+                    st.write(joueur["Nom"])
+                with col_j4:
+                    st.write(joueur["Catégorie"])
+                with col_j5:
+                    if est_organisateur():
+                        col_v, col_s = st.columns(2)
+                        with col_v:
+                            if st.button("✅", key=f"val_{idx}"):
+                                valider_joueur(joueur)
+                                st.session_state.temp_joueurs.pop(idx)
+                                if incrementer_version_etat("temp_joueurs", "joueurs"):
+                                    st.rerun()
+                        with col_s:
+                            if st.button("🗑️", key=f"sup_{idx}"):
+                                st.session_state.temp_joueurs.pop(idx)
+                                if incrementer_version_etat("temp_joueurs"):
+                                    st.rerun()
+        
+        # Liste des joueurs validés
+        st.subheader("📋 Joueurs inscrits")
+        if st.session_state.joueurs:
+            df_joueurs = pd.DataFrame(st.session_state.joueurs)
+            st.dataframe(df_joueurs, use_container_width=True)
+        else:
+            st.info("Aucun joueur inscrit")
+        
+        # Import/Export
+        if est_organisateur():
+            st.divider()
+            st.subheader("📥📤 Import/Export")
+            
+            col_imp, col_exp = st.columns(2)
+            
+            with col_imp:
+                st.write("**Importer des joueurs**")
+                fichier_import = st.file_uploader("Fichier CSV", type=['csv'], 
+                                                help="Format: Prénom,Nom,Catégorie")
+                if fichier_import and st.button("📥 Importer"):
+                    try:
+                        df = pd.read_csv(fichier_import)
+                        if all(col in df.columns for col in ['Prénom', 'Nom', 'Catégorie']):
+                            nouveaux = 0
+                            for _, row in df.iterrows():
+                                if not joueur_existe(row['Prénom'], row['Nom']):
+                                    valider_joueur({
+                                        "Prénom": row['Prénom'],
+                                        "Nom": row['Nom'],
+                                        "Catégorie": row['Catégorie']
+                                    })
+                                    nouveaux += 1
+                            if incrementer_version_etat("joueurs"):
+                                st.success(f"✅ {nouveaux} nouveaux joueurs importés!")
+                                st.rerun()
+                        else:
+                            st.error("❌ Format CSV incorrect. Colonnes requises: Prénom,Nom,Catégorie")
+                    except Exception as e:
+                        st.error(f"❌ Erreur: {e}")
+            
+            with col_exp:
+                st.write("**Exporter les joueurs**")
+                if st.session_state.joueurs:
+                    csv_data = pd.DataFrame(st.session_state.joueurs).to_csv(index=False).encode('utf-8')
+                    st.download_button("💾 Exporter CSV", csv_data, 
+                                     f"joueurs_{st.session_state.nom_tournoi}.csv",
+                                     "text/csv")
+
+    # Dans l'onglet "Joueurs" (après la section Import/Export):
+    with tabs[0], mesurer("Onglet Joueurs"):
+        # ... (code existant) ...
+        
+        # Ajouter la section Exportation après la section Import/Export
+        if est_organisateur():
+            st.divider()
+            st.subheader("📤 Exportation complète des joueurs")
+            
+            col_exp1, col_exp2, col_exp3 = st.columns(3)
+            
+            with col_exp1:
+                # Export PDF joueurs en attente
+                if st.session_state.temp_joueurs:
+                    bouton_export(
+                        "joueurs_en_attente_pdf",
+                        "📄 PDF Joueurs en attente",
+                        exporter_joueurs_en_attente_pdf,
+                        f"joueurs_attente_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Joueurs en attente", disabled=True, use_container_width=True)
+            
+            with col_exp2:
+                # Export PDF joueurs validés
+                if st.session_state.joueurs:
+                    bouton_export(
+                        "joueurs_valides_pdf",
+                        "📄 PDF Joueurs validés",
+                        exporter_joueurs_valides_pdf,
+                        f"joueurs_valides_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Joueurs validés", disabled=True, use_container_width=True)
+            
+            with col_exp3:
+                # Export Excel complet
+                if st.session_state.joueurs or st.session_state.temp_joueurs:
+                    bouton_export(
+                        "joueurs_complet_xlsx",
+                        "📊 Excel Complet",
+                        exporter_joueurs_complet_xlsx,
+                        f"joueurs_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                else:
+                    st.button("📊 Excel Complet", disabled=True, use_container_width=True)
+                    
+    # Dans l'onglet ÉQUIPES (remplacement de la section actuelle)
+    with tabs[1], mesurer("Onglet Équipes"):
+        st.header("🤝 Gestion des Équipes")
+        
+        # Sélection du mode
+        if st.session_state.mode_tournoi == "Classique":
+            st.info("🏆 **Mode Classique**: Les équipes sont fixes tout au long du tournoi.")
+            
+            # Boutons de génération
+            col_gen1, col_gen2 = st.columns(2)
+            with col_gen1:
+                if st.button("🎲 Générer nouvelles équipes", use_container_width=True, 
+                            disabled=not est_organisateur()):
+                    if generer_paires_equilibrees("nouveau"):
+                        st.rerun()
+            
+            with col_gen2:
+                joueurs_affectes = set(st.session_state.equipes_fixes['J1']) | set(st.session_state.equipes_fixes['J2'])
+                joueurs_non_affectes = [j for j in st.session_state.joueurs 
+                                       if get_nom_complet(j) not in joueurs_affectes
+                                       if "Joker" not in get_nom_complet(j)]
                 
-                # Configurer l'éditeur de données
-                edited_df = st.data_editor(
-                    df_display,
-                    use_container_width=True,
-                    column_config={
-                        "ID": st.column_config.TextColumn("ID", disabled=True),
-                        "Surnom": st.column_config.TextColumn(
-                            "Surnom",
-                            help="Modifiez le surnom de l'équipe",
-                            required=False
-                        ),
-                        "J1": st.column_config.TextColumn("Joueur 1", disabled=True),
-                        "Cat1": st.column_config.TextColumn("Cat1", disabled=True),
-                        "J2": st.column_config.TextColumn("Joueur 2", disabled=True),
-                        "Cat2": st.column_config.TextColumn("Cat2", disabled=True),
-                        "Coeff": st.column_config.NumberColumn("Coeff", disabled=True, format="%.3f"),
-                    },
-                    hide_index=True,
-                    key="edit_equipes_table"
-                )
+                if len(joueurs_non_affectes) >= 1:
+                    if st.button("➕ Ajouter des équipes", use_container_width=True,
+                               disabled=not est_organisateur()):
+                        if generer_paires_equilibrees("ajouter"):
+                            st.rerun()
+                else:
+                    st.button("➕ Ajouter des équipes", use_container_width=True, disabled=True,
+                             help="Aucun joueur non affecté")
+            
+            # Affichage des équipes avec édition directe
+            if not st.session_state.equipes_fixes.empty:
+                st.subheader("Équipes fixes")
                 
-                # Bouton pour appliquer les modifications
-                if st.button("💾 Enregistrer les modifications", use_container_width=True, type="primary"):
-                    # Vérifier les doublons de surnoms
-                    surnoms_uniques = {}
-                    doublons_trouves = False
+                if est_organisateur():
+                    # Créer une copie du DataFrame pour l'édition
+                    df_display = st.session_state.equipes_fixes.copy()
                     
-                    for idx, row in edited_df.iterrows():
-                        surnom = str(row['Surnom']).strip()
-                        if surnom and surnom != "nan":
-                            if surnom in surnoms_uniques:
-                                st.error(f"❌ Le surnom '{surnom}' est utilisé par plusieurs équipes!")
-                                doublons_trouves = True
-                                break
-                            surnoms_uniques[surnom] = row['ID']
+                    # Configurer l'éditeur de données
+                    edited_df = st.data_editor(
+                        df_display,
+                        use_container_width=True,
+                        column_config={
+                            "ID": st.column_config.TextColumn("ID", disabled=True),
+                            "Surnom": st.column_config.TextColumn(
+                                "Surnom",
+                                help="Modifiez le surnom de l'équipe",
+                                required=False
+                            ),
+                            "J1": st.column_config.TextColumn("Joueur 1", disabled=True),
+                            "Cat1": st.column_config.TextColumn("Cat1", disabled=True),
+                            "J2": st.column_config.TextColumn("Joueur 2", disabled=True),
+                            "Cat2": st.column_config.TextColumn("Cat2", disabled=True),
+                            "Coeff": st.column_config.NumberColumn("Coeff", disabled=True, format="%.3f"),
+                        },
+                        hide_index=True,
+                        key="edit_equipes_table"
+                    )
                     
-                    if not doublons_trouves:
-                        # Appliquer les modifications
+                    # Bouton pour appliquer les modifications
+                    if st.button("💾 Enregistrer les modifications", use_container_width=True, type="primary"):
+                        # Vérifier les doublons de surnoms
+                        surnoms_uniques = {}
+                        doublons_trouves = False
+                        
                         for idx, row in edited_df.iterrows():
-                            equipe_id = row['ID']
-                            nouveau_surnom = str(row['Surnom']).strip()
-                            
-                            # Mettre à jour dans le DataFrame original
-                            mask = st.session_state.equipes_fixes['ID'] == equipe_id
-                            if mask.any():
-                                if nouveau_surnom and nouveau_surnom != "nan":
-                                    st.session_state.equipes_fixes.loc[mask, 'Surnom'] = nouveau_surnom
-                                else:
-                                    # Si le surnom est vide, remettre l'ID par défaut
-                                    st.session_state.equipes_fixes.loc[mask, 'Surnom'] = equipe_id
+                            surnom = str(row['Surnom']).strip()
+                            if surnom and surnom != "nan":
+                                if surnom in surnoms_uniques:
+                                    st.error(f"❌ Le surnom '{surnom}' est utilisé par plusieurs équipes!")
+                                    doublons_trouves = True
+                                    break
+                                surnoms_uniques[surnom] = row['ID']
                         
-                        st.success("✅ Modifications enregistrées!")
-                        st.rerun()
-                
-                # Section suppression
-                st.subheader("🗑️ Suppression d'équipes")
-                
-                # Créer une liste pour la sélection
-                options_suppression = {}
-                for idx, eq in st.session_state.equipes_fixes.iterrows():
-                    nom_affichage = get_nom_affichage_equipe(eq)
-                    options_suppression[f"{eq['ID']}"] = f"{nom_affichage} ({eq['J1']} & {eq['J2']})"
-                
-                if options_suppression:
-                    equipes_a_supprimer = st.multiselect(
-                        "Sélectionnez les équipes à supprimer:",
-                        options=list(options_suppression.keys()),
-                        format_func=lambda x: options_suppression[x]
-                    )
+                        if not doublons_trouves:
+                            # Appliquer les modifications
+                            for idx, row in edited_df.iterrows():
+                                equipe_id = row['ID']
+                                nouveau_surnom = str(row['Surnom']).strip()
+                                
+                                # Mettre à jour dans le DataFrame original
+                                mask = st.session_state.equipes_fixes['ID'] == equipe_id
+                                if mask.any():
+                                    if nouveau_surnom and nouveau_surnom != "nan":
+                                        st.session_state.equipes_fixes.loc[mask, 'Surnom'] = nouveau_surnom
+                                    else:
+                                        # Si le surnom est vide, remettre l'ID par défaut
+                                        st.session_state.equipes_fixes.loc[mask, 'Surnom'] = equipe_id
+                            
+                            if incrementer_version_etat("equipes_fixes"):
+                                st.success("✅ Modifications enregistrées!")
+                                st.rerun()
+                    
+                    # Section suppression
+                    st.subheader("🗑️ Suppression d'équipes")
+                    
+                    # Créer une liste pour la sélection
+                    options_suppression = {}
+                    for idx, eq in st.session_state.equipes_fixes.iterrows():
+                        nom_affichage = get_nom_affichage_equipe(eq)
+                        options_suppression[f"{eq['ID']}"] = f"{nom_affichage} ({eq['J1']} & {eq['J2']})"
                     
-                    if equipes_a_supprimer and st.button("🗑️ Supprimer les équipes sélectionnées", type="secondary"):
-                        # Vérifier si les équipes sont dans des matchs
-                        equipes_dans_matchs = []
-                        for equipe_id in equipes_a_supprimer:
-                            if not st.session_state.matchs.empty:
-                                est_dans_match = any(
-                                    (st.session_state.matchs['Equipe A'] == equipe_id) |
-                                    (st.session_state.matchs['Equipe B'] == equipe_id)
-                                )
-                                if est_dans_match:
-                                    equipes_dans_matchs.append(equipe_id)
+                    if options_suppression:
+                        equipes_a_supprimer = st.multiselect(
+                            "Sélectionnez les équipes à supprimer:",
+                            options=list(options_suppression.keys()),
+                            format_func=lambda x: options_suppression[x]
+                        )
                         
-                        if equipes_dans_matchs:
-                            st.error(f"❌ Impossible de supprimer: {', '.join(equipes_dans_matchs)} - déjà dans un match")
-                        else:
-                            # Supprimer les équipes
-                            st.session_state.equipes_fixes = st.session_state.equipes_fixes[
-                                ~st.session_state.equipes_fixes['ID'].isin(equipes_a_supprimer)
-                            ]
-                            st.success(f"✅ {len(equipes_a_supprimer)} équipe(s) supprimée(s)!")
-                            st.rerun()
+                        if equipes_a_supprimer and st.button("🗑️ Supprimer les équipes sélectionnées", type="secondary"):
+                            # Vérifier si les équipes sont dans des matchs
+                            equipes_dans_matchs = []
+                            for equipe_id in equipes_a_supprimer:
+                                if not get_matchs().empty:
+                                    est_dans_match = any(
+                                        (get_matchs()['Equipe A'] == equipe_id) |
+                                        (get_matchs()['Equipe B'] == equipe_id)
+                                    )
+                                    if est_dans_match:
+                                        equipes_dans_matchs.append(equipe_id)
+                            
+                            if equipes_dans_matchs:
+                                st.error(f"❌ Impossible de supprimer: {', '.join(equipes_dans_matchs)} - déjà dans un match")
+                            else:
+                                # Supprimer les équipes
+                                st.session_state.equipes_fixes = st.session_state.equipes_fixes[
+                                    ~st.session_state.equipes_fixes['ID'].isin(equipes_a_supprimer)
+                                ]
+                                if incrementer_version_etat("equipes_fixes"):
+                                    st.success(f"✅ {len(equipes_a_supprimer)} équipe(s) supprimée(s)!")
+                                    st.rerun()
+                    else:
+                        st.info("Aucune équipe à supprimer")
+                
                 else:
-                    st.info("Aucune équipe à supprimer")
+                    # Mode joueur : affichage simple
+                    df_display = st.session_state.equipes_fixes.copy()
+                    df_display['Affichage'] = df_display.apply(
+                        lambda row: f"{get_nom_affichage_equipe(row)} ({row['J1']} & {row['J2']})", 
+                        axis=1
+                    )
+                    st.dataframe(df_display[['Affichage', 'Cat1', 'Cat2', 'Coeff']], 
+                               use_container_width=True, hide_index=True)
             
             else:
-                # Mode joueur : affichage simple
-                df_display = st.session_state.equipes_fixes.copy()
-                df_display['Affichage'] = df_display.apply(
-                    lambda row: f"{get_nom_affichage_equipe(row)} ({row['J1']} & {row['J2']})", 
-                    axis=1
-                )
-                st.dataframe(df_display[['Affichage', 'Cat1', 'Cat2', 'Coeff']], 
-                           use_container_width=True, hide_index=True)
-        
-        else:
-            st.info("Aucune équipe créée. Générez des équipes pour commencer.")
-    
-    else:  # Mode Individuel
-        st.info("🎯 **Mode Individuel**: Les équipes sont regénérées à chaque round.")
+                st.info("Aucune équipe créée. Générez des équipes pour commencer.")
         
-        # Affichage des équipes du dernier round
-        equipes_actuelles = get_equipes_actuelles()
-        if not equipes_actuelles.empty:
-            st.subheader(f"Équipes du Round {get_current_round()}")
+        else:  # Mode Individuel
+            st.info("🎯 **Mode Individuel**: Les équipes sont regénérées à chaque round.")
             
-            # Pour le mode individuel, on peut aussi permettre de modifier les surnoms
-            if est_organisateur():
-                df_display = equipes_actuelles.copy()
-                
-                edited_df = st.data_editor(
-                    df_display,
-                    use_container_width=True,
-                    column_config={
-                        "ID": st.column_config.TextColumn("ID", disabled=True),
-                        "Surnom": st.column_config.TextColumn(
-                            "Surnom",
-                            help="Modifiez le surnom de l'équipe",
-                            required=False
-                        ),
-                        "J1": st.column_config.TextColumn("Joueur 1", disabled=True),
-                        "Cat1": st.column_config.TextColumn("Cat1", disabled=True),
-                        "J2": st.column_config.TextColumn("Joueur 2", disabled=True),
-                        "Cat2": st.column_config.TextColumn("Cat2", disabled=True),
-                        "Coeff": st.column_config.NumberColumn("Coeff", disabled=True, format="%.3f"),
-                    },
-                    hide_index=True,
-                    key="edit_equipes_individuel_table"
-                )
+            # Affichage des équipes du dernier round
+            equipes_actuelles = get_equipes_actuelles()
+            if not equipes_actuelles.empty:
+                st.subheader(f"Équipes du Round {get_current_round()}")
                 
-                # Bouton pour appliquer les modifications
-                if st.button("💾 Enregistrer les modifications", use_container_width=True, type="primary"):
-                    # Mettre à jour dans l'historique
-                    round_actuel = get_current_round()
-                    for idx, row in edited_df.iterrows():
-                        equipe_id = row['ID']
-                        nouveau_surnom = str(row['Surnom']).strip()
-                        
+                # Pour le mode individuel, on peut aussi permettre de modifier les surnoms
+                if est_organisateur():
+                    df_display = equipes_actuelles.copy()
+                    
+                    edited_df = st.data_editor(
+                        df_display,
+                        use_container_width=True,
+                        column_config={
+                            "ID": st.column_config.TextColumn("ID", disabled=True),
+                            "Surnom": st.column_config.TextColumn(
+                                "Surnom",
+                                help="Modifiez le surnom de l'équipe",
+                                required=False
+                            ),
+                            "J1": st.column_config.TextColumn("Joueur 1", disabled=True),
+                            "Cat1": st.column_config.TextColumn("Cat1", disabled=True),
+                            "J2": st.column_config.TextColumn("Joueur 2", disabled=True),
+                            "Cat2": st.column_config.TextColumn("Cat2", disabled=True),
+                            "Coeff": st.column_config.NumberColumn("Coeff", disabled=True, format="%.3f"),
+                        },
+                        hide_index=True,
+                        key="edit_equipes_individuel_table"
+                    )
+                    
+                    # Bouton pour appliquer les modifications
+                    if st.button("💾 Enregistrer les modifications", use_container_width=True, type="primary"):
                         # Mettre à jour dans l'historique
-                        mask = (st.session_state.historique_equipes['Round'] == round_actuel) & \
-                               (st.session_state.historique_equipes['ID'] == equipe_id)
+                        round_actuel = get_current_round()
+                        for idx, row in edited_df.iterrows():
+                            equipe_id = row['ID']
+                            nouveau_surnom = str(row['Surnom']).strip()
+                            
+                            # Mettre à jour dans l'historique
+                            mask = (st.session_state.historique_equipes['Round'] == round_actuel) & \
+                                   (st.session_state.historique_equipes['ID'] == equipe_id)
+                            
+                            if mask.any():
+                                if nouveau_surnom and nouveau_surnom != "nan":
+                                    st.session_state.historique_equipes.loc[mask, 'Surnom'] = nouveau_surnom
+                                else:
+                                    st.session_state.historique_equipes.loc[mask, 'Surnom'] = equipe_id
                         
-                        if mask.any():
-                            if nouveau_surnom and nouveau_surnom != "nan":
-                                st.session_state.historique_equipes.loc[mask, 'Surnom'] = nouveau_surnom
-                            else:
-                                st.session_state.historique_equipes.loc[mask, 'Surnom'] = equipe_id
-                    
-                    st.success("✅ Modifications enregistrées!")
-                    st.rerun()
+                        if incrementer_version_etat("historique_equipes"):
+                            st.success("✅ Modifications enregistrées!")
+                            st.rerun()
+                else:
+                    st.dataframe(equipes_actuelles, use_container_width=True, hide_index=True)
+                
+                # Historique des équipes
+                with st.expander("📜 Historique des équipes par round"):
+                    if not st.session_state.historique_equipes.empty:
+                        for round_num in sorted(st.session_state.historique_equipes["Round"].unique()):
+                            st.write(f"**Round {round_num}**")
+                            df_round = st.session_state.historique_equipes[
+                                st.session_state.historique_equipes["Round"] == round_num
+                            ].drop(columns=["Round"])
+                            st.dataframe(df_round, use_container_width=True, hide_index=True)
             else:
-                st.dataframe(equipes_actuelles, use_container_width=True, hide_index=True)
+                st.info("💡 Aucun round n'a encore été généré. Créez un premier round dans l'onglet Matchs.")
+        
+        # SECTION EXPORTATION (garder cette partie inchangée)
+        if est_organisateur():
+            st.divider()
+            st.subheader("📤 Exportation des données d'équipes")
             
-            # Historique des équipes
-            with st.expander("📜 Historique des équipes par round"):
-                if not st.session_state.historique_equipes.empty:
-                    for round_num in sorted(st.session_state.historique_equipes["Round"].unique()):
-                        st.write(f"**Round {round_num}**")
-                        df_round = st.session_state.historique_equipes[
-                            st.session_state.historique_equipes["Round"] == round_num
-                        ].drop(columns=["Round"])
-                        st.dataframe(df_round, use_container_width=True, hide_index=True)
-        else:
-            st.info("💡 Aucun round n'a encore été généré. Créez un premier round dans l'onglet Matchs.")
-    
-    # SECTION EXPORTATION (garder cette partie inchangée)
-    if est_organisateur():
-        st.divider()
-        st.subheader("📤 Exportation des données d'équipes")
+            col_exp_eq1, col_exp_eq2, col_exp_eq3 = st.columns(3)
+            
+            with col_exp_eq1:
+                # Export PDF équipes actuelles
+                equipes_actuelles = get_equipes_actuelles()
+                if not equipes_actuelles.empty:
+                    bouton_export(
+                        "equipes_actuelles_pdf",
+                        "📄 PDF Équipes actuelles",
+                        exporter_equipes_actuelles_pdf,
+                        f"equipes_actuelles_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Équipes actuelles", disabled=True, use_container_width=True)
+            
+            with col_exp_eq2:
+                # Export PDF historique (mode individuel)
+                if st.session_state.mode_tournoi == "Individuel" and not st.session_state.historique_equipes.empty:
+                    bouton_export(
+                        "historique_equipes_pdf",
+                        "📄 PDF Historique équipes",
+                        exporter_historique_equipes_pdf,
+                        f"historique_equipes_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Historique équipes", disabled=True, 
+                             help="Disponible uniquement en mode Individuel avec historique", 
+                             use_container_width=True)
+            
+            with col_exp_eq3:
+                # Export Excel complet
+                equipes_actuelles = get_equipes_actuelles()
+                if not equipes_actuelles.empty or not st.session_state.historique_equipes.empty or not st.session_state.equipes_fixes.empty:
+                    bouton_export(
+                        "equipes_complet_xlsx",
+                        "📊 Excel Complet équipes",
+                        exporter_equipes_complet_xlsx,
+                        f"equipes_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                else:
+                    st.button("📊 Excel Complet équipes", disabled=True, use_container_width=True)
+                    
+    # Onglet 3: Matchs
+    with tabs[2], mesurer("Onglet Matchs"):
+        st.header("🏸 Gestion des Matchs")
         
-        col_exp_eq1, col_exp_eq2, col_exp_eq3 = st.columns(3)
+        # Boutons de génération
+        col_btn1, col_btn2, col_btn3 = st.columns(3)
         
-        with col_exp_eq1:
-            # Export PDF équipes actuelles
-            equipes_actuelles = get_equipes_actuelles()
-            if not equipes_actuelles.empty:
-                pdf_equipes = exporter_equipes_actuelles_pdf()
-                st.download_button(
-                    "📄 PDF Équipes actuelles",
-                    pdf_equipes,
-                    f"equipes_actuelles_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True
-                )
-            else:
-                st.button("📄 PDF Équipes actuelles", disabled=True, use_container_width=True)
-        
-        with col_exp_eq2:
-            # Export PDF historique (mode individuel)
-            if st.session_state.mode_tournoi == "Individuel" and not st.session_state.historique_equipes.empty:
-                pdf_historique = exporter_historique_equipes_pdf()
-                st.download_button(
-                    "📄 PDF Historique équipes",
-                    pdf_historique,
-                    f"historique_equipes_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True
-                )
+        with col_btn1:
+            disabled = not est_organisateur()
+            
+            if st.session_state.mode_tournoi == "Classique":
+                if st.session_state.equipes_fixes.empty or len(st.session_state.equipes_fixes) < 2:
+                    disabled = True
+                    st.caption("⚠️ Besoin d'au moins 2 équipes")
             else:
-                st.button("📄 PDF Historique équipes", disabled=True, 
-                         help="Disponible uniquement en mode Individuel avec historique", 
-                         use_container_width=True)
+                if len(st.session_state.joueurs) < 2:
+                    disabled = True
+                    st.caption("⚠️ Besoin d'au moins 2 joueurs")
+            
+            if st.button("🎲 Nouveau Round", use_container_width=True, disabled=disabled):
+                generer_round()
+                st.rerun()
         
-        with col_exp_eq3:
-            # Export Excel complet
-            equipes_actuelles = get_equipes_actuelles()
-            if not equipes_actuelles.empty or not st.session_state.historique_equipes.empty or not st.session_state.equipes_fixes.empty:
-                xlsx_equipes = exporter_equipes_complet_xlsx()
-                st.download_button(
-                    "📊 Excel Complet équipes",
-                    xlsx_equipes,
-                    f"equipes_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
+        with col_btn2:
+            if st.session_state.mode_tournoi == "Individuel" and est_organisateur():
+                if st.button("🔚 Générer derniers rounds", use_container_width=True,
+                            type="secondary", help="Génère les rounds nécessaires pour équilibrer les matchs joués"):
+                    generer_derniers_rounds()
+                    st.rerun()
             else:
-                st.button("📊 Excel Complet équipes", disabled=True, use_container_width=True)
+                st.button("🔚 Générer derniers rounds", use_container_width=True, disabled=True,
+                         help="Disponible uniquement en mode Individuel")
+        
+        with col_btn3:
+            if not get_matchs().empty and est_organisateur():
+                if st.session_state.get("show_popup_matchs_simple", False):
+                    st.warning("⚠️ ATTENTION : Réinitialisation des matchs")
+                    st.error("Cette action va supprimer TOUS les matchs joués. Les équipes et joueurs seront conservés.")
                 
-# Onglet 3: Matchs
-with tabs[2]:
-    st.header("🏸 Gestion des Matchs")
-    
-    # Boutons de génération
-    col_btn1, col_btn2, col_btn3 = st.columns(3)
-    
-    with col_btn1:
-        disabled = not est_organisateur()
-        
-        if st.session_state.mode_tournoi == "Classique":
-            if st.session_state.equipes_fixes.empty or len(st.session_state.equipes_fixes) < 2:
-                disabled = True
-                st.caption("⚠️ Besoin d'au moins 2 équipes")
-        else:
-            if len(st.session_state.joueurs) < 2:
-                disabled = True
-                st.caption("⚠️ Besoin d'au moins 2 joueurs")
-        
-        if st.button("🎲 Nouveau Round", use_container_width=True, disabled=disabled):
-            generer_round()
-            st.rerun()
-    
-    with col_btn2:
-        if st.session_state.mode_tournoi == "Individuel" and est_organisateur():
-            if st.button("🔚 Générer derniers rounds", use_container_width=True,
-                        type="secondary", help="Génère les rounds nécessaires pour équilibrer les matchs joués"):
-                generer_derniers_rounds()
-                st.rerun()
-        else:
-            st.button("🔚 Générer derniers rounds", use_container_width=True, disabled=True,
-                     help="Disponible uniquement en mode Individuel")
-    
-    with col_btn3:
-        if not st.session_state.matchs.empty and est_organisateur():
-            if st.session_state.get("show_popup_matchs_simple", False):
-                st.warning("⚠️ ATTENTION : Réinitialisation des matchs")
-                st.error("Cette action va supprimer TOUS les matchs joués. Les équipes et joueurs seront conservés.")
-            
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("✅ Oui, réinitialiser les matchs", use_container_width=True, type="primary"):
-                        reinitialiser_matchs_simple_avec_confirmation()
-                        st.rerun()
-                with col2:
-                    if st.button("❌ Annuler", use_container_width=True):
-                        st.session_state["show_popup_matchs_simple"] = False
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if st.button("✅ Oui, réinitialiser les matchs", use_container_width=True, type="primary"):
+                            reinitialiser_matchs_simple_avec_confirmation()
+                            st.rerun()
+                    with col2:
+                        if st.button("❌ Annuler", use_container_width=True):
+                            st.session_state["show_popup_matchs_simple"] = False
+                            st.rerun()
+                else:
+                    if st.button("🔄 Réinitialiser matchs", use_container_width=True, type="secondary"):
+                        st.session_state["show_popup_matchs_simple"] = True
                         st.rerun()
-            else:
-                if st.button("🔄 Réinitialiser matchs", use_container_width=True, type="secondary"):
-                    st.session_state["show_popup_matchs_simple"] = True
-                    st.rerun()
-    
-    # Informations sur le round actuel
-    st.write(f"**Round actuel:** {get_current_round()}")
-    
-    # Affichage des matchs
-    if not st.session_state.matchs.empty:
-        st.subheader("📋 Matchs en cours")
-        
-        # Créer une copie pour l'affichage
-        matchs_display = st.session_state.matchs_detail.copy()
         
-        # Ajouter les surnoms des équipes
-        for idx, match in matchs_display.iterrows():
-            # Équipe A
-            if st.session_state.mode_tournoi == "Classique":
-                eq_a = st.session_state.equipes_fixes[
-                    st.session_state.equipes_fixes["ID"] == match["Equipe_A_ID"]
-                ]
-                if not eq_a.empty:
-                    matchs_display.at[idx, "Equipe_A_Display"] = get_nom_affichage_equipe(eq_a.iloc[0])
-                else:
-                    matchs_display.at[idx, "Equipe_A_Display"] = match["Equipe_A_ID"]
-            else:
-                # Mode Individuel
-                round_num = match["Round"]
-                equipes_round = get_equipes_par_round(round_num)
-                if not equipes_round.empty:
-                    eq_a = equipes_round[equipes_round["ID"] == match["Equipe_A_ID"]]
-                    if not eq_a.empty:
-                        matchs_display.at[idx, "Equipe_A_Display"] = get_nom_affichage_equipe(eq_a.iloc[0])
+        # Enchaînement continu: état des terrains et lancement des terrains libres
+        if st.session_state.enchainement_continu:
+            _, en_cours = get_etat_terrains()
+            nb_libres = sum(1 for numero in range(1, st.session_state.nb_terrains + 1) if f"T{numero}" not in en_cours)
+            col_cont1, col_cont2 = st.columns([2, 1])
+            with col_cont1:
+                st.info(f"⏩ **Enchaînement continu**: {st.session_state.nb_terrains - nb_libres}/{st.session_state.nb_terrains} "
+                        f"terrain(s) occupé(s). Un nouveau match est lancé dès qu'un score est saisi.")
+            with col_cont2:
+                if st.button("▶️ Remplir les terrains libres", use_container_width=True,
+                             disabled=not est_organisateur() or nb_libres == 0):
+                    nb_lances = remplir_terrains_libres()
+                    if not nb_lances:
+                        st.warning("Pas assez de joueurs ou d'équipes libres pour lancer un match")
                     else:
-                        matchs_display.at[idx, "Equipe_A_Display"] = match["Equipe_A_ID"]
-                else:
-                    matchs_display.at[idx, "Equipe_A_Display"] = match["Equipe_A_ID"]
-            
-            # Équipe B
-            if st.session_state.mode_tournoi == "Classique":
-                eq_b = st.session_state.equipes_fixes[
-                    st.session_state.equipes_fixes["ID"] == match["Equipe_B_ID"]
-                ]
-                if not eq_b.empty:
-                    matchs_display.at[idx, "Equipe_B_Display"] = get_nom_affichage_equipe(eq_b.iloc[0])
+                        st.rerun()
+        
+        # Planning de la journée (mode classique)
+        if st.session_state.mode_tournoi == "Classique" and len(st.session_state.equipes_fixes) >= 2:
+            with st.expander("📅 Planning de la journée"):
+                planning = st.session_state.planning_classique
+                if planning_a_jour():
+                    prochain = get_current_round() + 1 - planning["premier_round"]
+                    restants = min(max(len(planning["rounds"]) - prochain, 0), len(planning["rounds"]))
+                    st.write(f"**{len(planning['rounds'])} rounds planifiés** à partir du round {planning['premier_round']} "
+                             f"({restants} restant(s))")
+                    if get_round_planifie(get_current_round() + 1) is None:
+                        st.caption("ℹ️ Le prochain round n'est pas dans le planning: il sera généré à la demande")
+                elif planning:
+                    st.warning("⚠️ Planning obsolète (équipes, nombre de terrains ou matchs modifiés, rencontres jouées hors planning): les rounds sont générés à la demande")
                 else:
-                    matchs_display.at[idx, "Equipe_B_Display"] = match["Equipe_B_ID"]
-            else:
-                # Mode Individuel
-                round_num = match["Round"]
-                equipes_round = get_equipes_par_round(round_num)
-                if not equipes_round.empty:
-                    eq_b = equipes_round[equipes_round["ID"] == match["Equipe_B_ID"]]
-                    if not eq_b.empty:
-                        matchs_display.at[idx, "Equipe_B_Display"] = get_nom_affichage_equipe(eq_b.iloc[0])
+                    st.info("Aucun planning: les rounds sont générés à la demande")
+                
+                col_plan1, col_plan2 = st.columns(2)
+                with col_plan1:
+                    nb_rounds_planning = st.number_input("Nombre de rounds (0 = toutes les rencontres)",
+                                                         min_value=0, max_value=200, value=0,
+                                                         disabled=not est_organisateur())
+                    if st.button("📅 Planifier la journée", use_container_width=True, disabled=not est_organisateur()):
+                        nb_planifies = planifier_journee(nb_rounds_planning)
+                        if incrementer_version_etat("planning_classique"):
+                            st.success(f"✅ {nb_planifies} rounds planifiés!")
+                            st.rerun()
+                with col_plan2:
+                    if planning_a_jour():
+                        bouton_export(
+                            "planning_pdf",
+                            "📄 PDF Planning de la journée",
+                            exporter_planning_pdf,
+                            f"planning_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                            "application/pdf"
+                        )
                     else:
-                        matchs_display.at[idx, "Equipe_B_Display"] = match["Equipe_B_ID"]
-                else:
-                    matchs_display.at[idx, "Equipe_B_Display"] = match["Equipe_B_ID"]
+                        st.button("📄 PDF Planning de la journée", disabled=True, use_container_width=True)
         
-        # Sélectionner les colonnes à afficher
-        display_cols = ["Round", "Terrain", "Type", "Equipe_A_Display", "J1_A", "J2_A", 
-                       "Score_A", "Score_B", "Equipe_B_Display", "J1_B", "J2_B"]
-        
-        if "Jokers" in matchs_display.columns:
-            display_cols.append("Jokers")
-        
-        matchs_display = matchs_display[display_cols]
-        matchs_display = matchs_display.rename(columns={
-            "Equipe_A_Display": "Équipe A",
-            "Equipe_B_Display": "Équipe B",
-            "Score_A": "Score A",
-            "Score_B": "Score B"
-        })
-        
-        # Éditeur de scores - VERSION CORRIGÉE
+        # Liens des pages de saisie au bord des terrains (dernier match programmé sur chaque terrain)
         if est_organisateur():
-            # Créer une copie pour éviter les modifications directes
-            display_df = matchs_display.copy()
-            
-            # Utiliser un formulaire pour regrouper les modifications
-            with st.form("scores_form"):
-                edited_df = st.data_editor(
-                    display_df,
-                    use_container_width=True,
-                    column_config={
-                        "Round": st.column_config.NumberColumn("Round", disabled=True),
-                        "Terrain": st.column_config.TextColumn("Terrain", disabled=True),
-                        "Type": st.column_config.TextColumn("Type", disabled=True),
-                        "Équipe A": st.column_config.TextColumn("Équipe A", disabled=True),
-                        "J1_A": st.column_config.TextColumn("J1 A", disabled=True),
-                        "J2_A": st.column_config.TextColumn("J2 A", disabled=True),
-                        "Score A": st.column_config.NumberColumn(
-                            "Score A", 
-                            min_value=0, 
-                            max_value=100,
-                            step=1,
-                            required=True
-                        ),
-                        "Score B": st.column_config.NumberColumn(
-                            "Score B", 
-                            min_value=0, 
-                            max_value=100,
-                            step=1,
-                            required=True
-                        ),
-                        "Équipe B": st.column_config.TextColumn("Équipe B", disabled=True),
-                        "J1_B": st.column_config.TextColumn("J1 B", disabled=True),
-                        "J2_B": st.column_config.TextColumn("J2 B", disabled=True),
-                        "Jokers": st.column_config.TextColumn("Jokers", disabled=True)
-                    },
-                    hide_index=True,
-                    # Clé basée sur un hash des données pour éviter les conflits
-                    key=f"matchs_editor_{hash(str(matchs_display.values.tobytes()))}"
-                )
-                
-                submitted = st.form_submit_button("💾 Enregistrer les scores", use_container_width=True)
-                
-                if submitted:
-                    # Mettre à jour les scores dans session_state
-                    for idx, row in edited_df.iterrows():
-                        # Trouver l'index correspondant dans matchs_detail
-                        detail_idx = st.session_state.matchs_detail[
-                            (st.session_state.matchs_detail["Round"] == row["Round"]) &
-                            (st.session_state.matchs_detail["Terrain"] == row["Terrain"])
-                        ].index
-                        
-                        if len(detail_idx) > 0:
-                            detail_idx = detail_idx[0]
-                            st.session_state.matchs_detail.at[detail_idx, "Score_A"] = row["Score A"]
-                            st.session_state.matchs_detail.at[detail_idx, "Score_B"] = row["Score B"]
-                            
-                            # Mettre à jour les matchs simplifiés
-                            match_idx = st.session_state.matchs[
-                                (st.session_state.matchs["Round"] == row["Round"]) &
-                                (st.session_state.matchs["Terrain"] == row["Terrain"])
-                            ].index
-                            
-                            if len(match_idx) > 0:
-                                st.session_state.matchs.at[match_idx[0], "Score A"] = row["Score A"]
-                                st.session_state.matchs.at[match_idx[0], "Score B"] = row["Score B"]
-                    
-                    st.success("✅ Scores enregistrés!")
-                    st.rerun()
-        else:
-            # Mode joueur - affichage simple
-            st.dataframe(matchs_display, use_container_width=True, hide_index=True)
-    else:
-        st.info("Aucun match programmé. Générez un premier round!")
-
-    # Ajouter la section Exportation
-    if not st.session_state.matchs_detail.empty:
-        st.divider()
-        st.subheader("📤 Exportation des matchs")
-        
-        col_exp_m1, col_exp_m2, col_exp_m3 = st.columns(3)
-        
-        with col_exp_m1:
-            # Export PDF matchs en cours
-            pdf_en_cours = exporter_matchs_en_cours_pdf()
-            st.download_button(
-                "📄 PDF Matchs en cours",
-                pdf_en_cours,
-                f"matchs_en_cours_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                "application/pdf",
-                use_container_width=True
-            )
-        
-        with col_exp_m2:
-            # Export PDF tous les matchs
-            pdf_tous = exporter_tous_matchs_pdf()
-            st.download_button(
-                "📄 PDF Tous les matchs",
-                pdf_tous,
-                f"matchs_tous_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                "application/pdf",
-                use_container_width=True
-            )
-        
-        with col_exp_m3:
-            # Export Excel complet
-            xlsx_matchs = exporter_matchs_complet_xlsx()
-            st.download_button(
-                "📊 Excel Complet matchs",
-                xlsx_matchs,
-                f"matchs_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+            with st.expander("📱 Saisie des scores au bord des terrains"):
+                st.caption("Chaque lien ouvre une page allégée où les joueurs saisissent le score de leur match")
+                st.markdown(" • ".join(
+                    f"[Terrain {numero}](?tournoi={st.session_state.tournoi}&terrain=T{numero})"
+                    for numero in range(1, st.session_state.nb_terrains + 1)
+                ))
+        
+        # Informations sur le round actuel
+        st.write(f"**Round actuel:** {get_current_round()}")
+        
+        # Affichage des matchs
+        if not get_matchs().empty:
+            st.subheader("📋 Matchs en cours")
             
-# Onglet 4: Statistiques
-with tabs[3]:
-    st.header("📊 Statistiques du Tournoi")
-    
-    if st.session_state.mode_tournoi == "Individuel":
-        st.info("🎯 **Mode Individuel**: Statistiques d'équilibre des matchs joués")
-        
-        # Statistiques d'équilibre
-        st.subheader("⚖️ Équilibre des matchs joués")
-        df_stats = afficher_statistiques_equilibre()
-        
-        if df_stats is not None and not df_stats.empty:
-            st.dataframe(df_stats, use_container_width=True)
+            with mesurer("Tableau des matchs"):
+                # Noms d'affichage des équipes, recalculés seulement quand l'état du tournoi change
+                matchs_display = get_matchs_affichage()
             
-            # Graphique de distribution
-            st.subheader("📈 Distribution des matchs joués")
-            chart_data = df_stats.set_index("Joueur")["Matchs Joués"]
-            st.bar_chart(chart_data)
-            
-            # Analyse des retards
-            joueurs_en_retard, max_matchs, retards = analyser_retards_joueurs()
+            # Seuls les rounds choisis sont envoyés à l'éditeur: les derniers rounds, ou une page de l'historique
+            col_vue, col_rounds = st.columns([2, 1])
+            with col_vue:
+                vue_matchs = st.radio("Afficher:", ["Rounds en cours", "Historique"], horizontal=True, key="vue_matchs")
+            round_actuel = get_current_round()
+            with col_rounds:
+                if vue_matchs == "Rounds en cours":
+                    nb_rounds_fenetre = st.number_input(
+                        "Derniers rounds:", min_value=1, value=NB_ROUNDS_FENETRE_MATCHS, key="fenetre_matchs"
+                    )
+                    # Les matchs encore sans score restent affichés (enchaînement continu, retards)
+                    masque_rounds = (
+                        (matchs_display["Round"] > round_actuel - nb_rounds_fenetre)
+                        | ((matchs_display["Score A"] == 0) & (matchs_display["Score B"] == 0))
+                    )
+                    selection_matchs = f"fenetre-{nb_rounds_fenetre}"
+                else:
+                    pages = [(debut, min(debut + NB_ROUNDS_PAR_PAGE - 1, round_actuel))
+                             for debut in range(1, round_actuel + 1, NB_ROUNDS_PAR_PAGE)]
+                    premier, dernier = st.selectbox(
+                        "Rounds:", pages[::-1], format_func=lambda page: f"{page[0]} à {page[1]}", key="page_matchs"
+                    )
+                    masque_rounds = matchs_display["Round"].between(premier, dernier)
+                    selection_matchs = f"page-{premier}"
+            matchs_display = matchs_display[masque_rounds]
+            st.caption(f"{len(matchs_display)} match(s) affiché(s) sur {len(masque_rounds)}")
             
-            if joueurs_en_retard:
-                st.warning(f"⚠️ {len(joueurs_en_retard)} joueur(s) ont un retard")
-                
-                col_ret1, col_ret2 = st.columns(2)
-                with col_ret1:
-                    st.write("**Joueurs les plus en retard:**")
-                    for joueur in joueurs_en_retard[:5]:
-                        st.write(f"- {joueur}: {retards[joueur]['matchs']} matchs (retard: {retards[joueur]['retard']})")
+            # Éditeur de scores - VERSION CORRIGÉE
+            if est_organisateur():
+                # Créer une copie pour éviter les modifications directes
+                with mesurer("Tableau des matchs"):
+                    display_df = matchs_display.copy()
                 
-                with col_ret2:
-                    st.write("**Recommandations:**")
-                    if len(joueurs_en_retard) > 0:
-                        rounds_needed = max(retards[j]['retard'] for j in joueurs_en_retard)
-                        st.write(f"- {rounds_needed} round(s) de rattrapage nécessaire(s)")
-                        st.write(f"- {len(joueurs_en_retard)} joueur(s) à rattraper")
-            else:
-                st.success("✅ Tous les joueurs ont le même nombre de matchs!")
-    
-    # Statistiques générales
-    st.subheader("📊 Statistiques générales")
-    
-    col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
-    
-    with col_stat1:
-        st.metric("Joueurs inscrits", len(st.session_state.joueurs))
-    
-    with col_stat2:
-        if st.session_state.mode_tournoi == "Classique":
-            if not st.session_state.equipes_fixes.empty:
-                st.metric("Équipes", len(st.session_state.equipes_fixes))
-            else:
-                st.metric("Équipes", 0)
-        else:
-            equipes_actuelles = get_equipes_actuelles()
-            if not equipes_actuelles.empty:
-                st.metric("Équipes actuelles", len(equipes_actuelles))
-            else:
-                st.metric("Équipes actuelles", 0)
-    
-    with col_stat3:
-        if not st.session_state.matchs.empty:
-            st.metric("Matchs joués", len(st.session_state.matchs))
-        else:
-            st.metric("Matchs joués", 0)
-    
-    with col_stat4:
-        st.metric("Rounds joués", get_current_round())
-
- # Ajouter la section Exportation
-    if est_organisateur():
-        st.divider()
-        st.subheader("📤 Exportation des statistiques")
-        
-        col_exp_s1, col_exp_s2 = st.columns(2)
-        
-        with col_exp_s1:
-            # Export PDF statistiques
-            pdf_stats = exporter_statistiques_pdf()
-            st.download_button(
-                "📄 PDF Statistiques",
-                pdf_stats,
-                f"statistiques_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                "application/pdf",
-                use_container_width=True
-            )
-        
-        with col_exp_s2:
-            # Export Excel statistiques
-            xlsx_stats = exporter_statistiques_xlsx()
-            st.download_button(
-                "📊 Excel Statistiques",
-                xlsx_stats,
-                f"statistiques_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
-
-# Onglet 5: Classements
-with tabs[4]:
-    st.header("🏆 Classements")
-    
-    # Initialiser les variables pour éviter l'erreur
-    df_classement_indiv = pd.DataFrame()
-    df_classement_eq = pd.DataFrame()
-    
-    # Calculer le classement individuel (toujours disponible)
-    df_classement_indiv = calculer_classement_individuel_avec_jokers()
-    
-    # Sélection du type de classement
-    if st.session_state.mode_tournoi == "Classique":
-        tab_classement = st.selectbox("Type de classement", 
-                                     ["Classement par équipes", "Classement individuel"])
-    else:
-        tab_classement = "Classement individuel"
-        st.info("🎯 **Mode Individuel**: Seul le classement individuel a du sens")
-    
-    if tab_classement == "Classement par équipes" and st.session_state.mode_tournoi == "Classique":
-        st.subheader("🏆 Classement par équipes")
-        
-        if not st.session_state.matchs.empty and not st.session_state.equipes_fixes.empty:
-            # Calculer le classement par équipes
-            stats = []
-            for _, eq in st.session_state.equipes_fixes.iterrows():
-                eid = eq["ID"]
-                m_eq = st.session_state.matchs[
-                    (st.session_state.matchs["Equipe A"] == eid) | 
-                    (st.session_state.matchs["Equipe B"] == eid)
-                ]
+                # La clé ne dépend pas de l'état du tournoi: une modification venue d'une autre session
+                # (saisie au bord du terrain...) ne doit pas effacer les saisies en cours
+                cle_editeur = f"matchs_editor_{selection_matchs}_{st.session_state.nb_enregistrements_scores}"
+                # Les saisies reçues se rapportent (par position) au tableau affiché lors de l'exécution précédente
+                cle_editee, tableau_edite = st.session_state.editeur_matchs or (None, None)
+                st.session_state.editeur_matchs = (cle_editeur, display_df)
                 
-                pm, pe, v, n, d = 0, 0, 0, 0, 0
-                for _, m in m_eq.iterrows():
-                    if m["Score A"] == 0 and m["Score B"] == 0:
-                        continue
-                    
-                    is_a = m["Equipe A"] == eid
-                    ma, sa = (m["Score A"], m["Score B"]) if is_a else (m["Score B"], m["Score A"])
+                # Utiliser un formulaire pour regrouper les modifications
+                with st.form("scores_form"):
+                    st.data_editor(
+                        display_df,
+                        use_container_width=True,
+                        column_config={
+                            "Round": st.column_config.NumberColumn("Round", disabled=True),
+                            "Terrain": st.column_config.TextColumn("Terrain", disabled=True),
+                            "Type": st.column_config.TextColumn("Type", disabled=True),
+                            "Équipe A": st.column_config.TextColumn("Équipe A", disabled=True),
+                            "J1_A": st.column_config.TextColumn("J1 A", disabled=True),
+                            "J2_A": st.column_config.TextColumn("J2 A", disabled=True),
+                            "Score A": st.column_config.NumberColumn(
+                                "Score A", 
+                                min_value=0, 
+                                max_value=100,
+                                step=1,
+                                required=True
+                            ),
+                            "Score B": st.column_config.NumberColumn(
+                                "Score B", 
+                                min_value=0, 
+                                max_value=100,
+                                step=1,
+                                required=True
+                            ),
+                            "Équipe B": st.column_config.TextColumn("Équipe B", disabled=True),
+                            "J1_B": st.column_config.TextColumn("J1 B", disabled=True),
+                            "J2_B": st.column_config.TextColumn("J2 B", disabled=True),
+                            "Jokers": st.column_config.TextColumn("Jokers", disabled=True)
+                        },
+                        hide_index=True,
+                        key=cle_editeur
+                    )
                     
-                    pm += ma
-                    pe += sa
+                    submitted = st.form_submit_button("💾 Enregistrer les scores", use_container_width=True)
                     
-                    if ma > sa:
-                        v += 1
-                    elif ma == sa:
-                        n += 1
-                    else:
-                        d += 1
-                
-                diff = pm - pe
-                if st.session_state.algo_classement == "Pondéré":
-                    score = round(((v * 3) + (n * 1)) * eq["Coeff"], 2)
-                else:
-                    score = (v * 2) + (n * 1)
-                
-                stats.append({
-                    "Équipe": get_nom_affichage_equipe(eq),
-                    "Joueurs": f"{eq['J1']} & {eq['J2']}",
-                    "V": v, "N": n, "D": d,
-                    "PM": pm, "PE": pe, "Diff": diff,
-                    "Points": score
-                })
-            
-            if stats:
-                df_classement_eq = pd.DataFrame(stats).sort_values(by=["Points", "Diff"], ascending=False)
-                df_classement_eq.index = range(1, len(df_classement_eq) + 1)
-                df_classement_eq.index.name = "Rang"
-                
-                st.dataframe(df_classement_eq, use_container_width=True)
+                    if submitted:
+                        # Enregistrer seulement les scores changés par rapport au tableau que l'organisateur a modifié
+                        saisies = st.session_state.get(cle_editeur, {}).get("edited_rows", {}) if cle_editee == cle_editeur else {}
+                        nb_modifies = 0
+                        refuse = False
+                        for position, valeurs in saisies.items():
+                            ligne = tableau_edite.iloc[int(position)]
+                            score_a = valeurs.get("Score A", ligne["Score A"])
+                            score_b = valeurs.get("Score B", ligne["Score B"])
+                            if score_a is None or score_b is None or (score_a, score_b) == (ligne["Score A"], ligne["Score B"]):
+                                continue
+                            id_match = get_id_match(ligne["Round"], ligne["Terrain"])
+                            if id_match is not None:
+                                # Mise à jour du score et des statistiques cumulées par différence
+                                if not modifier_score_match(id_match, score_a, score_b):
+                                    # Session rechargée: les scores suivants seraient saisis sur un autre tableau
+                                    refuse = True
+                                    break
+                                nb_modifies += 1
+                        
+                        if nb_modifies:
+                            incrementer_version_etat()
+                            # Enchaînement continu: les terrains libérés repartent aussitôt
+                            if st.session_state.enchainement_continu:
+                                remplir_terrains_libres()
+                            # Éditeur vierge: les saisies enregistrées ne doivent pas être rejouées sur le tableau suivant
+                            st.session_state.nb_enregistrements_scores += 1
+                            st.toast(f"✅ {nb_modifies} score(s) enregistré(s)")
+                            if refuse:
+                                st.toast("⚠️ Tournoi modifié depuis une autre session: les scores suivants sont à ressaisir")
+                            st.rerun()
+                        elif not refuse:
+                            st.info("Aucun score modifié")
             else:
-                st.info("Aucune statistique disponible")
+                # Mode joueur - affichage simple
+                st.dataframe(matchs_display, use_container_width=True, hide_index=True)
         else:
-            st.info("Aucun match joué pour le moment")
-    
-    else:  # Classement individuel
-        st.subheader("👤 Classement individuel")
-        
-        if not df_classement_indiv.empty:
-            # Afficher le classement individuel
-            st.dataframe(df_classement_indiv, use_container_width=True)
-        else:
-            st.info("Aucun match joué pour le moment")
+            st.info("Aucun match programmé. Générez un premier round!")
 
-    # Ajouter la section Exportation (uniquement pour l'organisateur)
-    if est_organisateur():
-        st.divider()
-        st.subheader("📤 Exportation des classements")
-        
-        col_exp_c1, col_exp_c2, col_exp_c3 = st.columns(3)
-        
-        with col_exp_c1:
-            # Export PDF classement équipes (mode classique)
-            # Vérifier qu'on est en mode Classique et qu'il y a des matchs
-            if st.session_state.mode_tournoi == "Classique" and not st.session_state.matchs.empty:
-                pdf_class_eq = exporter_classement_equipes_pdf()
-                st.download_button(
-                    "📄 PDF Classement équipes",
-                    pdf_class_eq,
-                    f"classement_equipes_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True,
-                    key="pdf_classement_eq"
+        # Ajouter la section Exportation
+        if not get_matchs_detail().empty:
+            st.divider()
+            st.subheader("📤 Exportation des matchs")
+            
+            col_exp_m1, col_exp_m2, col_exp_m3 = st.columns(3)
+            
+            with col_exp_m1:
+                # Export PDF matchs en cours
+                bouton_export(
+                    "matchs_en_cours_pdf",
+                    "📄 PDF Matchs en cours",
+                    exporter_matchs_en_cours_pdf,
+                    f"matchs_en_cours_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                    "application/pdf"
                 )
-            else:
-                st.button("📄 PDF Classement équipes", 
-                         disabled=True,
-                         help="Disponible uniquement en mode Classique avec matchs joués",
-                         use_container_width=True,
-                         key="pdf_classement_eq_disabled")
-        
-        with col_exp_c2:
-            # Export PDF classement individuel
-            # Vérifier si le classement individuel existe
-            if not df_classement_indiv.empty:
-                pdf_class_indiv = exporter_classement_individuel_pdf()
-                st.download_button(
-                    "📄 PDF Classement individuel",
-                    pdf_class_indiv,
-                    f"classement_individuel_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
-                    "application/pdf",
-                    use_container_width=True,
-                    key="pdf_classement_indiv"
+            
+            with col_exp_m2:
+                # Export PDF tous les matchs
+                bouton_export(
+                    "tous_matchs_pdf",
+                    "📄 PDF Tous les matchs",
+                    exporter_tous_matchs_pdf,
+                    f"matchs_tous_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                    "application/pdf"
                 )
-            else:
-                st.button("📄 PDF Classement individuel", 
-                         disabled=True,
-                         help="Aucun match joué pour le moment",
-                         use_container_width=True,
-                         key="pdf_classement_indiv_disabled")
-        
-        with col_exp_c3:
-            # Export Excel complet des classements
-            # Vérifier si au moins un classement est disponible
-            has_classement_indiv = not df_classement_indiv.empty
-            has_classement_eq = (st.session_state.mode_tournoi == "Classique" 
-                                and not st.session_state.matchs.empty
-                                and not st.session_state.equipes_fixes.empty)
-            
-            if has_classement_indiv or has_classement_eq:
-                xlsx_class = exporter_classements_complet_xlsx()
-                st.download_button(
-                    "📊 Excel Complet classements",
-                    xlsx_class,
-                    f"classements_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True,
-                    key="excel_classement"
+            
+            with col_exp_m3:
+                # Export Excel complet
+                bouton_export(
+                    "matchs_complet_xlsx",
+                    "📊 Excel Complet matchs",
+                    exporter_matchs_complet_xlsx,
+                    f"matchs_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                 )
-            else:
-                st.button("📊 Excel Complet classements", 
-                         disabled=True,
-                         help="Aucun classement disponible",
-                         use_container_width=True,
-                         key="excel_classement_disabled")
                 
-# Onglet 6: Paramètres
-with tabs[5]:
-    if not est_organisateur():
-        st.warning("🔒 Cette section est réservée à l'organisateur")
-    else:
-        st.header("⚙️ Paramètres du Tournoi")
+    # Onglet 4: Statistiques
+    with tabs[3], mesurer("Onglet Statistiques"):
+        st.header("📊 Statistiques du Tournoi")
         
-        # Configuration de base
-        st.subheader("📝 Configuration générale")
+        if st.session_state.mode_tournoi == "Individuel":
+            st.info("🎯 **Mode Individuel**: Statistiques d'équilibre des matchs joués")
+            
+            # Statistiques d'équilibre
+            st.subheader("⚖️ Équilibre des matchs joués")
+            df_stats = afficher_statistiques_equilibre()
+            
+            if df_stats is not None and not df_stats.empty:
+                st.dataframe(df_stats, use_container_width=True)
+                
+                # Graphique de distribution
+                st.subheader("📈 Distribution des matchs joués")
+                chart_data = df_stats.set_index("Joueur")["Matchs Joués"]
+                st.bar_chart(chart_data)
+                
+                # Analyse des retards
+                joueurs_en_retard, max_matchs, retards = analyser_retards_joueurs()
+                
+                if joueurs_en_retard:
+                    st.warning(f"⚠️ {len(joueurs_en_retard)} joueur(s) ont un retard")
+                    
+                    col_ret1, col_ret2 = st.columns(2)
+                    with col_ret1:
+                        st.write("**Joueurs les plus en retard:**")
+                        for joueur in joueurs_en_retard[:5]:
+                            st.write(f"- {joueur}: {retards[joueur]['matchs']} matchs (retard: {retards[joueur]['retard']})")
+                    
+                    with col_ret2:
+                        st.write("**Recommandations:**")
+                        if len(joueurs_en_retard) > 0:
+                            rounds_needed = max(retards[j]['retard'] for j in joueurs_en_retard)
+                            st.write(f"- {rounds_needed} round(s) de rattrapage nécessaire(s)")
+                            st.write(f"- {len(joueurs_en_retard)} joueur(s) à rattraper")
+                else:
+                    st.success("✅ Tous les joueurs ont le même nombre de matchs!")
         
-        col_conf1, col_conf2 = st.columns(2)
+        # Statistiques générales
+        st.subheader("📊 Statistiques générales")
         
-        with col_conf1:
-            nouveau_nom = st.text_input("Nom du tournoi", st.session_state.nom_tournoi)
-            if nouveau_nom != st.session_state.nom_tournoi:
-                st.session_state.nom_tournoi = nouveau_nom
-                st.rerun()
+        col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
         
-        with col_conf2:
-            st.session_state.nb_terrains = st.number_input("Nombre de terrains", 
-                                                          min_value=1, max_value=20,
-                                                          value=st.session_state.nb_terrains)
+        with col_stat1:
+            st.metric("Joueurs inscrits", len(st.session_state.joueurs))
         
-        # Mode du tournoi
-        st.subheader("🎮 Mode du tournoi")
+        with col_stat2:
+            if st.session_state.mode_tournoi == "Classique":
+                if not st.session_state.equipes_fixes.empty:
+                    st.metric("Équipes", len(st.session_state.equipes_fixes))
+                else:
+                    st.metric("Équipes", 0)
+            else:
+                equipes_actuelles = get_equipes_actuelles()
+                if not equipes_actuelles.empty:
+                    st.metric("Équipes actuelles", len(equipes_actuelles))
+                else:
+                    st.metric("Équipes actuelles", 0)
         
-        mode = st.radio(
-            "Sélectionnez le mode de tournoi:",
-            ["Classique", "Individuel"],
-            index=0 if st.session_state.mode_tournoi == "Classique" else 1,
-            help="Classique: Équipes fixes, classement par équipe. Individuel: Équipes variables, priorité aux moins actifs."
-        )
+        with col_stat3:
+            if not get_matchs().empty:
+                st.metric("Matchs joués", len(get_matchs()))
+            else:
+                st.metric("Matchs joués", 0)
         
-        if mode != st.session_state.mode_tournoi:
-            st.session_state.mode_tournoi = mode
-            if mode == "Individuel":
-                st.warning("⚠️ Passage en mode Individuel: Les équipes seront regénérées à chaque round avec priorité aux joueurs ayant le moins joué.")
-            st.rerun()
+        with col_stat4:
+            st.metric("Rounds joués", get_current_round())
         
-        # Méthodes de classement
-        st.subheader("📊 Méthodes de classement")
+        # Partenaires et adversaires déjà rencontrés
+        if not get_matchs().empty:
+            st.subheader("🤝 Partenaires et adversaires")
+            
+            # Par défaut, les rencontres d'un seul joueur
+            noms_rencontres = [nom for nom in get_noms_inscrits() if nom in get_rencontres()["ids"]]
+            if noms_rencontres:
+                joueur_rencontres = st.selectbox("Joueur:", noms_rencontres, key="joueur_rencontres")
+                st.dataframe(tableau_rencontres_joueur(joueur_rencontres), use_container_width=True)
+                st.caption("Nombre de matchs joués avec (partenaire) ou contre (adversaire) chacun des autres joueurs")
+            
+            # La carte complète (joueurs × joueurs) n'est construite et envoyée qu'à la demande
+            if st.checkbox("Afficher la carte de tous les joueurs", key="carte_rencontres"):
+                choix_rencontres = st.radio("Afficher", ["Partenaires", "Adversaires"], horizontal=True,
+                                            key="choix_rencontres")
+                st.dataframe(
+                    get_carte_partenaires() if choix_rencontres == "Partenaires" else get_carte_adversaires(),
+                    use_container_width=True
+                )
+                st.caption("Nombre de matchs joués ensemble (partenaires) ou l'un contre l'autre (adversaires) par chaque paire de joueurs")
+
+     # Ajouter la section Exportation
+        if est_organisateur():
+            st.divider()
+            st.subheader("📤 Exportation des statistiques")
+            
+            col_exp_s1, col_exp_s2, col_exp_s3 = st.columns(3)
+            
+            with col_exp_s1:
+                # Export PDF statistiques
+                bouton_export(
+                    "statistiques_pdf",
+                    "📄 PDF Statistiques",
+                    exporter_statistiques_pdf,
+                    f"statistiques_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                    "application/pdf"
+                )
+            
+            with col_exp_s2:
+                # Export Excel statistiques
+                bouton_export(
+                    "statistiques_xlsx",
+                    "📊 Excel Statistiques",
+                    exporter_statistiques_xlsx,
+                    f"statistiques_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            
+            with col_exp_s3:
+                # Export Excel cartes des partenaires et adversaires
+                bouton_export(
+                    "rencontres_xlsx",
+                    "📊 Excel Partenaires / Adversaires",
+                    exporter_rencontres_xlsx,
+                    f"rencontres_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+
+    # Onglet 5: Classements
+    with tabs[4], mesurer("Onglet Classements"):
+        st.header("🏆 Classements")
         
-        col_algo1, col_algo2 = st.columns(2)
+        # Initialiser les variables pour éviter l'erreur
+        df_classement_indiv = pd.DataFrame()
+        df_classement_eq = pd.DataFrame()
         
-        with col_algo1:
-            st.session_state.algo_classement = st.radio(
-                "Classement par équipes:",
-                ["Pondéré", "Standard"],
-                index=0 if st.session_state.algo_classement == "Pondéré" else 1
-            )
+        # Calculer le classement individuel (toujours disponible)
+        df_classement_indiv = calculer_classement_individuel_avec_jokers()
         
-        with col_algo2:
-            st.session_state.algo_classement_individuel = st.radio(
-                "Classement individuel:",
-                ["Pondéré", "Standard"],
-                index=0 if st.session_state.algo_classement_individuel == "Pondéré" else 1
-            )
+        # Sélection du type de classement
+        if st.session_state.mode_tournoi == "Classique":
+            tab_classement = st.selectbox("Type de classement", 
+                                         ["Classement par équipes", "Classement individuel"])
+        else:
+            tab_classement = "Classement individuel"
+            st.info("🎯 **Mode Individuel**: Seul le classement individuel a du sens")
         
-        # Catégories et coefficients
-        st.subheader("🏷️ Catégories et coefficients")
+        if tab_classement == "Classement par équipes" and st.session_state.mode_tournoi == "Classique":
+            st.subheader("🏆 Classement par équipes")
+            
+            if not get_matchs().empty and not st.session_state.equipes_fixes.empty:
+                # Calculer le classement par équipes
+                df_classement_eq = calculer_classement_equipes()
+                
+                if not df_classement_eq.empty:
+                    st.dataframe(df_classement_eq, use_container_width=True)
+                else:
+                    st.info("Aucune statistique disponible")
+            else:
+                st.info("Aucun match joué pour le moment")
         
-        for categorie, coeff in list(st.session_state.categories_dict.items()):
-            if categorie == "Joker":
-                continue
+        else:  # Classement individuel
+            st.subheader("👤 Classement individuel")
             
-            col_cat1, col_cat2, col_cat3 = st.columns([3, 2, 1])
+            if not df_classement_indiv.empty:
+                # Afficher le classement individuel
+                st.dataframe(df_classement_indiv, use_container_width=True)
+            else:
+                st.info("Aucun match joué pour le moment")
+
+        # Ajouter la section Exportation (uniquement pour l'organisateur)
+        if est_organisateur():
+            st.divider()
+            st.subheader("📤 Exportation des classements")
+            
+            col_exp_c1, col_exp_c2, col_exp_c3 = st.columns(3)
             
-            with col_cat1:
-                st.write(f"**{categorie}**")
+            with col_exp_c1:
+                # Export PDF classement équipes (mode classique)
+                # Vérifier qu'on est en mode Classique et qu'il y a des matchs
+                if st.session_state.mode_tournoi == "Classique" and not get_matchs().empty:
+                    bouton_export(
+                        "classement_equipes_pdf",
+                        "📄 PDF Classement équipes",
+                        exporter_classement_equipes_pdf,
+                        f"classement_equipes_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Classement équipes", 
+                             disabled=True,
+                             help="Disponible uniquement en mode Classique avec matchs joués",
+                             use_container_width=True,
+                             key="pdf_classement_eq_disabled")
+            
+            with col_exp_c2:
+                # Export PDF classement individuel
+                # Vérifier si le classement individuel existe
+                if not df_classement_indiv.empty:
+                    bouton_export(
+                        "classement_individuel_pdf",
+                        "📄 PDF Classement individuel",
+                        exporter_classement_individuel_pdf,
+                        f"classement_individuel_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf",
+                        "application/pdf"
+                    )
+                else:
+                    st.button("📄 PDF Classement individuel", 
+                             disabled=True,
+                             help="Aucun match joué pour le moment",
+                             use_container_width=True,
+                             key="pdf_classement_indiv_disabled")
             
-            with col_cat2:
-                nouveau_coeff = st.number_input(
-                    f"Coefficient {categorie}",
-                    min_value=0.5,
-                    max_value=2.0,
-                    value=coeff,
-                    step=0.05,
-                    key=f"coeff_{categorie}"
+            with col_exp_c3:
+                # Export Excel complet des classements
+                # Vérifier si au moins un classement est disponible
+                has_classement_indiv = not df_classement_indiv.empty
+                has_classement_eq = (st.session_state.mode_tournoi == "Classique" 
+                                    and not get_matchs().empty
+                                    and not st.session_state.equipes_fixes.empty)
+                
+                if has_classement_indiv or has_classement_eq:
+                    bouton_export(
+                        "classements_complet_xlsx",
+                        "📊 Excel Complet classements",
+                        exporter_classements_complet_xlsx,
+                        f"classements_complet_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                    )
+                else:
+                    st.button("📊 Excel Complet classements", 
+                             disabled=True,
+                             help="Aucun classement disponible",
+                             use_container_width=True,
+                             key="excel_classement_disabled")
+                    
+    # Onglet 6: Paramètres
+    with tabs[5], mesurer("Onglet Paramètres"):
+        if not est_organisateur():
+            st.warning("🔒 Cette section est réservée à l'organisateur")
+        else:
+            st.header("⚙️ Paramètres du Tournoi")
+            
+            # Configuration de base
+            st.subheader("📝 Configuration générale")
+            
+            col_conf1, col_conf2 = st.columns(2)
+            
+            with col_conf1:
+                nouveau_nom = st.text_input("Nom du tournoi", st.session_state.nom_tournoi)
+                if nouveau_nom != st.session_state.nom_tournoi:
+                    st.session_state.nom_tournoi = nouveau_nom
+                    if incrementer_version_etat("nom_tournoi"):
+                        st.rerun()
+            
+            with col_conf2:
+                nouveau_nb_terrains = st.number_input("Nombre de terrains", 
+                                                      min_value=1, max_value=20,
+                                                      value=st.session_state.nb_terrains)
+                if nouveau_nb_terrains != st.session_state.nb_terrains:
+                    st.session_state.nb_terrains = nouveau_nb_terrains
+                    incrementer_version_etat("nb_terrains")
+                
+                enchainement_continu = st.checkbox(
+                    "⏩ Enchaînement continu des matchs",
+                    value=st.session_state.enchainement_continu,
+                    help="Au lieu d'attendre la fin du round, un nouveau match est lancé sur un terrain dès que son score est saisi, "
+                         "avec les joueurs libres qui ont le moins joué."
                 )
-                if nouveau_coeff != coeff:
-                    st.session_state.categories_dict[categorie] = nouveau_coeff
+                if enchainement_continu != st.session_state.enchainement_continu:
+                    st.session_state.enchainement_continu = enchainement_continu
+                    if incrementer_version_etat("enchainement_continu"):
+                        st.rerun()
+            
+            # Mode du tournoi
+            st.subheader("🎮 Mode du tournoi")
+            
+            mode = st.radio(
+                "Sélectionnez le mode de tournoi:",
+                ["Classique", "Individuel"],
+                index=0 if st.session_state.mode_tournoi == "Classique" else 1,
+                help="Classique: Équipes fixes, classement par équipe. Individuel: Équipes variables, priorité aux moins actifs."
+            )
             
-            with col_cat3:
-                if st.button("🗑️", key=f"del_{categorie}"):
-                    del st.session_state.categories_dict[categorie]
+            if mode != st.session_state.mode_tournoi:
+                st.session_state.mode_tournoi = mode
+                if incrementer_version_etat("mode_tournoi"):
+                    if mode == "Individuel":
+                        st.warning("⚠️ Passage en mode Individuel: Les équipes seront regénérées à chaque round avec priorité aux joueurs ayant le moins joué.")
                     st.rerun()
-        
-        # Ajouter une nouvelle catégorie
-        with st.expander("➕ Ajouter une nouvelle catégorie"):
-            col_new1, col_new2 = st.columns(2)
             
-            with col_new1:
-                nouvelle_cat = st.text_input("Nom de la catégorie")
+            # Méthodes de classement
+            st.subheader("📊 Méthodes de classement")
             
-            with col_new2:
-                nouveau_coeff = st.number_input("Coefficient", min_value=0.5, max_value=2.0, value=1.0, step=0.05)
+            col_algo1, col_algo2 = st.columns(2)
             
-            if st.button("Ajouter la catégorie") and nouvelle_cat:
-                st.session_state.categories_dict[nouvelle_cat] = nouveau_coeff
-                st.success(f"✅ Catégorie '{nouvelle_cat}' ajoutée!")
-                st.rerun()
-        
-        # Image de fond
-        st.subheader("🖼️ Personnalisation")
-        
-        image_fond = st.file_uploader("Image de fond", type=['jpg', 'jpeg', 'png'])
-        if image_fond:
-            st.session_state.bg_image_data = image_fond
-            st.success("✅ Image de fond mise à jour!")
-            st.rerun()
-        
-        if st.session_state.bg_image_data:
-            if st.button("🗑️ Supprimer l'image de fond"):
-                st.session_state.bg_image_data = None
+            with col_algo1:
+                algo_classement = st.radio(
+                    "Classement par équipes:",
+                    ["Pondéré", "Standard"],
+                    index=0 if st.session_state.algo_classement == "Pondéré" else 1
+                )
+                if algo_classement != st.session_state.algo_classement:
+                    st.session_state.algo_classement = algo_classement
+                    incrementer_version_etat("algo_classement")
+            
+            with col_algo2:
+                algo_classement_individuel = st.radio(
+                    "Classement individuel:",
+                    ["Pondéré", "Standard"],
+                    index=0 if st.session_state.algo_classement_individuel == "Pondéré" else 1
+                )
+                if algo_classement_individuel != st.session_state.algo_classement_individuel:
+                    st.session_state.algo_classement_individuel = algo_classement_individuel
+                    incrementer_version_etat("algo_classement_individuel")
+            
+            # Catégories et coefficients
+            st.subheader("🏷️ Catégories et coefficients")
+            
+            for categorie, coeff in list(st.session_state.categories_dict.items()):
+                if categorie == "Joker":
+                    continue
+                
+                col_cat1, col_cat2, col_cat3 = st.columns([3, 2, 1])
+                
+                with col_cat1:
+                    st.write(f"**{categorie}**")
+                
+                with col_cat2:
+                    nouveau_coeff = st.number_input(
+                        f"Coefficient {categorie}",
+                        min_value=0.5,
+                        max_value=2.0,
+                        value=coeff,
+                        step=0.05,
+                        key=f"coeff_{categorie}"
+                    )
+                    if nouveau_coeff != coeff:
+                        st.session_state.categories_dict[categorie] = nouveau_coeff
+                        incrementer_version_etat("categories_dict")
+                
+                with col_cat3:
+                    if st.button("🗑️", key=f"del_{categorie}"):
+                        del st.session_state.categories_dict[categorie]
+                        if incrementer_version_etat("categories_dict"):
+                            st.rerun()
+            
+            # Ajouter une nouvelle catégorie
+            with st.expander("➕ Ajouter une nouvelle catégorie"):
+                col_new1, col_new2 = st.columns(2)
+                
+                with col_new1:
+                    nouvelle_cat = st.text_input("Nom de la catégorie")
+                
+                with col_new2:
+                    nouveau_coeff = st.number_input("Coefficient", min_value=0.5, max_value=2.0, value=1.0, step=0.05)
+                
+                if st.button("Ajouter la catégorie") and nouvelle_cat:
+                    st.session_state.categories_dict[nouvelle_cat] = nouveau_coeff
+                    if incrementer_version_etat("categories_dict"):
+                        st.success(f"✅ Catégorie '{nouvelle_cat}' ajoutée!")
+                        st.rerun()
+            
+            # Image de fond
+            st.subheader("🖼️ Personnalisation")
+            
+            image_fond = st.file_uploader("Image de fond", type=['jpg', 'jpeg', 'png'])
+            if image_fond:
+                st.session_state.bg_image_data = image_fond
+                st.success("✅ Image de fond mise à jour!")
                 st.rerun()
-        
-        # Réinitialisation
-         # SECTION RÉINITIALISATION DES MATCHS & CLASSEMENT
-        st.divider()
-        st.subheader("🔄 Réinitialisation des Matchs & Classement")
-        
-        if st.session_state.get("show_popup_matchs", False):
-            st.warning("⚠️ ATTENTION : Réinitialisation complète")
-            st.error("Cette action va supprimer TOUS les matchs joués, le classement, et l'historique des équipes. Les joueurs et équipes fixes seront conservés.")
             
-            # Statistiques
-            if not st.session_state.matchs.empty:
-                st.info(f"""
+            if st.session_state.bg_image_data:
+                if st.button("🗑️ Supprimer l'image de fond"):
+                    st.session_state.bg_image_data = None
+                    st.rerun()
+            
+            # Réinitialisation
+             # SECTION RÉINITIALISATION DES MATCHS & CLASSEMENT
+            st.divider()
+            st.subheader("🔄 Réinitialisation des Matchs & Classement")
+            
+            if st.session_state.get("show_popup_matchs", False):
+                st.warning("⚠️ ATTENTION : Réinitialisation complète")
+                st.error("Cette action va supprimer TOUS les matchs joués, le classement, et l'historique des équipes. Les joueurs et équipes fixes seront conservés.")
+                
+                # Statistiques
+                if not get_matchs().empty:
+                    st.info(f"""
                 **Données qui seront supprimées :**
-                - {len(st.session_state.matchs)} match(s)
-                - {len(st.session_state.matchs_detail)} match(s) détaillé(s)
+                - {len(get_matchs())} match(s)
+                - {len(get_matchs_detail())} match(s) détaillé(s)
                 - {len(st.session_state.historique_equipes)} équipe(s) dans l'historique
                 - {get_current_round()} round(s) de jeu
                 """)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("✅ Oui, tout réinitialiser", use_container_width=True, type="primary"):
-                    reinitialiser_matchs_avec_confirmation()
-                    st.rerun()
-            with col2:
-                if st.button("❌ Annuler", use_container_width=True):
-                    st.session_state["show_popup_matchs"] = False
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    if st.button("✅ Oui, tout réinitialiser", use_container_width=True, type="primary"):
+                        reinitialiser_matchs_avec_confirmation()
+                        st.rerun()
+                with col2:
+                    if st.button("❌ Annuler", use_container_width=True):
+                        st.session_state["show_popup_matchs"] = False
+                        st.rerun()
+            else:
+                if st.button("🔄 Réinitialiser les Matchs & Classement", use_container_width=True, 
+                            type="secondary", help="Supprime tous les matchs et l'historique des équipes"):
+                    st.session_state["show_popup_matchs"] = True
                     st.rerun()
-        else:
-            if st.button("🔄 Réinitialiser les Matchs & Classement", use_container_width=True, 
-                        type="secondary", help="Supprime tous les matchs et l'historique des équipes"):
-                st.session_state["show_popup_matchs"] = True
-                st.rerun()
-        
-        # SECTION RÉINITIALISATION COMPLÈTE
-        st.divider()
-        st.subheader("💣 Réinitialisation complète du tournoi")
-        
-        if st.session_state.get("show_popup_tournoi", False):
-            st.error("🚨 DANGER : Réinitialisation complète du tournoi")
-            st.error("Cette action va supprimer TOUTES les données du tournoi :")
-            st.error("- Tous les joueurs (validés et en attente)")
-            st.error("- Toutes les équipes (fixes et historiques)")
-            st.error("- Tous les matchs et classements")
-            st.error("- Tous les paramètres (sauf profil)")
-            
-            # Statistiques détaillées
-            stats = []
-            if st.session_state.joueurs:
-                stats.append(f"- {len(st.session_state.joueurs)} joueur(s) validé(s)")
-            if st.session_state.temp_joueurs:
-                stats.append(f"- {len(st.session_state.temp_joueurs)} joueur(s) en attente")
-            if not st.session_state.equipes_fixes.empty:
-                stats.append(f"- {len(st.session_state.equipes_fixes)} équipe(s) fixe(s)")
-            if not st.session_state.matchs.empty:
-                stats.append(f"- {len(st.session_state.matchs)} match(s)")
-            if not st.session_state.historique_equipes.empty:
-                stats.append(f"- {len(st.session_state.historique_equipes)} équipe(s) dans l'historique")
-            
-            if stats:
-                st.warning("**Résumé des données à supprimer :**")
-                for stat in stats:
-                    st.write(stat)
-            
-            # Double confirmation
-            st.warning("⚠️ Cette action est IRRÉVERSIBLE !")
             
-            # Deuxième niveau de confirmation
-            confirmation_text = st.text_input(
-                "Pour confirmer, tapez 'SUPPRIMER TOUT' :",
-                key="confirm_delete_all"
-            )
+            # SECTION RÉINITIALISATION COMPLÈTE
+            st.divider()
+            st.subheader("💣 Réinitialisation complète du tournoi")
             
-            col1, col2 = st.columns(2)
-            with col1:
-                confirm_disabled = confirmation_text != "SUPPRIMER TOUT"
-                if st.button("✅ Oui, tout supprimer", 
-                           use_container_width=True, 
-                           type="primary",
-                           disabled=confirm_disabled,
-                           help="Tapez 'SUPPRIMER TOUT' pour activer ce bouton"):
-                    reinitialiser_tournoi_avec_confirmation()
-                    st.rerun()
-            with col2:
-                if st.button("❌ Annuler", use_container_width=True):
-                    st.session_state["show_popup_tournoi"] = False
+            if st.session_state.get("show_popup_tournoi", False):
+                st.error("🚨 DANGER : Réinitialisation complète du tournoi")
+                st.error("Cette action va supprimer TOUTES les données du tournoi :")
+                st.error("- Tous les joueurs (validés et en attente)")
+                st.error("- Toutes les équipes (fixes et historiques)")
+                st.error("- Tous les matchs et classements")
+                st.error("- Tous les paramètres (sauf profil)")
+                
+                # Statistiques détaillées
+                stats = []
+                if st.session_state.joueurs:
+                    stats.append(f"- {len(st.session_state.joueurs)} joueur(s) validé(s)")
+                if st.session_state.temp_joueurs:
+                    stats.append(f"- {len(st.session_state.temp_joueurs)} joueur(s) en attente")
+                if not st.session_state.equipes_fixes.empty:
+                    stats.append(f"- {len(st.session_state.equipes_fixes)} équipe(s) fixe(s)")
+                if not get_matchs().empty:
+                    stats.append(f"- {len(get_matchs())} match(s)")
+                if not st.session_state.historique_equipes.empty:
+                    stats.append(f"- {len(st.session_state.historique_equipes)} équipe(s) dans l'historique")
+                
+                if stats:
+                    st.warning("**Résumé des données à supprimer :**")
+                    for stat in stats:
+                        st.write(stat)
+                
+                # Double confirmation
+                st.warning("⚠️ Cette action est IRRÉVERSIBLE !")
+                
+                # Deuxième niveau de confirmation
+                confirmation_text = st.text_input(
+                    "Pour confirmer, tapez 'SUPPRIMER TOUT' :",
+                    key="confirm_delete_all"
+                )
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    confirm_disabled = confirmation_text != "SUPPRIMER TOUT"
+                    if st.button("✅ Oui, tout supprimer", 
+                               use_container_width=True, 
+                               type="primary",
+                               disabled=confirm_disabled,
+                               help="Tapez 'SUPPRIMER TOUT' pour activer ce bouton"):
+                        reinitialiser_tournoi_avec_confirmation()
+                        st.rerun()
+                with col2:
+                    if st.button("❌ Annuler", use_container_width=True):
+                        st.session_state["show_popup_tournoi"] = False
+                        st.rerun()
+            else:
+                if st.button("💣 RÉINITIALISER TOUT LE TOURNOI", 
+                            use_container_width=True, 
+                            type="primary",
+                            help="Supprime ABSOLUMENT TOUTES les données du tournoi"):
+                    st.session_state["show_popup_tournoi"] = True
                     st.rerun()
-        else:
-            if st.button("💣 RÉINITIALISER TOUT LE TOURNOI", 
-                        use_container_width=True, 
-                        type="primary",
-                        help="Supprime ABSOLUMENT TOUTES les données du tournoi"):
-                st.session_state["show_popup_tournoi"] = True
-                st.rerun()
 
 
-# Pied de page
-st.divider()
-st.caption(f"Duck Manager Pro v2.0 • Mode: {st.session_state.mode_tournoi} • {datetime.now().strftime('%d/%m/%Y %H:%M')}")
\ No newline at end of file
+    # Pied de page
+    st.divider()
+    st.caption(f"Duck Manager Pro v2.0 • Mode: {st.session_state.mode_tournoi} • {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+
+    # Fin des mesures de l'exécution: durée totale, puis affichage du profil cProfile s'il vient de se terminer
+    if st.session_state.profilage_actif and st.session_state.executions_profilees:
+        st.session_state.executions_profilees[-1]["Exécution complète"] = time.perf_counter() - debut_execution
+    if terminer_profil_cprofile():
+        st.rerun()
+
+    # Écriture refusée pendant cette exécution ou celle qui l'a relancée: affichée en tête de page
+    afficher_avertissement_journal(zone_avertissement)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Chargement du moteur de l'application pour les benchmarks et le rejeu, sans l'interface Streamlit.
+
+Le script de l'application s'importe comme un module : seul main() exécute l'interface, lancé par
+streamlit run. Les bases SQLite des tournois sont créées dans un dossier temporaire, sauf si
+DUCK_MANAGER_DONNEES est défini.
+"""
+import contextlib
+import importlib.util
+import io
+import logging
+import os
+import sys
+import tempfile
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "DUCKMANAGERCLAUDE38.py")
+NOM_MODULE = "duck_manager"
+
+@contextlib.contextmanager
+def silence():
+    """Masque les messages de Streamlit hors de streamlit run (avertissements de contexte, cache...)"""
+    logging.disable(logging.WARNING)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+def charger_app():
+    """Importe l'application (une seule fois) et retourne ses globales : fonctions, constantes, état courant
+
+    Le dictionnaire retourné est celui du module : après utiliser_etat, app["etat"] est le nouvel état,
+    et une constante modifiée (app["BUDGET_OPTIMISATION_S"] = ...) est lue par les fonctions.
+    """
+    os.environ.setdefault("DUCK_MANAGER_DONNEES", tempfile.mkdtemp())
+    module = sys.modules.get(NOM_MODULE)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(NOM_MODULE, APP)
+        module = importlib.util.module_from_spec(spec)
+        with silence():
+            spec.loader.exec_module(module)
+        sys.modules[NOM_MODULE] = module
+    return vars(module)
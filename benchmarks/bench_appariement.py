@@ -0,0 +1,66 @@
+"""Benchmark de l'appariement du mode classique : couplage de poids maximal contre l'ancien glouton.
+
+Simule des rounds successifs jusqu'à ce qu'aucun round complet ne soit plus possible, et mesure
+le nombre de rounds complets obtenus et le temps de calcul d'un round.
+
+Usage : python benchmarks/bench_appariement.py [nb_equipes] [nb_terrains]
+"""
+import random
+import sys
+import time
+
+from _app import charger_app
+
+def apparier_glouton(equipes_ids, matchs_par_equipe, adversaires_joues, nb_terrains, rng):
+    """Ancienne implémentation : chaque équipe prend le premier adversaire jamais rencontré"""
+    equipes_triees = sorted(equipes_ids, key=lambda x: (matchs_par_equipe[x], rng.random()))
+    paires = []
+    equipes_utilisees = set()
+    for i, equipe_a in enumerate(equipes_triees):
+        if equipe_a in equipes_utilisees:
+            continue
+        for equipe_b in equipes_triees[i+1:]:
+            if equipe_b not in equipes_utilisees and equipe_b not in adversaires_joues[equipe_a]:
+                paires.append((equipe_a, equipe_b))
+                equipes_utilisees.update([equipe_a, equipe_b])
+                break
+        if len(paires) >= nb_terrains:
+            break
+    return paires
+
+def simuler(apparier, nb_equipes, nb_terrains, graine):
+    """Enchaîne les rounds tant qu'ils sont complets; retourne (rounds complets, temps par round)"""
+    rng = random.Random(graine)
+    equipes_ids = [f"E{i + 1}" for i in range(nb_equipes)]
+    matchs_par_equipe = {eid: 0 for eid in equipes_ids}
+    adversaires_joues = {eid: set() for eid in equipes_ids}
+    nb_matchs_round = min(nb_terrains, nb_equipes // 2)
+    temps = []
+    
+    while True:
+        debut = time.perf_counter()
+        paires = apparier(equipes_ids, matchs_par_equipe, adversaires_joues, nb_terrains, rng)
+        temps.append(time.perf_counter() - debut)
+        if len(paires) < nb_matchs_round:
+            return len(temps) - 1, temps
+        for a, b in paires:
+            matchs_par_equipe[a] += 1
+            matchs_par_equipe[b] += 1
+            adversaires_joues[a].add(b)
+            adversaires_joues[b].add(a)
+
+def main():
+    app = charger_app()
+    configurations = [(int(sys.argv[1]), int(sys.argv[2]))] if len(sys.argv) > 2 else [(8, 4), (16, 8), (64, 7), (64, 32)]
+    
+    for nb_equipes, nb_terrains in configurations:
+        print(f"{nb_equipes} équipes, {nb_terrains} terrains")
+        for nom, apparier in [("glouton", apparier_glouton), ("couplage", app["choisir_matchs_classique"])]:
+            resultats = [simuler(apparier, nb_equipes, nb_terrains, graine) for graine in range(3)]
+            rounds = [r for r, _ in resultats]
+            temps = sorted(t for _, ts in resultats for t in ts)
+            print(f"  {nom:<9} rounds complets {rounds} | round médian {temps[len(temps) // 2] * 1000:7.2f} ms"
+                  f" | pire {temps[-1] * 1000:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark du classement par équipes : moteur en une passe contre l'ancien filtrage par équipe.
+
+Usage : python benchmarks/bench_classement_equipes.py [nb_equipes] [nb_matchs]
+"""
+import random
+import sys
+import timeit
+
+import pandas as pd
+
+from _app import charger_app
+
+def generer_tournoi(nb_equipes, nb_matchs, graine=42):
+    """Construit des équipes fixes et des matchs aléatoires (10% non joués)"""
+    rng = random.Random(graine)
+    equipes = pd.DataFrame([{
+        "ID": f"E{i + 1}",
+        "Surnom": rng.choice([None, f"Team {i + 1}"]),
+        "J1": f"Joueur{2 * i}", "Cat1": "H",
+        "J2": f"Joueur{2 * i + 1}", "Cat2": "F",
+        "Coeff": rng.choice([1.0, 1.1, 1.2]),
+    } for i in range(nb_equipes)])
+    
+    matchs = []
+    for m in range(nb_matchs):
+        a, b = rng.sample(list(equipes["ID"]), 2)
+        score_a, score_b = (0, 0) if rng.random() < 0.1 else (rng.randint(0, 21), rng.randint(0, 21))
+        matchs.append({
+            "Round": m // (nb_equipes // 2) + 1, "Terrain": m % (nb_equipes // 2) + 1, "Type": "Normal",
+            "Equipe A": a, "Score A": score_a, "Equipe B": b, "Score B": score_b,
+        })
+    return pd.DataFrame(matchs), equipes
+
+def classer_equipes_ancien(matchs, equipes_fixes, algo_classement, get_nom_affichage_equipe):
+    """Ancienne implémentation : un filtre des matchs par équipe, O(équipes × matchs)"""
+    stats = []
+    for _, eq in equipes_fixes.iterrows():
+        eid = eq["ID"]
+        m_eq = matchs[(matchs["Equipe A"] == eid) | (matchs["Equipe B"] == eid)]
+        
+        pm, pe, v, n, d = 0, 0, 0, 0, 0
+        for _, m in m_eq.iterrows():
+            if m["Score A"] == 0 and m["Score B"] == 0:
+                continue
+            
+            is_a = m["Equipe A"] == eid
+            ma, sa = (m["Score A"], m["Score B"]) if is_a else (m["Score B"], m["Score A"])
+            
+            pm += ma
+            pe += sa
+            
+            if ma > sa:
+                v += 1
+            elif ma == sa:
+                n += 1
+            else:
+                d += 1
+        
+        if algo_classement == "Pondéré":
+            score = round(((v * 3) + (n * 1)) * eq["Coeff"], 2)
+        else:
+            score = (v * 2) + (n * 1)
+        
+        stats.append({
+            "Équipe": get_nom_affichage_equipe(eq),
+            "Joueurs": f"{eq['J1']} & {eq['J2']}",
+            "V": v, "N": n, "D": d,
+            "PM": pm, "PE": pe, "Diff": pm - pe,
+            "Points": score
+        })
+    
+    df = pd.DataFrame(stats).sort_values(by=["Points", "Diff"], ascending=False, kind="stable")
+    df.index = range(1, len(df) + 1)
+    df.index.name = "Rang"
+    return df
+
+def main():
+    nb_equipes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    nb_matchs = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    
+    app = charger_app()
+    matchs, equipes = generer_tournoi(nb_equipes, nb_matchs)
+    
+    print(f"Classement par équipes : {nb_equipes} équipes × {nb_matchs} matchs")
+    for algo in ["Pondéré", "Standard"]:
+        ancien = lambda: classer_equipes_ancien(matchs, equipes, algo, app["get_nom_affichage_equipe"])
+        nouveau = lambda: app["classer_equipes"](matchs, equipes, algo)
+        
+        pd.testing.assert_frame_equal(ancien(), nouveau(), check_dtype=False)
+        
+        repetitions = 5
+        t_ancien = min(timeit.repeat(ancien, number=1, repeat=repetitions))
+        t_nouveau = min(timeit.repeat(nouveau, number=1, repeat=repetitions))
+        print(f"  {algo:<9} ancien {t_ancien * 1000:8.2f} ms | une passe {t_nouveau * 1000:8.2f} ms"
+              f" | gain ×{t_ancien / t_nouveau:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark du débit des terrains : rounds synchrones contre enchaînement continu des matchs.
+
+Simule une séance en mode individuel avec des durées de match aléatoires. En rounds synchrones, un
+round ne commence qu'à la fin du match le plus long du round précédent; en enchaînement continu, un
+terrain repart dès que son match se termine (choisir_joueurs_libres). Mesure le nombre de matchs
+par heure et l'écart de matchs terminés entre joueurs en fin de séance.
+
+Usage : python benchmarks/bench_enchainement.py [nb_joueurs] [nb_terrains] [duree_seance_min]
+"""
+import heapq
+import random
+import sys
+
+from _app import charger_app
+
+DUREE_MOYENNE_MIN = 15.0  # Durée moyenne d'un match
+ECART_TYPE_MIN = 4.0
+DUREE_MINIMALE_MIN = 6.0
+CHANGEMENT_MIN = 1.0  # Temps pour appeler les joueurs et rejoindre le terrain
+
+def duree_match(rng):
+    return max(DUREE_MINIMALE_MIN, rng.gauss(DUREE_MOYENNE_MIN, ECART_TYPE_MIN)) + CHANGEMENT_MIN
+
+def simuler_rounds(app, nb_joueurs, nb_terrains, duree_seance, graine):
+    """Rounds synchrones : les 4 × nb_terrains joueurs qui ont le moins joué, un round à la fois"""
+    rng = random.Random(graine)
+    joueurs = list(range(nb_joueurs))
+    matchs_joues = dict.fromkeys(joueurs, 0)
+    horloge = 0.0
+    nb_matchs = 0
+    
+    while True:
+        ordre = sorted(joueurs, key=lambda j: (matchs_joues[j], rng.random()))
+        en_jeu = ordre[:4 * min(nb_terrains, nb_joueurs // 4)]
+        durees = [duree_match(rng) for _ in range(len(en_jeu) // 4)]
+        if horloge + max(durees) > duree_seance:
+            return nb_matchs, matchs_joues
+        horloge += max(durees)
+        nb_matchs += len(durees)
+        for joueur in en_jeu:
+            matchs_joues[joueur] += 1
+
+def simuler_continu(app, nb_joueurs, nb_terrains, duree_seance, graine):
+    """Enchaînement continu : chaque terrain repart dès que son match est terminé (ou attend des joueurs libres)"""
+    rng = random.Random(graine)
+    matchs_programmes = dict.fromkeys(range(nb_joueurs), 0)
+    matchs_joues = dict.fromkeys(range(nb_joueurs), 0)
+    dernier_passage = {}
+    libres = list(range(nb_joueurs))
+    fins = []  # (fin du match, numéro du match, joueurs)
+    nb_lances = 0
+    
+    def lancer(horloge):
+        nonlocal nb_lances, libres
+        joueurs = app["choisir_joueurs_libres"](
+            libres, matchs_programmes, dernier_passage, rng, min(matchs_programmes.values())
+        )
+        if joueurs is None:
+            return False
+        libres = [j for j in libres if j not in joueurs]
+        for joueur in joueurs:
+            matchs_programmes[joueur] += 1
+        nb_lances += 1
+        heapq.heappush(fins, (horloge + duree_match(rng), nb_lances, joueurs))
+        return True
+    
+    terrains_libres = sum(not lancer(0.0) for _ in range(nb_terrains))
+    nb_termines = 0
+    while fins:
+        fin, numero, joueurs = heapq.heappop(fins)
+        if fin > duree_seance:
+            break
+        nb_termines += 1
+        for joueur in joueurs:
+            matchs_joues[joueur] += 1
+            dernier_passage[joueur] = numero
+        libres += joueurs
+        # Saisie du score: tous les terrains libres sont relancés si possible
+        terrains_libres += 1
+        while terrains_libres and lancer(fin):
+            terrains_libres -= 1
+    return nb_termines, matchs_joues
+
+def main():
+    app = charger_app()
+    configurations = (
+        [tuple(int(arg) for arg in sys.argv[1:4])] if len(sys.argv) > 3
+        else [(28, 7, 180), (40, 7, 180), (60, 7, 180)]
+    )
+    
+    for nb_joueurs, nb_terrains, duree_seance in configurations:
+        print(f"{nb_joueurs} joueurs, {nb_terrains} terrains, séance de {duree_seance} min")
+        for nom, simuler in [("rounds", simuler_rounds), ("continu", simuler_continu)]:
+            resultats = [simuler(app, nb_joueurs, nb_terrains, duree_seance, graine) for graine in range(20)]
+            debit = sum(nb for nb, _ in resultats) / len(resultats) * 60 / duree_seance
+            ecart = max(max(m.values()) - min(m.values()) for _, m in resultats)
+            print(f"  {nom:<8} {debit:5.1f} matchs/heure | écart de matchs joués (pire) {ecart}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark des équipes du mode individuel : recuit simulé contre l'ancien appariement par voisins.
+
+Simule un tournoi (scores ignorés) et compte, sur l'ensemble des rounds, les partenaires et
+adversaires retrouvés, l'écart moyen de coefficient entre les deux équipes d'un match, et le temps
+de génération d'un round.
+
+Usage : python benchmarks/bench_equipes_individuelles.py [nb_joueurs] [nb_terrains] [nb_rounds]
+"""
+import random
+import sys
+import time
+
+from _app import charger_app
+
+CATEGORIES = {"Bien-être": 1.2, "Compétiteur": 1.05, "Très Bon": 1.0}
+
+def round_voisins(en_jeu, coefficients, partenaires, adversaires, graine):
+    """Ancienne implémentation : les joueurs sont appariés dans l'ordre de priorité"""
+    return [((en_jeu[k], en_jeu[k + 1]), (en_jeu[k + 2], en_jeu[k + 3])) for k in range(0, len(en_jeu), 4)]
+
+def simuler(app, generer, nb_joueurs, nb_terrains, nb_rounds, graine):
+    """Enchaîne les rounds; retourne (partenaires retrouvés, adversaires retrouvés, écart moyen, temps par round)"""
+    rng = random.Random(graine)
+    joueurs = [f"Joueur {i + 1}" for i in range(nb_joueurs)]
+    coefficients = {joueur: rng.choice(list(CATEGORIES.values())) for joueur in joueurs}
+    matchs_joues = dict.fromkeys(joueurs, 0)
+    rencontres = app["creer_rencontres"]()
+    repetitions_partenaires = repetitions_adversaires = 0
+    ecarts = []
+    temps = []
+    
+    for _ in range(nb_rounds):
+        ordre = sorted(joueurs, key=lambda joueur: (matchs_joues[joueur], rng.random()))
+        en_jeu = ordre[:4 * min(nb_terrains, nb_joueurs // 4)]
+        partenaires, adversaires = app["sous_matrices_rencontres"](rencontres, en_jeu)
+        position = {joueur: i for i, joueur in enumerate(en_jeu)}
+        
+        debut = time.perf_counter()
+        matchs = generer(en_jeu, coefficients, partenaires, adversaires, graine=rng.getrandbits(32))
+        temps.append(time.perf_counter() - debut)
+        
+        for (a1, a2), (b1, b2) in matchs:
+            a1, a2, b1, b2 = (position[joueur] for joueur in (a1, a2, b1, b2))
+            repetitions_partenaires += int(partenaires[a1, a2] > 0) + int(partenaires[b1, b2] > 0)
+            repetitions_adversaires += sum(int(adversaires[a, b] > 0) for a in (a1, a2) for b in (b1, b2))
+            a1, a2, b1, b2 = (en_jeu[i] for i in (a1, a2, b1, b2))
+            ecarts.append(abs(coefficients[a1] + coefficients[a2] - coefficients[b1] - coefficients[b2]) / 2)
+            app["appliquer_match_aux_rencontres"](rencontres, {"J1_A": a1, "J2_A": a2, "J1_B": b1, "J2_B": b2})
+            for joueur in (a1, a2, b1, b2):
+                matchs_joues[joueur] += 1
+    
+    return repetitions_partenaires, repetitions_adversaires, sum(ecarts) / len(ecarts), temps
+
+def main():
+    app = charger_app()
+    configurations = (
+        [tuple(int(arg) for arg in sys.argv[1:4])] if len(sys.argv) > 3
+        else [(16, 4, 10), (40, 10, 10), (80, 10, 16)]
+    )
+    
+    for nb_joueurs, nb_terrains, nb_rounds in configurations:
+        print(f"{nb_joueurs} joueurs, {nb_terrains} terrains, {nb_rounds} rounds")
+        for nom, generer in [("voisins", round_voisins), ("recuit", app["optimiser_round_individuel"])]:
+            resultats = [simuler(app, generer, nb_joueurs, nb_terrains, nb_rounds, graine) for graine in range(3)]
+            temps = sorted(t for *_, ts in resultats for t in ts)
+            print(f"  {nom:<8} partenaires retrouvés {[r[0] for r in resultats]}"
+                  f" | adversaires retrouvés {[r[1] for r in resultats]}"
+                  f" | écart moyen {sum(r[2] for r in resultats) / len(resultats):.3f}"
+                  f" | round médian {temps[len(temps) // 2] * 1000:7.1f} ms | pire {temps[-1] * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
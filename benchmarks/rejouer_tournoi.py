@@ -0,0 +1,190 @@
+"""Rejeu d'un tournoi enregistré : vérifie que la génération des matchs est reproductible à l'identique.
+
+Relit le journal SQLite d'un tournoi et, à chaque génération de matchs qu'il contient, reconstitue
+l'état du tournoi juste avant, relance le même générateur avec les graines enregistrées avec les
+rounds, puis compare matchs et équipes obtenus à ceux du journal. Sert à valider au bit près une
+optimisation des générateurs : enregistrer un tournoi avec l'ancienne version, le rejouer avec la
+nouvelle. La durée maximale du recuit est levée pendant le rejeu (seule source de non-déterminisme).
+
+Sans argument, simule d'abord quelques tournois (scores aléatoires) puis les rejoue.
+
+Usage : python benchmarks/rejouer_tournoi.py [donnees/tournoi.sqlite3 ...]
+"""
+import contextlib
+import copy
+import json
+import math
+import os
+import random
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+
+from _app import charger_app, silence
+
+CATEGORIES = ["Bien-être", "Compétiteur", "Très Bon"]
+# Tournois simulés sans argument : (mode, joueurs, terrains, rounds, enchaînement continu)
+SIMULATIONS = [
+    ("Individuel", 23, 5, 8, False),
+    ("Classique", 30, 4, 8, False),
+    ("Individuel", 30, 6, 8, True),
+    ("Classique", 24, 5, 6, True),
+]
+
+def normaliser(app, enregistrements):
+    """Enregistrements comparables à ceux du journal (types numpy convertis, passage par JSON)"""
+    return json.loads(json.dumps(enregistrements, default=app["valeur_sql"]))
+
+def lire_journal(chemin):
+    with contextlib.closing(sqlite3.connect(f"file:{chemin}?mode=ro", uri=True)) as connexion:
+        return [(t, json.loads(d)) for t, d in connexion.execute("SELECT type, donnees FROM evenements ORDER BY id")]
+
+def capturer_etat(app):
+    etat = app["etat"]
+    return (
+        {cle: copy.deepcopy(getattr(etat, cle)) for cle in app["CLES_PERSISTEES"]},
+        copy.deepcopy(etat.magasin_matchs["lignes"])
+    )
+
+def restaurer_etat(app, etat, lignes):
+    """Remet le tournoi rejoué dans l'état capturé (structures dérivées reconstruites à la lecture)"""
+    courant = app["etat"]
+    for cle in app["CLES_PERSISTEES"]:
+        setattr(courant, cle, copy.deepcopy(etat[cle]))
+    app["vider_table_matchs"]()
+    app["ajouter_au_magasin"](courant.magasin_matchs, copy.deepcopy(lignes))
+    courant.statistiques_joueurs = {}
+    courant.rencontres_joueurs = {}
+    courant.registre_joueurs = {}
+    courant.version_etat += 1
+
+def premier_ecart(obtenus, attendus):
+    for position, (obtenu, attendu) in enumerate(zip(obtenus, attendus)):
+        if obtenu != attendu:
+            return f"n°{position + 1}: {obtenu} au lieu de {attendu}"
+    return f"{len(obtenus)} au lieu de {len(attendus)}"
+
+def rejouer(app, evenements):
+    """Rejoue le journal dans un état neuf; retourne (nombre de générations, écarts, durées par générateur)"""
+    etat = app["creer_etat"]("rejeu")
+    app["utiliser_etat"](etat, lambda niveau, message: None)
+    app["vider_base"]()
+    app["BUDGET_OPTIMISATION_S"] = math.inf
+    nb_generations = 0
+    ecarts = []
+    durees = defaultdict(list)
+    i = 0
+
+    while i < len(evenements):
+        type_evenement, donnees = evenements[i]
+        generateur = donnees.get("generateur") if type_evenement == "matchs_ajoutes" else None
+        if generateur is None:
+            app["appliquer_evenement"](type_evenement, donnees)
+            i += 1
+            continue
+
+        # generer_derniers_rounds journalise un événement par round, tous issus du même appel
+        fin = i + 1
+        while (generateur == "generer_derniers_rounds" and fin < len(evenements)
+               and evenements[fin][0] == "matchs_ajoutes" and evenements[fin][1].get("generateur") == generateur):
+            fin += 1
+        # Les graines des nouveaux rounds sont journalisées avec les matchs (dans les journaux
+        # antérieurs, dans l'état journalisé juste après la génération)
+        modifications = evenements[fin - 1][1].get("etat")
+        if modifications is None and fin < len(evenements) and evenements[fin][0] == "etat_modifie":
+            fin += 1
+            modifications = evenements[fin - 1][1]
+
+        etat_avant, lignes = capturer_etat(app)
+        for cle in ("graine_tournoi", "graines_rounds"):
+            if cle in (modifications or {}):
+                setattr(etat, cle, copy.deepcopy(modifications[cle]["valeur"]))
+        nb_equipes = len(etat.historique_equipes)
+
+        debut = time.perf_counter()
+        app[generateur]()
+        durees[generateur].append(time.perf_counter() - debut)
+        matchs_obtenus = normaliser(app, etat.magasin_matchs["lignes"][len(lignes):])
+        equipes_obtenues = normaliser(app, etat.historique_equipes.iloc[nb_equipes:].to_dict("records"))
+
+        # Retour à l'état enregistré, puis application du journal lui-même
+        restaurer_etat(app, etat_avant, lignes)
+        for type_evenement, donnees in evenements[i:fin]:
+            app["appliquer_evenement"](type_evenement, donnees)
+        matchs_attendus = normaliser(app, etat.magasin_matchs["lignes"][len(lignes):])
+        equipes_attendues = normaliser(app, etat.historique_equipes.iloc[nb_equipes:].to_dict("records"))
+
+        nb_generations += 1
+        premier_round = matchs_attendus[0]["Round"] if matchs_attendus else "?"
+        if matchs_obtenus != matchs_attendus:
+            ecarts.append(f"{generateur} (round {premier_round}), match {premier_ecart(matchs_obtenus, matchs_attendus)}")
+        elif equipes_obtenues != equipes_attendues:
+            ecarts.append(f"{generateur} (round {premier_round}), équipe {premier_ecart(equipes_obtenues, equipes_attendues)}")
+        i = fin
+
+    return nb_generations, ecarts, durees
+
+def simuler_tournoi(app, mode, nb_joueurs, nb_terrains, nb_rounds, continu, graine):
+    """Joue un tournoi fictif dans un état neuf (scores aléatoires); retourne le chemin de son journal"""
+    rng = random.Random(graine)
+    tournoi = f"simulation-{mode.lower()}{'-continu' if continu else ''}"
+    etat = app["creer_etat"](tournoi)
+    app["utiliser_etat"](etat, lambda niveau, message: None)
+    app["vider_base"]()
+
+    for i in range(nb_joueurs):
+        app["valider_joueur"]({"Prénom": f"Joueur{i + 1}", "Nom": "Simulé", "Catégorie": rng.choice(CATEGORIES)})
+    etat.mode_tournoi = mode
+    etat.nb_terrains = nb_terrains
+    etat.enchainement_continu = continu
+    app["incrementer_version_etat"]("joueurs", "mode_tournoi", "nb_terrains", "enchainement_continu")
+    if mode == "Classique":
+        app["generer_paires_equilibrees"]()
+
+    def saisir_score(match):
+        app["modifier_score_match"](match["ID_Match"], 21, rng.randint(0, 19))
+        app["incrementer_version_etat"]()
+
+    if continu:
+        app["remplir_terrains_libres"]()
+        for _ in range(nb_rounds * nb_terrains):
+            _, en_cours = app["get_etat_terrains"]()
+            if not en_cours:
+                break
+            saisir_score(en_cours[rng.choice(sorted(en_cours))])
+            app["remplir_terrains_libres"]()
+    else:
+        for _ in range(nb_rounds):
+            app["generer_round"]()
+            for match in etat.magasin_matchs["lignes"]:
+                if match["Score_A"] == 0 and match["Score_B"] == 0:
+                    saisir_score(match)
+        if mode == "Individuel":
+            app["generer_derniers_rounds"]()
+
+    return app["get_chemin_base"](tournoi)
+
+def main():
+    app = charger_app()
+    chemins = sys.argv[1:]
+    if not chemins:
+        with silence():
+            chemins = [simuler_tournoi(app, *simulation, graine) for graine, simulation in enumerate(SIMULATIONS)]
+
+    nb_ecarts = 0
+    for chemin in chemins:
+        with silence():
+            nb_generations, ecarts, durees = rejouer(app, lire_journal(chemin))
+        nb_ecarts += len(ecarts)
+        print(f"{os.path.basename(chemin)} : {nb_generations} génération(s) rejouée(s), "
+              f"{'identiques' if not ecarts else f'{len(ecarts)} écart(s)'}")
+        for nom, temps in sorted(durees.items()):
+            print(f"  {nom:<24} {len(temps):4d} appel(s) | moyenne {sum(temps) / len(temps) * 1000:8.2f} ms"
+                  f" | pire {max(temps) * 1000:8.2f} ms")
+        for ecart in ecarts:
+            print(f"  ÉCART {ecart}")
+    sys.exit(1 if nb_ecarts else 0)
+
+if __name__ == "__main__":
+    main()
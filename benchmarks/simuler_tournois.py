@@ -0,0 +1,121 @@
+"""Simulateur de tournois sans interface : temps de génération, de classement et d'export, équité.
+
+Joue de bout en bout des tournois fictifs (joueurs, catégories, scores aléatoires) avec le moteur
+sans interface de l'application (creer_etat / utiliser_etat) : chaque tournoi a son propre état et
+son propre journal SQLite, les messages destinés à l'organisateur sont collectés. Mesure par taille
+de tournoi le temps de génération d'un round, de calcul du classement après un round et de chaque
+export, ainsi que l'écart de matchs joués et les partenaires répétés (mode individuel) ou les
+revanches (mode classique).
+
+Usage : python benchmarks/simuler_tournois.py [nb_joueurs ...] [--tournois N] [--rounds N]
+"""
+import argparse
+import random
+import statistics
+import time
+from collections import Counter, defaultdict
+
+from _app import charger_app
+
+CATEGORIES = ["Bien-être", "Compétiteur", "Très Bon"]
+JOUEURS_PAR_TERRAIN = 6  # Un terrain pour 6 joueurs : un tiers des joueurs au repos à chaque round
+
+def chronometrer(mesures, nom, fonction, *args):
+    debut = time.perf_counter()
+    resultat = fonction(*args)
+    mesures[nom].append(time.perf_counter() - debut)
+    return resultat
+
+def simuler_tournoi(app, mode, nb_joueurs, nb_rounds, graine, mesures):
+    """Joue un tournoi complet dans un état neuf; retourne (indicateurs d'équité, messages par niveau)"""
+    rng = random.Random(graine)
+    messages = Counter()
+    etat = app["creer_etat"](f"simulation-{mode.lower()}-{nb_joueurs}-{graine}")
+    app["utiliser_etat"](etat, lambda niveau, message: messages.update([niveau]))
+    app["vider_base"]()
+    etat.graine_tournoi = graine
+
+    for i in range(nb_joueurs):
+        app["valider_joueur"]({"Prénom": f"Joueur{i + 1}", "Nom": "Simulé", "Catégorie": rng.choice(CATEGORIES)})
+    etat.mode_tournoi = mode
+    etat.nb_terrains = max(1, nb_joueurs // JOUEURS_PAR_TERRAIN)
+    app["incrementer_version_etat"]("joueurs", "mode_tournoi", "nb_terrains", "graine_tournoi")
+    if mode == "Classique":
+        chronometrer(mesures, "équipes et planning", app["generer_paires_equilibrees"])
+    classement = app["calculer_classement_equipes" if mode == "Classique" else "calculer_classement_individuel_avec_jokers"]
+
+    def saisir_scores():
+        for match in etat.magasin_matchs["lignes"]:
+            if match["Score_A"] == 0 and match["Score_B"] == 0:
+                gagnant, perdant = 21, rng.randint(0, 19)
+                scores = (gagnant, perdant) if rng.random() < 0.5 else (perdant, gagnant)
+                app["modifier_score_match"](match["ID_Match"], *scores)
+        app["incrementer_version_etat"]()
+
+    for _ in range(nb_rounds):
+        chronometrer(mesures, "round", app["generer_round"])
+        saisir_scores()
+        chronometrer(mesures, "classement", classement)
+    if mode == "Individuel":
+        chronometrer(mesures, "derniers rounds", app["generer_derniers_rounds"])
+        saisir_scores()
+
+    for nom in sorted(app):
+        # Le planning de la journée n'existe qu'en mode classique
+        if nom.startswith("exporter_") and (nom != "exporter_planning_pdf" or etat.planning_classique):
+            chronometrer(mesures, nom[len("exporter_"):], app[nom])
+
+    if mode == "Individuel":
+        matchs_joues = app["compter_matchs_programmes"]()
+        noms = [app["get_nom_complet"](joueur) for joueur in etat.joueurs]
+        partenaires = app["get_rencontres"]()["partenaires"]
+        equite = {
+            "écart de matchs": max(matchs_joues[nom] for nom in noms) - min(matchs_joues[nom] for nom in noms),
+            "partenaires répétés": int((partenaires[partenaires > 1] - 1).sum()) // 2,
+        }
+    else:
+        rencontres = Counter(
+            frozenset((match["Equipe_A_ID"], match["Equipe_B_ID"])) for match in etat.magasin_matchs["lignes"]
+        )
+        matchs_par_equipe = Counter(
+            equipe for match in etat.magasin_matchs["lignes"] for equipe in (match["Equipe_A_ID"], match["Equipe_B_ID"])
+        )
+        equite = {
+            "écart de matchs": max(matchs_par_equipe.values()) - min(matchs_par_equipe.values()),
+            "revanches": sum(n - 1 for n in rencontres.values()),
+        }
+    return equite, messages
+
+def resumer(temps):
+    temps = sorted(temps)
+    p95 = temps[min(len(temps) - 1, int(0.95 * len(temps)))]
+    return f"médiane {statistics.median(temps) * 1000:9.2f} ms | p95 {p95 * 1000:9.2f} ms"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("tailles", nargs="*", type=int, default=[20, 100, 500])
+    parser.add_argument("--tournois", type=int, default=3, help="tournois simulés par mode et par taille")
+    parser.add_argument("--rounds", type=int, default=8, help="rounds joués avant la clôture")
+    arguments = parser.parse_args()
+    app = charger_app()
+
+    for mode in ("Individuel", "Classique"):
+        for nb_joueurs in arguments.tailles:
+            mesures = defaultdict(list)
+            equites = []
+            messages = Counter()
+            for graine in range(arguments.tournois):
+                equite, messages_tournoi = simuler_tournoi(app, mode, nb_joueurs, arguments.rounds, graine, mesures)
+                equites.append(equite)
+                messages.update(messages_tournoi)
+
+            print(f"{mode}, {nb_joueurs} joueurs, {max(1, nb_joueurs // JOUEURS_PAR_TERRAIN)} terrains, "
+                  f"{arguments.tournois} tournoi(s) de {arguments.rounds} rounds")
+            for nom, temps in mesures.items():
+                print(f"  {nom:<32} {resumer(temps)}")
+            for indicateur in equites[0]:
+                print(f"  {indicateur:<32} {[equite[indicateur] for equite in equites]}")
+            print(f"  {'messages':<32} {dict(messages)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Suite de benchmarks avec références : détecte les régressions des générateurs, classements et exports.
+
+Pour chaque taille de tournoi, prépare un tournoi fictif à mi-parcours (joueurs, catégories, scores
+aléatoires) dans un état sans interface (creer_etat / utiliser_etat), puis chronomètre chaque chemin
+sur une copie de cet état : meilleur temps de --essais exécutions. Les temps sont comparés aux
+références de references_performances.json ; le script échoue (code 1) si un chemin est plus lent
+que sa référence de plus de --seuil pour cent et d'au moins --plancher-ms (bruit des chemins courts).
+
+Les références dépendent de la machine : les enregistrer avec --enregistrer sur la machine qui
+compare, avant la modification à évaluer.
+
+Usage : python benchmarks/suite_performances.py [--tailles 20 100 500] [--essais N] [--seuil 25]
+                                                [--plancher-ms 2] [--enregistrer]
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from datetime import date
+
+from _app import charger_app
+
+REFERENCES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "references_performances.json")
+CATEGORIES = ["Bien-être", "Compétiteur", "Très Bon"]
+JOUEURS_PAR_TERRAIN = 6  # Un terrain pour 6 joueurs : un tiers des joueurs au repos à chaque round
+NB_ROUNDS_JOUES = 6  # Rounds joués (scores saisis) avant les mesures
+
+def ignorer(niveau, message):
+    pass
+
+def preparer_tournoi(app, mode, nb_joueurs, nb_rounds):
+    """État d'un tournoi fictif: joueurs inscrits, équipes (mode classique) et nb_rounds rounds joués"""
+    rng = random.Random(nb_joueurs)
+    etat = app["creer_etat"](f"suite-{mode.lower()}-{nb_joueurs}-{nb_rounds}")
+    app["utiliser_etat"](etat, ignorer)
+    app["vider_base"]()
+    etat.graine_tournoi = nb_joueurs
+
+    for i in range(nb_joueurs):
+        app["valider_joueur"]({"Prénom": f"Joueur{i + 1}", "Nom": "Simulé", "Catégorie": rng.choice(CATEGORIES)})
+    etat.mode_tournoi = mode
+    etat.nb_terrains = max(1, nb_joueurs // JOUEURS_PAR_TERRAIN)
+    app["incrementer_version_etat"]("joueurs", "mode_tournoi", "nb_terrains", "graine_tournoi")
+    if mode == "Classique" and nb_rounds:
+        app["generer_paires_equilibrees"]()
+
+    for _ in range(nb_rounds):
+        app["generer_round"]()
+        for match in etat.magasin_matchs["lignes"]:
+            if match["Score_A"] == 0 and match["Score_B"] == 0:
+                app["modifier_score_match"](match["ID_Match"], 21, rng.randint(0, 19))
+        app["incrementer_version_etat"]()
+    return etat
+
+def chronometrer(app, etat_reference, fonction, nb_essais):
+    """Meilleur temps (s) de fonction(), chaque essai sur une copie neuve de l'état (vues mémorisées à recalculer)
+
+    Les événements journalisés par un essai sont effacés ensuite : le journal reste celui de l'état de
+    référence, auquel l'essai suivant peut de nouveau écrire.
+    """
+    meilleur = math.inf
+    for _ in range(nb_essais):
+        etat = copy.deepcopy(etat_reference)
+        etat.version_etat += 1
+        app["utiliser_etat"](etat, ignorer)
+        debut = time.perf_counter()
+        fonction()
+        meilleur = min(meilleur, time.perf_counter() - debut)
+        with app["transaction_base"]() as connexion:
+            connexion.execute("DELETE FROM evenements WHERE id > ?", (etat_reference.revision_base,))
+            connexion.execute("DELETE FROM instantanes WHERE id_evenement > ?", (etat_reference.revision_base,))
+    return meilleur
+
+def mesurer(app, nb_joueurs, nb_essais):
+    """Temps (ms) de chaque chemin pour un tournoi de nb_joueurs joueurs, par nom de mesure"""
+    mesures = {}
+    exporteurs = sorted(nom for nom in app if nom.startswith("exporter_"))
+
+    for mode, chemins_debut, chemins_milieu in (
+        ("Classique", ["generer_paires_equilibrees"], ["generer_round_classique", "calculer_classement_equipes"]),
+        ("Individuel", [], ["generer_equipes_equilibrees", "generer_derniers_rounds",
+                            "calculer_classement_individuel_avec_jokers"]),
+    ):
+        etats = {
+            "debut": preparer_tournoi(app, mode, nb_joueurs, 0),
+            "milieu": preparer_tournoi(app, mode, nb_joueurs, NB_ROUNDS_JOUES),
+        }
+        chemins = (
+            [(nom, "debut") for nom in chemins_debut] + [(nom, "milieu") for nom in chemins_milieu]
+            # Le planning de la journée n'existe qu'en mode classique
+            + [(nom, "milieu") for nom in exporteurs if mode == "Classique" or nom != "exporter_planning_pdf"]
+        )
+        for nom, moment in chemins:
+            temps = chronometrer(app, etats[moment], app[nom], nb_essais)
+            mesures[f"{nom} [{mode}, {nb_joueurs} joueurs]"] = round(temps * 1000, 3)
+    return mesures
+
+def comparer(mesures, references, seuil, plancher_ms):
+    """Affiche chaque mesure face à sa référence; retourne la liste des régressions"""
+    regressions = []
+    for nom, temps in mesures.items():
+        reference = references.get(nom)
+        if reference is None:
+            statut = "nouveau"
+        elif temps > reference * (1 + seuil / 100) and temps - reference >= plancher_ms:
+            statut = "RÉGRESSION"
+            regressions.append(nom)
+        else:
+            statut = "ok"
+        ecart = f"{(temps / reference - 1) * 100:+7.1f} %" if reference else " " * 9
+        reference_texte = f"{reference:10.2f}" if reference is not None else " " * 10
+        print(f"  {nom:<70} {reference_texte} -> {temps:10.2f} ms {ecart}  {statut}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tailles", nargs="+", type=int, default=[20, 100, 500], help="nombres de joueurs")
+    parser.add_argument("--essais", type=int, default=5, help="exécutions par chemin (meilleur temps retenu)")
+    parser.add_argument("--seuil", type=float, default=25.0, help="ralentissement toléré, en pour cent")
+    parser.add_argument("--plancher-ms", type=float, default=2.0, help="ralentissement ignoré en dessous (ms)")
+    parser.add_argument("--enregistrer", action="store_true", help="enregistre les temps mesurés comme références")
+    arguments = parser.parse_args()
+
+    donnees = {"mesures_ms": {}}
+    if os.path.exists(REFERENCES):
+        with open(REFERENCES, encoding="utf-8") as fichier:
+            donnees = json.load(fichier)
+    app = charger_app()
+
+    mesures = {}
+    regressions = []
+    for nb_joueurs in arguments.tailles:
+        print(f"{nb_joueurs} joueurs, {max(1, nb_joueurs // JOUEURS_PAR_TERRAIN)} terrains "
+              f"(référence -> mesure, meilleur de {arguments.essais})")
+        mesures_taille = mesurer(app, nb_joueurs, arguments.essais)
+        regressions += comparer(mesures_taille, donnees["mesures_ms"], arguments.seuil, arguments.plancher_ms)
+        mesures.update(mesures_taille)
+
+    if arguments.enregistrer:
+        donnees["mesures_ms"].update(mesures)
+        donnees["machine"] = f"{platform.machine()}, {platform.python_implementation()} {platform.python_version()}"
+        donnees["date"] = date.today().isoformat()
+        with open(REFERENCES, "w", encoding="utf-8") as fichier:
+            json.dump(donnees, fichier, ensure_ascii=False, indent=2, sort_keys=True)
+            fichier.write("\n")
+        print(f"{len(mesures)} référence(s) enregistrée(s) dans {os.path.basename(REFERENCES)}")
+    elif regressions:
+        print(f"ÉCHEC : {len(regressions)} chemin(s) plus lent(s) que la référence de plus de {arguments.seuil:g} %")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
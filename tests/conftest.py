@@ -0,0 +1,57 @@
+"""Fixtures des tests : le moteur de l'application chargé sans interface (voir benchmarks/_app.py).
+
+Chaque test travaille sur un tournoi neuf, dont les bases SQLite sont créées dans un dossier temporaire.
+
+Usage : python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks"))
+
+from _app import charger_app
+
+CATEGORIES = ["Bien-être", "Compétiteur", "Très Bon"]
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory):
+    os.environ["DUCK_MANAGER_DONNEES"] = str(tmp_path_factory.mktemp("donnees"))
+    return charger_app()
+
+@pytest.fixture
+def tournoi(app, request):
+    """Identifiant d'un tournoi propre au test, au journal vide"""
+    identifiant = app["normaliser_identifiant_tournoi"](request.node.name)
+    ouvrir_session(app, identifiant)
+    app["vider_base"]()
+    return identifiant
+
+def ouvrir_session(app, tournoi):
+    """Nouvelle session du tournoi, rendue active; ses messages sont collectés dans etat.messages"""
+    etat = app["creer_etat"](tournoi)
+    etat.messages = []
+    activer(app, etat)
+    return etat
+
+def activer(app, etat):
+    """Les fonctions du tournoi travaillent désormais sur cette session"""
+    app["utiliser_etat"](etat, lambda niveau, message: etat.messages.append((niveau, message)))
+
+def inscrire_joueurs(app, nb_joueurs, mode, nb_terrains, graine=0):
+    """Inscrit nb_joueurs joueurs dans la session active et journalise la configuration du tournoi"""
+    etat = app["etat"]
+    for i in range(nb_joueurs):
+        app["valider_joueur"]({"Prénom": f"Joueur{i + 1}", "Nom": "Test", "Catégorie": CATEGORIES[i % len(CATEGORIES)]})
+    etat.mode_tournoi = mode
+    etat.nb_terrains = nb_terrains
+    etat.graine_tournoi = graine
+    app["incrementer_version_etat"]("joueurs", "mode_tournoi", "nb_terrains", "graine_tournoi")
+
+def saisir_scores(app):
+    """Saisit un score pour chaque match programmé sans score de la session active"""
+    for match in app["etat"].magasin_matchs["lignes"]:
+        if match["Score_A"] == 0 and match["Score_B"] == 0:
+            assert app["modifier_score_match"](match["ID_Match"], 21, 10 + match["ID_Match"] % 9)
+    app["incrementer_version_etat"]()
@@ -0,0 +1,57 @@
+"""Appariement du mode classique : couplage de poids maximal (algorithme d'Edmonds)."""
+import itertools
+import random
+from collections import defaultdict
+
+import pytest
+
+def couplages(aretes, sommets):
+    """Tous les couplages du graphe (listes d'arêtes sans sommet commun), par recherche exhaustive"""
+    if not sommets:
+        yield []
+        return
+    premier, reste = sommets[0], sommets[1:]
+    yield from couplages(aretes, reste)
+    for i, j, poids in aretes:
+        if premier in (i, j):
+            autre = j if i == premier else i
+            if autre in reste:
+                for couplage in couplages(aretes, [v for v in reste if v != autre]):
+                    yield [(i, j, poids)] + couplage
+
+def meilleur_couplage(aretes, nb_sommets, maxcardinality):
+    """(cardinalité, poids) du meilleur couplage, trouvé par recherche exhaustive"""
+    cle = (lambda c: (len(c), sum(p for _, _, p in c))) if maxcardinality else (lambda c: (0, sum(p for _, _, p in c)))
+    return max(cle(c) for c in couplages(aretes, list(range(nb_sommets))))
+
+@pytest.mark.parametrize("maxcardinality", [False, True])
+def test_couplage_optimal_sur_des_graphes_aleatoires(app, maxcardinality):
+    rng = random.Random(13)
+    for _ in range(150):
+        nb_sommets = rng.randint(2, 8)
+        aretes = [(i, j, rng.randint(1, 20)) for i, j in itertools.combinations(range(nb_sommets), 2) if rng.random() < 0.5]
+        if not aretes:
+            continue
+        mate = app["couplage_poids_maximal"](aretes, maxcardinality=maxcardinality)
+        poids = {frozenset((i, j)): p for i, j, p in aretes}
+        paires = [(v, w) for v, w in enumerate(mate) if v < w]
+        assert all(mate[w] == v for v, w in paires)
+        obtenu = (len(paires) if maxcardinality else 0, sum(poids[frozenset(p)] for p in paires))
+        assert obtenu == meilleur_couplage(aretes, nb_sommets, maxcardinality)
+
+def test_round_complet_sans_revanche_quand_il_existe(app):
+    """Un appariement glouton qui commence par E1-E2 laisse E3 et E4, déjà opposées: le couplage les sépare"""
+    equipes = ["E1", "E2", "E3", "E4"]
+    adversaires_joues = defaultdict(set, {"E3": {"E4"}, "E4": {"E3"}})
+    matchs_par_equipe = dict.fromkeys(equipes, 1)
+    for graine in range(20):
+        paires = app["choisir_matchs_classique"](equipes, matchs_par_equipe, adversaires_joues, 2, random.Random(graine))
+        assert len(paires) == 2
+        assert {frozenset(p) for p in paires} in ({frozenset(("E1", "E3")), frozenset(("E2", "E4"))},
+                                                  {frozenset(("E1", "E4")), frozenset(("E2", "E3"))})
+
+def test_les_equipes_les_moins_actives_jouent(app):
+    equipes = [f"E{i}" for i in range(1, 9)]
+    matchs_par_equipe = {eid: (0 if i < 4 else 3) for i, eid in enumerate(equipes)}
+    paires = app["choisir_matchs_classique"](equipes, matchs_par_equipe, defaultdict(set), 2, random.Random(0))
+    assert {eid for paire in paires for eid in paire} == set(equipes[:4])
@@ -0,0 +1,60 @@
+"""Enchaînement continu des matchs: un terrain repart dès que son score est saisi."""
+import pytest
+
+from conftest import inscrire_joueurs, saisir_scores
+
+def rencontres(app):
+    return [frozenset((m["Equipe_A_ID"], m["Equipe_B_ID"])) for m in app["etat"].magasin_matchs["lignes"]]
+
+def saisir_score_terrain(app, terrain):
+    _, en_cours = app["get_etat_terrains"]()
+    assert app["enregistrer_score_terrain"](en_cours[terrain]["ID_Match"], 21, 15)
+
+def test_pas_de_revanche_apres_enchainement_continu(app, tournoi):
+    inscrire_joueurs(app, 16, "Classique", 2)
+    app["generer_paires_equilibrees"]()
+    app["generer_round"]()
+    saisir_scores(app)
+
+    app["etat"].enchainement_continu = True
+    app["incrementer_version_etat"]("enchainement_continu")
+    app["remplir_terrains_libres"]()
+    for terrain in ("T1", "T1", "T2", "T1"):
+        saisir_score_terrain(app, terrain)
+    assert not app["etat"].planning_classique
+
+    # Retour aux rounds complets: jusqu'à épuisement des rencontres, aucune n'est rejouée
+    app["etat"].enchainement_continu = False
+    app["incrementer_version_etat"]("enchainement_continu")
+    for _ in range(20):
+        saisir_scores(app)
+        app["generer_round"]()
+    assert len(rencontres(app)) == len(set(rencontres(app))) == 8 * 7 // 2
+
+@pytest.mark.parametrize("mode", ["Classique", "Individuel"])
+def test_un_terrain_attend_plutot_que_de_creuser_l_ecart(app, tournoi, mode):
+    inscrire_joueurs(app, 16, mode, 2)
+    etat = app["etat"]
+    if mode == "Classique":
+        app["generer_paires_equilibrees"]()
+    etat.enchainement_continu = True
+    app["incrementer_version_etat"]("enchainement_continu")
+    app["remplir_terrains_libres"]()
+
+    # Seul T1 libère son terrain: T2 garde les mêmes joueurs en jeu
+    for _ in range(12):
+        _, en_cours = app["get_etat_terrains"]()
+        if "T1" not in en_cours:
+            break
+        saisir_score_terrain(app, "T1")
+        if mode == "Classique":
+            matchs_par_equipe, _ = app["compter_rencontres_classique"](etat.equipes_fixes["ID"].tolist())
+            nb_matchs = list(matchs_par_equipe.values())
+        else:
+            # Compteur des seuls joueurs programmés: les joueurs sans match comptent 0
+            matchs_par_joueur = app["compter_matchs_programmes"]()
+            nb_matchs = [matchs_par_joueur.get(app["get_nom_complet"](joueur), 0) for joueur in etat.joueurs]
+        # Un match lancé compte aussitôt: au plus ECART_MAX_ENCHAINEMENT + 1 d'écart
+        assert max(nb_matchs) - min(nb_matchs) <= app["ECART_MAX_ENCHAINEMENT"] + 1
+    _, en_cours = app["get_etat_terrains"]()
+    assert "T1" not in en_cours
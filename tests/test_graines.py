@@ -0,0 +1,26 @@
+"""Tirages reproductibles : même graine de tournoi, mêmes rounds."""
+import math
+
+import pytest
+
+from conftest import inscrire_joueurs, ouvrir_session, saisir_scores
+
+def jouer(app, tournoi, mode, graine):
+    ouvrir_session(app, tournoi)
+    app["vider_base"]()
+    inscrire_joueurs(app, 14, mode, 3, graine=graine)
+    if mode == "Classique":
+        app["generer_paires_equilibrees"]()
+    for _ in range(3):
+        app["generer_round"]()
+        saisir_scores(app)
+    return [dict(ligne) for ligne in app["etat"].magasin_matchs["lignes"]]
+
+@pytest.mark.parametrize("mode", ["Classique", "Individuel"])
+def test_meme_graine_memes_rounds(app, tournoi, monkeypatch, mode):
+    # La durée maximale du recuit est la seule source de non-déterminisme
+    monkeypatch.setitem(app, "BUDGET_OPTIMISATION_S", math.inf)
+    premier = jouer(app, f"{tournoi}-a", mode, graine=7)
+    assert jouer(app, f"{tournoi}-b", mode, graine=7) == premier
+    if mode == "Individuel":
+        assert jouer(app, f"{tournoi}-c", mode, graine=8) != premier
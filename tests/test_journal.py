@@ -0,0 +1,143 @@
+"""Journal des événements : plusieurs sessions d'un même tournoi, rejeu et instantanés."""
+import pandas as pd
+import pytest
+
+from conftest import activer, inscrire_joueurs, ouvrir_session, saisir_scores
+
+def etat_persiste(app, etat):
+    """Clés persistées et table des matchs d'une session, comparables d'une session à l'autre"""
+    contenu = {}
+    for cle in app["CLES_PERSISTEES"]:
+        valeur = getattr(etat, cle)
+        contenu[cle] = valeur.to_dict("records") if isinstance(valeur, pd.DataFrame) else valeur
+    contenu["matchs"] = [dict(ligne) for ligne in etat.magasin_matchs["lignes"]]
+    return contenu
+
+def dernier_evenement(app):
+    with app["transaction_base"]() as connexion:
+        return connexion.execute("SELECT type, donnees FROM evenements ORDER BY id DESC LIMIT 1").fetchone()
+
+def test_generation_refusee_sur_une_session_en_retard(app, tournoi):
+    session_a = app["etat"]
+    inscrire_joueurs(app, 12, "Individuel", 2)
+    app["generer_round"]()
+    session_b = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+
+    # A saisit les scores et génère le round 2 pendant que B affiche encore le round 1
+    activer(app, session_a)
+    saisir_scores(app)
+    app["generer_round"]()
+    activer(app, session_b)
+    app["generer_round"]()
+    assert session_b.messages[-1][0] == "avertissement"
+
+    # B a été rechargée depuis le journal: mêmes matchs, mêmes ID_Match, même historique des équipes
+    assert etat_persiste(app, session_b) == etat_persiste(app, session_a)
+
+    # B, de nouveau à jour, peut générer le round 3, que A et une nouvelle session retrouvent
+    assert app["get_current_round"]() == 2
+    saisir_scores(app)
+    app["generer_round"]()
+    assert app["get_current_round"]() == 3
+    activer(app, session_a)
+    app["synchroniser_avec_base"]()
+    session_c = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+    assert etat_persiste(app, session_a) == etat_persiste(app, session_b) == etat_persiste(app, session_c)
+
+def test_score_refuse_sur_une_session_en_retard(app, tournoi):
+    session_a = app["etat"]
+    inscrire_joueurs(app, 8, "Individuel", 2)
+    app["generer_round"]()
+    session_b = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+
+    activer(app, session_a)
+    assert app["modifier_score_match"](0, 21, 15)
+    activer(app, session_b)
+    assert not app["modifier_score_match"](1, 21, 12)
+    assert session_b.magasin_matchs["lignes"][0]["Score_A"] == 21
+    assert session_b.magasin_matchs["lignes"][1]["Score_A"] == 0
+
+    # Ressaisi sur la session rechargée, le score est enregistré pour toutes les sessions
+    assert app["modifier_score_match"](1, 21, 12)
+    activer(app, session_a)
+    app["synchroniser_avec_base"]()
+    assert etat_persiste(app, session_a) == etat_persiste(app, session_b)
+
+@pytest.mark.parametrize("nb_evenements_par_instantane", [7, 100_000])
+def test_nouvelle_session_retrouve_le_tournoi(app, tournoi, monkeypatch, nb_evenements_par_instantane):
+    monkeypatch.setitem(app, "NB_EVENEMENTS_PAR_INSTANTANE", nb_evenements_par_instantane)
+    session_a = app["etat"]
+    inscrire_joueurs(app, 13, "Individuel", 3)
+    for _ in range(4):
+        app["generer_round"]()
+        saisir_scores(app)
+    app["generer_derniers_rounds"]()
+    session_a.historique_equipes.loc[0, "Surnom"] = "Les Canards"
+    app["incrementer_version_etat"]("historique_equipes")
+    app["generer_round"]()
+
+    session_b = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+    assert etat_persiste(app, session_b) == etat_persiste(app, session_a)
+    assert session_b.historique_equipes.loc[0, "Surnom"] == "Les Canards"
+
+def test_seules_les_modifications_sont_journalisees(app, tournoi):
+    inscrire_joueurs(app, 8, "Individuel", 2)
+    app["generer_round"]()
+    type_evenement, donnees = dernier_evenement(app)
+    assert type_evenement == "matchs_ajoutes"
+    assert '"debut": 0' in donnees and '"Round": 1' in donnees
+
+    app["etat"].nom_tournoi = "Tournoi d'automne"
+    app["incrementer_version_etat"]("nom_tournoi")
+    assert dernier_evenement(app) == ("etat_modifie", '{"nom_tournoi": {"valeur": "Tournoi d\'automne"}}')
+
+    # Une version incrémentée sans clé modifiée n'écrit rien
+    app["incrementer_version_etat"]()
+    assert dernier_evenement(app)[0] == "etat_modifie"
+
+def test_reinitialisation_des_matchs_en_un_evenement(app, tournoi):
+    session_a = app["etat"]
+    inscrire_joueurs(app, 8, "Individuel", 2)
+    app["generer_round"]()
+    session_b = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+
+    activer(app, session_a)
+    session_a.historique_equipes = session_a.historique_equipes.iloc[0:0]
+    session_a.graines_rounds = {}
+    assert app["reinitialiser_table_matchs"](["historique_equipes", "graines_rounds"])
+    activer(app, session_b)
+    app["synchroniser_avec_base"]()
+    assert app["get_nb_matchs"]() == 0 and session_b.historique_equipes.empty
+    assert etat_persiste(app, session_b) == etat_persiste(app, session_a)
+
+def test_joueurs_en_attente_conserves_si_la_validation_est_refusee(app, tournoi):
+    session_a = app["etat"]
+    session_a.temp_joueurs.append({"Prénom": "Anne", "Nom": "Test", "Catégorie": "Bien-être"})
+    assert app["incrementer_version_etat"]("temp_joueurs")
+    session_b = ouvrir_session(app, tournoi)
+    app["synchroniser_avec_base"]()
+    assert session_b.temp_joueurs == session_a.temp_joueurs
+
+    # A inscrit un second joueur en attente pendant que B valide ceux qu'il affiche
+    session_a.temp_joueurs.append({"Prénom": "Paul", "Nom": "Test", "Catégorie": "Compétiteur"})
+    activer(app, session_a)
+    assert app["incrementer_version_etat"]("temp_joueurs")
+    activer(app, session_b)
+    for joueur in session_b.temp_joueurs:
+        app["valider_joueur"](joueur)
+    session_b.temp_joueurs = []
+    assert not app["incrementer_version_etat"]("temp_joueurs", "joueurs")
+    assert session_b.joueurs == [] and len(session_b.temp_joueurs) == 2
+
+    for joueur in session_b.temp_joueurs:
+        app["valider_joueur"](joueur)
+    session_b.temp_joueurs = []
+    assert app["incrementer_version_etat"]("temp_joueurs", "joueurs")
+    activer(app, session_a)
+    app["synchroniser_avec_base"]()
+    assert session_a.temp_joueurs == [] and len(session_a.joueurs) == 2
@@ -0,0 +1,39 @@
+"""Planning de la journée du mode classique (tables de Berger)."""
+from conftest import inscrire_joueurs, saisir_scores
+
+def match_classique(app, round_num, terrain, equipe_a, equipe_b):
+    equipes = app["etat"].equipes_fixes.set_index("ID")
+    return {
+        "Round": round_num, "Terrain": terrain, "Type": "normal",
+        "Equipe_A_ID": equipe_a, "J1_A": equipes.at[equipe_a, "J1"], "J2_A": equipes.at[equipe_a, "J2"], "Score_A": 0,
+        "Equipe_B_ID": equipe_b, "J1_B": equipes.at[equipe_b, "J1"], "J2_B": equipes.at[equipe_b, "J2"], "Score_B": 0,
+        "Jokers": ""
+    }
+
+def test_planning_couvre_toutes_les_rencontres(app, tournoi):
+    inscrire_joueurs(app, 16, "Classique", 2)
+    app["generer_paires_equilibrees"]()
+    rounds = app["etat"].planning_classique["rounds"]
+    rencontres = [frozenset(paire) for paires in rounds for paire in paires]
+    assert len(rencontres) == len(set(rencontres)) == 8 * 7 // 2
+    assert all(len(paires) <= 2 for paires in rounds)
+
+def test_planning_caduc_si_une_rencontre_prevue_est_jouee_hors_planning(app, tournoi):
+    inscrire_joueurs(app, 16, "Classique", 2)
+    app["generer_paires_equilibrees"]()
+    app["generer_round"]()
+    saisir_scores(app)
+    assert app["planning_a_jour"]()
+
+    # Une rencontre du dernier round prévu est jouée dès le round 2
+    equipe_a, equipe_b = app["etat"].planning_classique["rounds"][-1][0]
+    assert app["enregistrer_matchs"]([match_classique(app, 2, "T1", equipe_a, equipe_b)], "test")
+    assert not app["planning_a_jour"]()
+    assert app["get_round_planifie"](3) is None
+
+    # Les rounds suivants, générés à la demande, ne la rejouent pas
+    for _ in range(20):
+        saisir_scores(app)
+        app["generer_round"]()
+    rencontres = [frozenset((m["Equipe_A_ID"], m["Equipe_B_ID"])) for m in app["etat"].magasin_matchs["lignes"]]
+    assert len(rencontres) == len(set(rencontres))
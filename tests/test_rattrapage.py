@@ -0,0 +1,49 @@
+"""Clôture du mode individuel : rounds de rattrapage planifiés en une fois."""
+import math
+
+import pytest
+
+from conftest import inscrire_joueurs, saisir_scores
+
+@pytest.mark.parametrize("retards, nb_terrains", [
+    ({"A": 2, "B": 1, "C": 1, "D": 0, "E": 0}, 1),
+    ({f"J{i}": i % 3 for i in range(13)}, 2),
+    ({f"J{i}": 1 for i in range(6)} | {f"K{i}": 0 for i in range(6)}, 3),
+])
+def test_planning_de_rattrapage_minimal_et_complet(app, retards, nb_terrains):
+    rounds, raison = app["planifier_rattrapage"](retards, nb_terrains)
+    assert raison is None
+    total = sum(retards.values())
+    assert len(rounds) == max(max(retards.values()), math.ceil(total / (4 * nb_terrains)))
+
+    rattrapes = dict.fromkeys(retards, 0)
+    for en_retard, jokers in rounds:
+        participants = en_retard + jokers
+        assert len(participants) % 4 == 0 and len(participants) <= 4 * nb_terrains
+        assert len(set(participants)) == len(participants)
+        for joueur in en_retard:
+            rattrapes[joueur] += 1
+    assert rattrapes == retards
+
+def test_rattrapage_impossible_sans_quatre_joueurs(app):
+    rounds, raison = app["planifier_rattrapage"]({"A": 1, "B": 0, "C": 0}, 2)
+    assert rounds is None and raison
+
+def test_derniers_rounds_equilibrent_les_matchs(app, tournoi):
+    inscrire_joueurs(app, 15, "Individuel", 3)
+    for _ in range(3):
+        app["generer_round"]()
+        saisir_scores(app)
+    matchs_programmes = app["compter_matchs_programmes"]()
+    assert len(set(matchs_programmes.values())) > 1
+
+    nb_matchs = app["get_nb_matchs"]()
+    assert app["generer_derniers_rounds"]()
+    matchs_programmes = app["compter_matchs_programmes"]()
+    noms = [app["get_nom_complet"](joueur) for joueur in app["etat"].joueurs]
+    assert len({matchs_programmes[nom] for nom in noms}) == 1
+
+    # Les équipes des rounds de rattrapage sont dans l'historique
+    nouveaux = app["etat"].magasin_matchs["lignes"][nb_matchs:]
+    equipes = set(app["etat"].historique_equipes["ID"])
+    assert all(m["Type"] == "rattrapage" and {m["Equipe_A_ID"], m["Equipe_B_ID"]} <= equipes for m in nouveaux)